@@ -8,23 +8,14 @@ import tempfile
 import os
 import gc
 import json
-from pathlib import Path
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from io import BytesIO
+from itertools import chain
 
-from bank_parser.file_reader import read_excel_file
-from bank_parser.detector import detect_parser
-from bank_parser.models import Transaction, ParseResult
-
-# Import all parsers so they register themselves
-from bank_parser.parsers import (
-    standard_18col, narodny, kaspi, otbasy, tengri,
-    alatau, tsesnabank, al_hilal, kazkom,
-    forte, bank_rbk, eurasian, kassa_nova, delta,
-    bcc, kzi, nurbank, freedom, altyn,
-    halyk_finance, citibank, bank_razvitiya,
-    china_banks, zaman,
-)
+from bank_parser.models import ParseResult, RUSSIAN_HEADERS
+from bank_parser.pipeline import process_file
 
 # --- Page config ---
 st.set_page_config(
@@ -64,65 +55,72 @@ SUPPORTED_BANKS = [
     "Alatau City",
 ]
 
-RUSSIAN_HEADERS = Transaction.russian_headers()
-FIELD_NAMES = Transaction.field_names()
-HEADER_MAP = dict(zip(FIELD_NAMES, RUSSIAN_HEADERS))
+AMOUNT_HEADERS = {'Сумма', 'Сумма в тенге'}
 
 
-def process_uploaded_file(uploaded_file, folder_hint: str = "") -> ParseResult:
-    """Process a single uploaded file through our parser pipeline."""
-    filename = uploaded_file.name
-    ext = Path(filename).suffix.lower()
+def _make_executor(num_files: int) -> ProcessPoolExecutor:
+    """Worker pool for parsing uploads.
 
-    result = ParseResult(filepath=filename, source_file=filename)
+    Workers are spawned, never forked: the Streamlit server is multithreaded,
+    and a forked child can deadlock on a lock another thread held. Spawned
+    workers only import bank_parser.pipeline (side-effect free), not this script.
+    """
+    workers = min(num_files, os.cpu_count() or 1)
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
 
-    if ext not in ('.xlsx', '.xls'):
-        result.parse_status = 'skipped'
-        result.errors.append(f'Unsupported format: {ext}')
-        return result
 
-    # Save to temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-        tmp.write(uploaded_file.getvalue())
-        tmp_path = tmp.name
+def _completed(paths: list, folder_hint: str):
+    """Yield (index, ParseResult or the exception raised) as each file finishes.
 
-    try:
-        # Read
-        sheets = read_excel_file(tmp_path)
-
-        if not sheets or all(s.num_rows == 0 for s in sheets):
-            result.parse_status = 'skipped'
-            result.warnings.append('Empty file')
-            return result
-
-        file_info = {
-            'filepath': tmp_path,
-            'filename': filename,
-            'extension': ext,
-            'folder_name': folder_hint,
-        }
-
-        # Detect
-        parser_cls = detect_parser(sheets, file_info)
-        if parser_cls is None:
-            result.parse_status = 'failed'
-            result.errors.append('No parser detected')
-            return result
-
-        # Parse
-        parser = parser_cls()
-        result = parser.parse(sheets, file_info)
-    except Exception as e:
-        result.parse_status = 'failed'
-        result.errors.append(f'Error: {e}')
-    finally:
-        gc.collect()
-        try:
-            os.unlink(tmp_path)
-        except (PermissionError, OSError):
-            pass
-
-    return result
+    A single file is parsed in-process: a pool would only add interpreter
+    startup and imports, with nothing to run in parallel.
+    """
+    if len(paths) <= 1:
+        for i, path in enumerate(paths):
+            try:
+                yield i, process_file(path, folder_hint)
+            except Exception as e:
+                yield i, e
+        return
+
+    with _make_executor(len(paths)) as pool:
+        futures = {pool.submit(process_file, path, folder_hint): i for i, path in enumerate(paths)}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
+
+def process_uploaded_files(uploaded_files: list, folder_hint: str, progress) -> list:
+    """Process uploaded files in parallel; results come back in upload order."""
+    results = [None] * len(uploaded_files)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for i, uf in enumerate(uploaded_files):
+            # One subdirectory per upload so the original filename is kept
+            file_dir = os.path.join(tmp_dir, str(i))
+            os.makedirs(file_dir)
+            path = os.path.join(file_dir, uf.name)
+            with open(path, 'wb') as f:
+                f.write(uf.getvalue())
+            paths.append(path)
+
+        for done, (i, outcome) in enumerate(_completed(paths, folder_hint), start=1):
+            name = uploaded_files[i].name
+            if isinstance(outcome, Exception):
+                result = ParseResult(filepath=name, source_file=name, parse_status='failed')
+                result.errors.append(f'Error: {outcome}')
+                outcome = result
+            results[i] = outcome
+            progress.progress(
+                done / len(paths),
+                text=f"Обработано: {name} ({done}/{len(paths)})",
+            )
+
+    gc.collect()
+    return results
 
 
 def transactions_to_df(transactions: list) -> pd.DataFrame:
@@ -130,15 +128,32 @@ def transactions_to_df(transactions: list) -> pd.DataFrame:
     if not transactions:
         return pd.DataFrame(columns=RUSSIAN_HEADERS)
 
-    rows = [t.to_dict() for t in transactions]
-    df = pd.DataFrame(rows)
-    df.rename(columns=HEADER_MAP, inplace=True)
+    # Transpose field-ordered tuples into one list per column, in standard order
+    columns = zip(*(t.to_tuple() for t in transactions))
+    data = {}
+    for header, values in zip(RUSSIAN_HEADERS, columns):
+        if header in AMOUNT_HEADERS:
+            data[header] = pd.Series(values, dtype='float64')
+        else:
+            data[header] = pd.Series(values, dtype=object)
+    return pd.DataFrame(data)
 
-    # Reorder to match standard column order
-    cols = [c for c in RUSSIAN_HEADERS if c in df.columns]
-    df = df[cols]
 
-    return df
+def df_to_xlsx_bytes(df: pd.DataFrame, sheet_name: str = 'Транзакции') -> bytes:
+    """Write a DataFrame to an in-memory xlsx.
+
+    Uses xlsxwriter when it is installed, openpyxl otherwise.
+    """
+    try:
+        import xlsxwriter  # noqa: F401
+        engine = 'xlsxwriter'
+    except ImportError:
+        engine = 'openpyxl'
+
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine=engine) as writer:
+        df.to_excel(writer, sheet_name=sheet_name, index=False)
+    return output.getvalue()
 
 
 # ============================================================
@@ -185,22 +200,14 @@ with col_hint:
 
 if uploaded_files:
     if st.button("🔄 Обработать файлы", type="primary", use_container_width=True):
-        all_transactions = []
         processed = []
-        results = []
 
         progress = st.progress(0, text="Подготовка...")
 
-        for i, uf in enumerate(uploaded_files):
-            progress.progress(
-                (i) / len(uploaded_files),
-                text=f"Обработка: {uf.name} ({i+1}/{len(uploaded_files)})",
-            )
-
-            result = process_uploaded_file(uf, folder_hint)
-            results.append(result)
-            all_transactions.extend(result.transactions)
-
+        results = process_uploaded_files(uploaded_files, folder_hint, progress)
+        # One allocation for the combined list instead of growing it per file
+        all_transactions = list(chain.from_iterable(r.transactions for r in results))
+        for uf, result in zip(uploaded_files, results):
             status_icon = {
                 'success': '✅', 'partial': '⚠️',
                 'failed': '❌', 'skipped': '⏭️',
@@ -238,27 +245,23 @@ if st.session_state.all_transactions:
     st.header("📈 Статистика")
 
     df = transactions_to_df(st.session_state.all_transactions)
+    amounts = pd.to_numeric(df['Сумма'], errors='coerce')
+
+    # Count and sum per direction in one grouped pass (reused by the metrics and the table)
+    dir_stats = amounts.groupby(df['Направление'], sort=False).agg(['count', 'sum'])
 
     # Metrics row
     c1, c2, c3, c4 = st.columns(4)
     with c1:
         st.metric("Всего транзакций", f"{len(df):,}")
     with c2:
-        if 'Сумма' in df.columns:
-            income = pd.to_numeric(
-                df.loc[df.get('Направление', pd.Series()) == 'Приход', 'Сумма'],
-                errors='coerce'
-            ).sum()
-            st.metric("Приход", f"{income:,.0f} ₸")
+        income = dir_stats['sum'].get('Приход', 0.0)
+        st.metric("Приход", f"{income:,.0f} ₸")
     with c3:
-        if 'Сумма' in df.columns:
-            expense = pd.to_numeric(
-                df.loc[df.get('Направление', pd.Series()) == 'Расход', 'Сумма'],
-                errors='coerce'
-            ).sum()
-            st.metric("Расход", f"{expense:,.0f} ₸")
+        expense = dir_stats['sum'].get('Расход', 0.0)
+        st.metric("Расход", f"{expense:,.0f} ₸")
     with c4:
-        banks_count = df['Банк выписки'].nunique() if 'Банк выписки' in df.columns else 0
+        banks_count = df['Банк выписки'].nunique()
         st.metric("Банков", banks_count)
 
     # Stats by bank
@@ -266,39 +269,28 @@ if st.session_state.all_transactions:
 
     with col_left:
         st.subheader("По банкам")
-        if 'Банк выписки' in df.columns and 'Сумма' in df.columns:
-            df['_amount'] = pd.to_numeric(df['Сумма'], errors='coerce')
-            bank_stats = df.groupby('Банк выписки').agg(
-                Транзакций=('_amount', 'count'),
-                Сумма=('_amount', 'sum'),
-            ).sort_values('Транзакций', ascending=False).reset_index()
-            bank_stats.columns = ['Банк', 'Транзакций', 'Общая сумма']
-            bank_stats['Общая сумма'] = bank_stats['Общая сумма'].apply(lambda x: f"{x:,.0f}")
-            st.dataframe(bank_stats, use_container_width=True, hide_index=True)
-            df.drop(columns=['_amount'], inplace=True, errors='ignore')
+        bank_stats = amounts.groupby(df['Банк выписки']).agg(['count', 'sum'])
+        bank_stats = bank_stats.sort_values('count', ascending=False).reset_index()
+        bank_stats.columns = ['Банк', 'Транзакций', 'Общая сумма']
+        bank_stats['Общая сумма'] = bank_stats['Общая сумма'].apply(lambda x: f"{x:,.0f}")
+        st.dataframe(bank_stats, use_container_width=True, hide_index=True)
 
     with col_right:
         st.subheader("По направлениям")
-        if 'Направление' in df.columns and 'Сумма' in df.columns:
-            df['_amount'] = pd.to_numeric(df['Сумма'], errors='coerce')
-            dir_stats = df.groupby('Направление').agg(
-                Транзакций=('_amount', 'count'),
-                Сумма=('_amount', 'sum'),
-            ).reset_index()
-            dir_stats.columns = ['Направление', 'Транзакций', 'Сумма']
-            dir_stats['Сумма'] = dir_stats['Сумма'].apply(lambda x: f"{x:,.0f}")
-            st.dataframe(dir_stats, use_container_width=True, hide_index=True)
-            df.drop(columns=['_amount'], inplace=True, errors='ignore')
+        dir_table = dir_stats.sort_index().reset_index()
+        dir_table.columns = ['Направление', 'Транзакций', 'Сумма']
+        dir_table['Сумма'] = dir_table['Сумма'].apply(lambda x: f"{x:,.0f}")
+        st.dataframe(dir_table, use_container_width=True, hide_index=True)
 
     # Date range
-    if 'Дата операции' in df.columns:
-        dates = pd.to_datetime(df['Дата операции'], errors='coerce').dropna()
-        if not dates.empty:
-            st.subheader("Период данных")
-            st.write(
-                f"С **{dates.min().strftime('%d.%m.%Y')}** "
-                f"по **{dates.max().strftime('%d.%m.%Y')}**"
-            )
+    dates = pd.to_datetime(df['Дата операции'], errors='coerce').dropna()
+    if not dates.empty:
+        first, last = dates.agg(['min', 'max'])
+        st.subheader("Период данных")
+        st.write(
+            f"С **{first.strftime('%d.%m.%Y')}** "
+            f"по **{last.strftime('%d.%m.%Y')}**"
+        )
 
 # --- Data preview ---
 if st.session_state.all_transactions:
@@ -346,12 +338,9 @@ if st.session_state.all_transactions:
 
     with col_e1:
         # Excel
-        output_xlsx = BytesIO()
-        with pd.ExcelWriter(output_xlsx, engine='openpyxl') as writer:
-            df_export.to_excel(writer, sheet_name='Транзакции', index=False)
         st.download_button(
             "📥 Скачать Excel",
-            data=output_xlsx.getvalue(),
+            data=df_to_xlsx_bytes(df_export),
             file_name=f"transactions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             use_container_width=True,
@@ -1,12 +1,15 @@
 """Abstract base parser class for all bank statement parsers."""
 
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Optional
+from itertools import islice
+from operator import itemgetter
+from typing import Callable, List, Tuple, Optional
 import logging
 
 from .models import Transaction, ParseResult
 from .file_reader import SheetData
-from .normalizer import clean_string
+from .dispatcher import marker_hits
+from .normalizer import IBAN_RE, STRICT_IBAN_RE, clean_string
 
 logger = logging.getLogger('bank_parser')
 
@@ -15,6 +18,17 @@ class BaseParser(ABC):
     """Abstract base class for all bank statement parsers."""
 
     BANK_NAME: str = ""  # Human-readable bank name for statement_bank field
+    MARKERS: dict = {}  # Lowercased keyword -> can_parse score when found in the top rows
+    MARKER_ROWS: int = 10  # How many top rows MARKERS are searched in
+
+    @classmethod
+    def marker_score(cls, sheet: SheetData) -> float:
+        """Best MARKERS score among keywords found in the first MARKER_ROWS rows."""
+        hits = marker_hits(sheet)
+        return max(
+            (score for kw, score in cls.MARKERS.items() if hits.get(kw, cls.MARKER_ROWS) < cls.MARKER_ROWS),
+            default=0.0,
+        )
 
     @classmethod
     @abstractmethod
@@ -51,6 +65,7 @@ class BaseParser(ABC):
         )
 
         all_transactions = []
+        failed_sheets = []  # (sheet name, error), logged once per file
         for sheet in sheets:
             try:
                 transactions, metadata = self.parse_sheet(sheet, file_info)
@@ -61,7 +76,14 @@ class BaseParser(ABC):
                 result.errors.extend(metadata.get('errors', []))
             except Exception as e:
                 result.errors.append(f"Error parsing sheet '{sheet.name}': {e}")
-                logger.error(f"Error parsing sheet '{sheet.name}' in {file_info['filename']}: {e}")
+                failed_sheets.append((sheet.name, e))
+
+        if failed_sheets:
+            name, error = failed_sheets[0]
+            logger.error(
+                f"Error parsing {len(failed_sheets)} sheet(s) of {file_info['filename']}, "
+                f"first '{name}': {error}"
+            )
 
         result.transactions = all_transactions
         result.total_transactions = len(all_transactions)
@@ -98,6 +120,91 @@ class BaseParser(ABC):
 
         return None
 
+    @staticmethod
+    def row_getter(col_map: dict, keys: list) -> Callable[[list], tuple]:
+        """Build a function that pulls the given columns out of a row in one call.
+
+        Specialized once per column layout: missing columns and cells past the
+        end of a short row come back as None.
+
+        Args:
+            col_map: Column name -> index map built from the header
+            keys: Column names, in the order the values should be returned
+
+        Returns:
+            Function row -> tuple of cell values
+        """
+        indices = [col_map.get(k) for k in keys]
+        width = max((i for i in indices if i is not None), default=-1) + 1
+        # Rows are padded with width+1 Nones, so index -1 is always a None cell
+        getter = itemgetter(*[-1 if i is None else i for i in indices], -1)
+        pad = [None] * (width + 1)
+
+        def get(row: list) -> tuple:
+            return getter(row + pad)[:-1]
+
+        return get
+
+    @staticmethod
+    def header_field(h: str, exact: dict, rules: tuple) -> Optional[str]:
+        """Field for one lowercased header cell, or None.
+
+        Args:
+            h: Lowercased, stripped header cell
+            exact: Header text -> field, for cells matched verbatim
+            rules: Ordered (substrings, field) pairs; the first rule whose
+                substrings all occur in h wins (a None field leaves h unmapped)
+        """
+        field = exact.get(h)
+        if field is None:
+            for needles, candidate in rules:
+                if all(n in h for n in needles):
+                    return candidate
+        return field
+
+    @staticmethod
+    def dated_rows(rows: list, start: int, date_idx: Optional[int], skip_words: tuple = ()) -> list:
+        """Rows from start on that have a date cell, minus summary rows.
+
+        A non-empty date cell already rules out blank rows, so rows are kept
+        or dropped in one filtering pass before any per-row parsing.
+
+        Args:
+            rows: All rows of the sheet
+            start: Index of the first data row
+            date_idx: Date column index (None: no row qualifies)
+            skip_words: Lowercase words marking text date cells as summary rows (итого, ...)
+        """
+        if date_idx is None:
+            return []
+        data_rows = [
+            row for row in islice(rows, start, None)
+            if date_idx < len(row) and row[date_idx] is not None
+        ]
+        if skip_words:
+            data_rows = [
+                row for row in data_rows
+                if row[date_idx].__class__ is not str
+                or not any(w in row[date_idx].lower() for w in skip_words)
+            ]
+        return data_rows
+
+    @staticmethod
+    def column_values(rows: list, idx: Optional[int]) -> list:
+        """One column's cells across rows (None where the column is missing or a row is short)."""
+        if idx is None:
+            return [None] * len(rows)
+        return [row[idx] if idx < len(row) else None for row in rows]
+
+    @classmethod
+    def columns(cls, rows: list, col_map: dict, keys: tuple) -> list:
+        """The given columns' cells across rows, one list per key.
+
+        zip(*columns(...)) walks the sheet column-wise, pulling each mapped
+        column out once instead of indexing col_map for every row.
+        """
+        return [cls.column_values(rows, col_map.get(k)) for k in keys]
+
     @staticmethod
     def extract_cell_value(rows: list, search_text: str, max_rows: int = 30) -> Optional[str]:
         """Search first N rows for a cell containing search_text, return value from next cell."""
@@ -117,12 +224,20 @@ class BaseParser(ABC):
                     return text
         return None
 
+    @staticmethod
+    def find_first_iban(sheet: SheetData, max_rows: int = 15) -> Optional[str]:
+        """Return the first IBAN found in the first N rows, stopping at the first hit."""
+        for cells in sheet.top_cells(max_rows):
+            for s in cells:
+                match = IBAN_RE.search(s)
+                if match:
+                    return match.group(1)
+        return None
+
     @staticmethod
     def get_account_from_filename(filename: str) -> Optional[str]:
         """Try to extract IBAN account number from filename."""
-        import re
-        # KZ + 2 digits + 4 alphanumeric + 12 digits pattern
-        match = re.search(r'(KZ\d{2}[A-Za-z0-9]{4}\d{12})', filename)
+        match = STRICT_IBAN_RE.search(filename)
         if match:
             return match.group(1)
         return None
@@ -5,7 +5,7 @@ from typing import Optional, Tuple, Type
 
 from .base_parser import BaseParser
 from .file_reader import SheetData
-from .parsers import PARSER_REGISTRY
+from .parsers import load_parsers
 
 logger = logging.getLogger('bank_parser')
 
@@ -23,23 +23,29 @@ def detect_parser(sheets: list, file_info: dict) -> Optional[Type[BaseParser]]:
     if not sheets:
         return None
 
+    registry = load_parsers()
     best_parser = None
     best_score = 0.0
+    failures = {}  # parser name -> [count, first error], reported once per file
 
     # Try all sheets, not just the first one (some HTML-xls files have garbled first sheets)
     for sheet in sheets:
-        for parser_cls in PARSER_REGISTRY:
+        for parser_cls in registry:
             try:
                 score = parser_cls.can_parse(sheet, file_info)
                 if score > best_score:
                     best_score = score
                     best_parser = parser_cls
             except Exception as e:
-                logger.warning(f"Error in {parser_cls.__name__}.can_parse(): {e}")
+                failure = failures.setdefault(parser_cls.__name__, [0, e])
+                failure[0] += 1
         # If we got a strong match on this sheet, no need to check more
         if best_score >= 0.9:
             break
 
+    for name, (count, error) in failures.items():
+        logger.warning(f"Error in {name}.can_parse() on {count} sheet(s) of {file_info['filename']}: {error}")
+
     if best_score >= 0.3:
         logger.info(f"Detected {best_parser.__name__} (score={best_score:.2f}) for {file_info['filename']}")
         return best_parser
@@ -0,0 +1,45 @@
+"""Shared marker scan for parser detection.
+
+Parsers that recognise a statement by a bank name or SWIFT code in its top
+rows declare those keywords in MARKERS. Instead of every such parser
+re-scanning the sheet, all markers of all registered parsers are matched in
+one pass per sheet and the hits are cached on the sheet.
+"""
+
+from typing import Dict
+
+from .file_reader import SheetData
+from .matcher import KeywordMatcher
+from .parsers import PARSER_REGISTRY
+
+# Matcher over every registered parser's MARKERS, rebuilt when the registry grows
+_matcher = None
+_matcher_size = -1
+_scan_rows = 0
+
+
+def _global_matcher() -> KeywordMatcher:
+    global _matcher, _matcher_size, _scan_rows
+    if _matcher_size != len(PARSER_REGISTRY):
+        keywords = [kw for cls in PARSER_REGISTRY for kw in getattr(cls, 'MARKERS', {})]
+        _scan_rows = max((cls.MARKER_ROWS for cls in PARSER_REGISTRY if getattr(cls, 'MARKERS', None)),
+                         default=0)
+        _matcher = KeywordMatcher(keywords)
+        _matcher_size = len(PARSER_REGISTRY)
+    return _matcher
+
+
+def marker_hits(sheet: SheetData) -> Dict[str, int]:
+    """Return {marker: index of the first top row containing it} for a sheet."""
+    matcher = _global_matcher()
+    hits = sheet._marker_hits
+    if hits is None or sheet._marker_size != _matcher_size:
+        hits = {}
+        _, row_cells = sheet.top_lower(_scan_rows)
+        for i, cells in enumerate(row_cells):
+            for cell in cells:
+                for keyword in matcher.find(cell):
+                    hits.setdefault(keyword, i)
+        sheet._marker_hits = hits
+        sheet._marker_size = _matcher_size
+    return hits
@@ -3,18 +3,66 @@
 import os
 import logging
 from dataclasses import dataclass, field
-from typing import List, Optional
+from datetime import date, datetime
+from typing import List, Optional, Tuple
 
 logger = logging.getLogger('bank_parser')
 
 
-@dataclass
+@dataclass(slots=True)
 class SheetData:
     """Represents one worksheet's data."""
     name: str
     rows: List[list] = field(default_factory=list)
     num_rows: int = 0
     num_cols: int = 0
+    # Lowercased header cells keyed by row index, see header_lower()
+    _header_cache: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Stringified non-empty cells of the top rows, see top_cells()
+    _str_cache: list = field(default_factory=list, init=False, repr=False, compare=False)
+    # Lowercased top rows as (row_texts, row_cells), see top_lower()
+    _low_cache: tuple = field(default=([], []), init=False, repr=False, compare=False)
+    # Parser marker hits from dispatcher.marker_hits(), tagged with the registry size
+    _marker_hits: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    _marker_size: int = field(default=-1, init=False, repr=False, compare=False)
+    # Results a parser's can_parse computed that its parse_sheet can reuse, by parser-chosen key
+    _probe_cache: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def top_cells(self, n: int = 15) -> List[List[str]]:
+        """str() of the non-empty cells of the first n rows, for metadata scans.
+
+        Built once per sheet and grown on demand.
+        """
+        cells = self._str_cache
+        if len(cells) < n and len(cells) < len(self.rows):
+            cells = [[str(c) for c in row if c] for row in self.rows[:n]]
+            self._str_cache = cells
+        return cells[:n]
+
+    def top_lower(self, n: int = 15) -> Tuple[List[str], List[List[str]]]:
+        """Lowercased view of the first n rows: (joined text per row, non-empty cells per row).
+
+        Every parser's can_parse probes the same top rows, so the view is
+        built once and grown on demand.
+        """
+        row_texts, row_cells = self._low_cache
+        if len(row_cells) < n and len(row_cells) < len(self.rows):
+            row_cells = [[c.lower() for c in cells] for cells in self.top_cells(n)]
+            row_texts = [' '.join(cells) for cells in row_cells]
+            self._low_cache = (row_texts, row_cells)
+        return row_texts[:n], row_cells[:n]
+
+    def header_lower(self, idx: int) -> List[str]:
+        """Lowercased, stripped cells of row idx, positionally ('' for empty cells).
+
+        Cached per row: detection and parsing, and repeated parses, lowercase
+        a header once.
+        """
+        cached = self._header_cache.get(idx)
+        if cached is None:
+            cached = [str(c).lower().strip() if c else '' for c in self.rows[idx]]
+            self._header_cache[idx] = cached
+        return cached
 
 
 def read_excel_file(filepath: str) -> List[SheetData]:
@@ -25,19 +73,125 @@ def read_excel_file(filepath: str) -> List[SheetData]:
     ext = os.path.splitext(filepath)[1].lower()
 
     if ext == '.xlsx':
+        # Mislabeled legacy workbook: skip the doomed openpyxl attempt
+        if _sniff_format(filepath) == 'ole':
+            return _read_xls(filepath, sniff_content=True)
         return _read_xlsx(filepath)
     elif ext == '.xls':
+        # HTML saved as .xls: skip the doomed xlrd attempt
+        if _sniff_format(filepath) == 'html':
+            return _read_xls_as_html(filepath)
         return _read_xls(filepath)
     else:
         raise ValueError(f"Unsupported file extension: {ext}")
 
 
+# Leading bytes of the real container formats behind .xls/.xlsx files
+_OLE_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+_ZIP_MAGIC = b'PK\x03\x04'
+
+
+def _sniff_format(filepath: str) -> Optional[str]:
+    """Identify the actual file format from its first bytes: 'zip', 'ole', 'html' or None."""
+    try:
+        with open(filepath, 'rb') as f:
+            head = f.read(1024)
+    except OSError:
+        return None
+
+    if head.startswith(_ZIP_MAGIC):
+        return 'zip'
+    if head.startswith(_OLE_MAGIC):
+        return 'ole'
+    lowered = head.lower()
+    if b'<html' in lowered or b'<table' in lowered:
+        return 'html'
+    return None
+
+
 def _read_xlsx(filepath: str) -> List[SheetData]:
+    """Read .xlsx file — calamine when installed, openpyxl otherwise."""
+    try:
+        sheets = _read_with_calamine(filepath)
+    except Exception as e:
+        logger.warning(f"calamine failed for {filepath}: {e}, trying openpyxl")
+        return _read_xlsx_with_openpyxl(filepath)
+    if sheets is None:
+        return _read_xlsx_with_openpyxl(filepath)
+    return sheets
+
+
+def _read_with_calamine(filepath: str, sniff_content: bool = False,
+                        convert=None) -> Optional[List[SheetData]]:
+    """Read an .xlsx/.xls workbook with python-calamine; None if it is not installed.
+
+    calamine picks its reader from the file extension, so a mislabeled file
+    (sniff_content=True) is handed over as a file object instead, letting
+    calamine detect the format from the bytes. convert maps each cell value
+    to what the format's fallback reader returns (default: openpyxl's).
+    """
+    convert = convert or _calamine_value
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:
+        return None
+
+    if sniff_content:
+        with open(filepath, 'rb') as f:
+            wb = CalamineWorkbook.from_filelike(f)
+    else:
+        wb = CalamineWorkbook.from_path(filepath)
+    sheets = []
+    for sheet_name in wb.sheet_names:
+        rows = [
+            [convert(v) for v in row]
+            for row in wb.get_sheet_by_name(sheet_name).to_python(skip_empty_area=False)
+        ]
+        sheets.append(SheetData(
+            name=sheet_name,
+            rows=rows,
+            num_rows=len(rows),
+            num_cols=max((len(r) for r in rows), default=0),
+        ))
+    return sheets
+
+
+def _calamine_value(value):
+    """Convert a calamine cell value to what openpyxl would have returned."""
+    cls = value.__class__
+    if cls is str:
+        return value if value else None
+    if cls is float:
+        return int(value) if value.is_integer() else value
+    if cls is date:
+        return datetime(value.year, value.month, value.day)
+    return value
+
+
+def _calamine_xls_value(value):
+    """Convert a calamine .xls cell value to what xlrd would have returned.
+
+    xlrd keeps every number a float (12.0, not 12) and booleans as 0/1, so
+    stringified codes and amounts read the same with either reader.
+    """
+    cls = value.__class__
+    if cls is str:
+        return value if value else None
+    if cls is int:
+        return float(value)
+    if cls is bool:
+        return int(value)
+    if cls is date:
+        return datetime(value.year, value.month, value.day)
+    return value
+
+
+def _read_xlsx_with_openpyxl(filepath: str) -> List[SheetData]:
     """Read .xlsx file using openpyxl."""
     import openpyxl
 
     try:
-        wb = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+        wb = openpyxl.load_workbook(filepath, read_only=True, data_only=True, keep_links=False)
     except Exception as e:
         logger.error(f"Failed to open .xlsx file {filepath}: {e}")
         # Try xlrd as fallback (file might be mislabeled)
@@ -48,10 +202,8 @@ def _read_xlsx(filepath: str) -> List[SheetData]:
 
     sheets = []
     for sheet_name in wb.sheetnames:
-        ws = wb[sheet_name]
-        rows = []
-        for row in ws.iter_rows(values_only=True):
-            rows.append(list(row))
+        # Stream rows straight from the read-only worksheet, one pass per sheet
+        rows = [list(row) for row in wb[sheet_name].iter_rows(values_only=True)]
 
         sd = SheetData(
             name=sheet_name,
@@ -65,8 +217,19 @@ def _read_xlsx(filepath: str) -> List[SheetData]:
     return sheets
 
 
-def _read_xls(filepath: str) -> List[SheetData]:
-    """Read .xls file — try xlrd first, then HTML fallback."""
+def _read_xls(filepath: str, sniff_content: bool = False) -> List[SheetData]:
+    """Read .xls file — calamine when installed, then xlrd, then HTML fallback.
+
+    sniff_content is set for legacy workbooks saved under an .xlsx name.
+    """
+    try:
+        sheets = _read_with_calamine(filepath, sniff_content, convert=_calamine_xls_value)
+    except Exception as e:
+        logger.warning(f"calamine failed for {filepath}: {e}, trying xlrd")
+        sheets = None
+    if sheets is not None:
+        return sheets
+
     try:
         return _read_xls_with_xlrd(filepath)
     except Exception as e:
@@ -81,38 +244,41 @@ def _read_xls(filepath: str) -> List[SheetData]:
 def _read_xls_with_xlrd(filepath: str) -> List[SheetData]:
     """Read .xls file using xlrd."""
     import xlrd
+    from xlrd import XL_CELL_DATE, XL_CELL_EMPTY
 
-    wb = xlrd.open_workbook(filepath)
+    # on_demand: each sheet is parsed when fetched and unloaded once its rows are copied
+    wb = xlrd.open_workbook(filepath, on_demand=True)
     sheets = []
 
-    for sheet_idx in range(wb.nsheets):
-        ws = wb.sheet_by_index(sheet_idx)
-        rows = []
-        for row_idx in range(ws.nrows):
-            row = []
-            for col_idx in range(ws.ncols):
-                cell = ws.cell(row_idx, col_idx)
-                # Convert xlrd date cells to datetime
-                if cell.ctype == xlrd.XL_CELL_DATE:
-                    try:
-                        dt_tuple = xlrd.xldate_as_tuple(cell.value, wb.datemode)
-                        from datetime import datetime
-                        row.append(datetime(*dt_tuple))
-                    except Exception:
-                        row.append(cell.value)
-                elif cell.ctype == xlrd.XL_CELL_EMPTY:
-                    row.append(None)
-                else:
-                    row.append(cell.value)
-            rows.append(row)
+    try:
+        for sheet_idx in range(wb.nsheets):
+            ws = wb.sheet_by_index(sheet_idx)
+            rows = []
+            for row_idx in range(ws.nrows):
+                # Whole-row value/type arrays instead of a Cell object per cell
+                row = ws.row_values(row_idx)
+                types = ws.row_types(row_idx)
+                for col_idx, ctype in enumerate(types):
+                    if ctype == XL_CELL_EMPTY:
+                        row[col_idx] = None
+                    elif ctype == XL_CELL_DATE:
+                        # Convert xlrd date cells to datetime
+                        try:
+                            row[col_idx] = datetime(*xlrd.xldate_as_tuple(row[col_idx], wb.datemode))
+                        except Exception:
+                            pass
+                rows.append(row)
 
-        sd = SheetData(
-            name=ws.name,
-            rows=rows,
-            num_rows=ws.nrows,
-            num_cols=ws.ncols,
-        )
-        sheets.append(sd)
+            sd = SheetData(
+                name=ws.name,
+                rows=rows,
+                num_rows=ws.nrows,
+                num_cols=ws.ncols,
+            )
+            sheets.append(sd)
+            wb.unload_sheet(sheet_idx)
+    finally:
+        wb.release_resources()
 
     return sheets
 
@@ -124,9 +290,11 @@ def _read_xls_as_html(filepath: str) -> List[SheetData]:
     with open(filepath, 'rb') as f:
         content = f.read()
 
-    # Check if it looks like HTML
-    if b'<html' not in content.lower() and b'<table' not in content.lower():
+    # Check if it looks like HTML (lowercase the bytes once, not per marker)
+    lowered = content.lower()
+    if b'<html' not in lowered and b'<table' not in lowered:
         raise ValueError("File is not HTML-encoded")
+    del lowered
 
     soup = BeautifulSoup(content, 'lxml')
     tables = soup.find_all('table')
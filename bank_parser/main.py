@@ -6,19 +6,9 @@ import logging
 from datetime import datetime
 
 from .config import DATA_DIR, OUTPUT_DIR, LOG_DIR
-from .models import ParseResult
-from .file_reader import read_excel_file
-from .detector import detect_parser
+from .pipeline import process_file, process_files
 from .output import save_file_result, save_combined_output, save_parse_report
 
-# Import all parsers so they register themselves
-from .parsers import standard_18col, narodny, kaspi, otbasy, tengri
-from .parsers import alatau, tsesnabank, al_hilal, kazkom
-from .parsers import forte, bank_rbk, eurasian, kassa_nova, delta
-from .parsers import bcc, kzi, nurbank, altyn
-from .parsers import halyk_finance, citibank, bank_razvitiya
-from .parsers import china_banks, zaman
-
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,62 +21,35 @@ logging.basicConfig(
 logger = logging.getLogger('bank_parser')
 
 
-def process_file(filepath: str, folder_name: str) -> ParseResult:
-    """Process a single bank statement file."""
-    filename = os.path.basename(filepath)
-    ext = os.path.splitext(filename)[1].lower()
-
-    file_info = {
-        'filepath': filepath,
-        'filename': filename,
-        'extension': ext,
-        'folder_name': folder_name,
-    }
-
-    result = ParseResult(filepath=filepath, source_file=filename)
-
-    # Skip non-Excel files
-    if ext not in ('.xlsx', '.xls'):
-        result.parse_status = 'skipped'
-        result.errors.append(f'Unsupported extension: {ext}')
-        return result
+def _collect_files(data_dir: str) -> list:
+    """List (filepath, bank_folder) pairs for every statement file, in processing order."""
+    jobs = []
+    for bank_folder in sorted(os.listdir(data_dir)):
+        bank_path = os.path.join(data_dir, bank_folder)
+        if not os.path.isdir(bank_path) or bank_folder.startswith('.'):
+            continue
 
-    # Read file
-    try:
-        sheets = read_excel_file(filepath)
-    except Exception as e:
-        result.parse_status = 'failed'
-        result.errors.append(f'File read error: {e}')
-        logger.error(f'Failed to read {filename}: {e}')
-        return result
-
-    if not sheets or all(s.num_rows == 0 for s in sheets):
-        result.parse_status = 'skipped'
-        result.warnings.append('Empty file')
-        return result
-
-    # Detect parser
-    parser_cls = detect_parser(sheets, file_info)
-    if parser_cls is None:
-        result.parse_status = 'failed'
-        result.errors.append('No parser detected')
-        logger.warning(f'No parser for {filename} in {folder_name}')
-        return result
-
-    # Parse
-    try:
-        parser = parser_cls()
-        result = parser.parse(sheets, file_info)
-    except Exception as e:
-        result.parse_status = 'failed'
-        result.errors.append(f'Parse error: {e}')
-        logger.error(f'Parse error for {filename}: {e}', exc_info=True)
+        # Skip Office lock files (~$name.xlsx) and hidden files up front; empty
+        # files are kept so process_file reports them like any other failure
+        entries = sorted(os.scandir(bank_path), key=lambda e: e.name)
+        for entry in entries:
+            filename = entry.name
+            if filename.startswith('~') or filename.startswith('.'):
+                continue
+            if not filename.lower().endswith(('.xlsx', '.xls')):
+                continue
+            if not entry.is_file():
+                continue
+            jobs.append((entry.path, bank_folder))
+    return jobs
 
-    return result
 
+def process_all(data_dir: str = None, output_dir: str = None, workers: int = 1):
+    """Process all bank statement files in data directory.
 
-def process_all(data_dir: str = None, output_dir: str = None):
-    """Process all bank statement files in data directory."""
+    With workers > 1 (0 = all CPU cores), files are read and parsed in a
+    process pool; results are still reported and saved in directory order.
+    """
     data_dir = data_dir or DATA_DIR
     output_dir = output_dir or OUTPUT_DIR
 
@@ -95,44 +58,39 @@ def process_all(data_dir: str = None, output_dir: str = None):
         return
 
     all_results = []
-    total_files = 0
     success_count = 0
 
-    # Walk through bank folders
-    for bank_folder in sorted(os.listdir(data_dir)):
-        bank_path = os.path.join(data_dir, bank_folder)
-        if not os.path.isdir(bank_path) or bank_folder.startswith('.'):
-            continue
-
-        logger.info(f'\n{"="*60}')
-        logger.info(f'Processing bank: {bank_folder}')
-        logger.info(f'{"="*60}')
-
-        for filename in sorted(os.listdir(bank_path)):
-            if filename.startswith('~') or filename.startswith('.'):
-                continue
-            if not filename.endswith(('.xlsx', '.xls')):
-                continue
-
-            filepath = os.path.join(bank_path, filename)
-            total_files += 1
-
-            logger.info(f'  Processing: {filename}')
-            result = process_file(filepath, bank_folder)
-            all_results.append(result)
-
-            if result.parse_status in ('success', 'partial'):
-                success_count += 1
-                logger.info(f'    -> {result.parse_status}: {result.total_transactions} transactions '
-                          f'(parser: {result.parser_used})')
-            else:
-                logger.warning(f'    -> {result.parse_status}: {result.errors}')
-
-            # Save individual file result
-            try:
-                save_file_result(result, output_dir)
-            except Exception as e:
-                logger.error(f'Failed to save result for {filename}: {e}')
+    jobs = _collect_files(data_dir)
+    total_files = len(jobs)
+    filepaths = [filepath for filepath, _ in jobs]
+    folders = [folder for _, folder in jobs]
+
+    results = process_files(filepaths, folders, workers)
+
+    current_bank = None
+    for (filepath, bank_folder), result in zip(jobs, results):
+        if bank_folder != current_bank:
+            current_bank = bank_folder
+            logger.info(f'\n{"="*60}')
+            logger.info(f'Processing bank: {bank_folder}')
+            logger.info(f'{"="*60}')
+
+        filename = os.path.basename(filepath)
+        logger.info(f'  Processing: {filename}')
+        all_results.append(result)
+
+        if result.parse_status in ('success', 'partial'):
+            success_count += 1
+            logger.info(f'    -> {result.parse_status}: {result.total_transactions} transactions '
+                      f'(parser: {result.parser_used})')
+        else:
+            logger.warning(f'    -> {result.parse_status}: {result.errors}')
+
+        # Save individual file result
+        try:
+            save_file_result(result, output_dir)
+        except Exception as e:
+            logger.error(f'Failed to save result for {filename}: {e}')
 
     # Save combined output and report
     logger.info(f'\n{"="*60}')
@@ -161,6 +119,8 @@ if __name__ == '__main__':
     parser.add_argument('--data-dir', default=DATA_DIR, help='Input directory with bank folders')
     parser.add_argument('--output-dir', default=OUTPUT_DIR, help='Output directory for JSON files')
     parser.add_argument('--file', help='Process a single file (provide full path)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Parallel worker processes for parsing, 0 = all cores (default: 1)')
     args = parser.parse_args()
 
     if args.file:
@@ -173,4 +133,4 @@ if __name__ == '__main__':
             print(f'Errors: {result.errors}')
         save_file_result(result, args.output_dir)
     else:
-        process_all(args.data_dir, args.output_dir)
+        process_all(args.data_dir, args.output_dir, workers=args.workers)
@@ -1,10 +1,12 @@
 """Unified transaction model — 20 fields matching check.xlsx target format."""
 
-from dataclasses import dataclass, asdict, fields
+import sys
+from dataclasses import dataclass, fields
+from operator import attrgetter
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     transaction_date: Optional[str] = None        # Дата операции
     amount: Optional[float] = None                # Сумма
@@ -28,7 +30,16 @@ class Transaction:
     source_file: Optional[str] = None             # Исходный файл
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return dict(zip(_TRANSACTION_FIELDS, _transaction_values(self)))
+
+    def to_tuple(self) -> tuple:
+        """Field values in field order — the cheap form for bulk/columnar export."""
+        return _transaction_values(self)
+
+    @classmethod
+    def from_positional(cls, *values) -> 'Transaction':
+        """Build a Transaction from values given in field order."""
+        return cls(*values)
 
     @staticmethod
     def field_names() -> list:
@@ -36,14 +47,22 @@ class Transaction:
 
     @staticmethod
     def russian_headers() -> list:
-        return [
-            'Дата операции', 'Сумма', 'Валюта', 'Сумма в тенге',
-            'Направление', 'Плательщик', 'ИИН/БИН плательщика',
-            'Банк плательщика', 'Счёт плательщика', 'Получатель',
-            'ИИН/БИН получателя', 'Банк получателя', 'Счёт получателя',
-            'Тип операции', 'КНП', 'Назначение платежа',
-            'Номер документа', 'Банк выписки', 'Номер счёта', 'Исходный файл',
-        ]
+        return list(RUSSIAN_HEADERS)
+
+
+_TRANSACTION_FIELDS = tuple(Transaction.field_names())
+_transaction_values = attrgetter(*_TRANSACTION_FIELDS)
+
+# Export column labels, in field order — built once and interned so that
+# per-row dict/column construction reuses the same key objects.
+RUSSIAN_HEADERS = tuple(sys.intern(h) for h in (
+    'Дата операции', 'Сумма', 'Валюта', 'Сумма в тенге',
+    'Направление', 'Плательщик', 'ИИН/БИН плательщика',
+    'Банк плательщика', 'Счёт плательщика', 'Получатель',
+    'ИИН/БИН получателя', 'Банк получателя', 'Счёт получателя',
+    'Тип операции', 'КНП', 'Назначение платежа',
+    'Номер документа', 'Банк выписки', 'Номер счёта', 'Исходный файл',
+))
 
 
 @dataclass
@@ -19,6 +19,25 @@ DATE_FORMATS = [
     '%d.%m.%y',                    # 06.08.15 (2-digit year)
 ]
 
+# DATE_FORMATS narrowed by the shape of the string, order preserved:
+# formats with a time part need ':' in the value, and day-first formats are
+# the only ones that can match when a separator sits at index 2 (%Y is 4 digits).
+_FORMATS_BY_SHAPE = {
+    (has_time, day_first): [
+        f for f in DATE_FORMATS
+        if (':' in f) == has_time and (f.startswith('%d') or not day_first)
+    ]
+    for has_time in (False, True)
+    for day_first in (False, True)
+}
+
+# Kazakh IBAN-style account number as it appears in statement headers
+IBAN_RE = re.compile(r'(KZ\w{16,22})')
+# Strict IBAN: KZ + 2 check digits + 4-char bank code + 12 digits
+STRICT_IBAN_RE = re.compile(r'(KZ\d{2}[A-Za-z0-9]{4}\d{12})')
+
+_NON_DIGIT_RE = re.compile(r'\D')
+
 
 def normalize_date(value) -> Optional[str]:
     """Normalize any date format to ISO 8601 string."""
@@ -34,7 +53,8 @@ def normalize_date(value) -> Optional[str]:
     if not s:
         return None
 
-    for fmt in DATE_FORMATS:
+    formats = _FORMATS_BY_SHAPE[':' in s, s[2:3] in ('.', '/')]
+    for fmt in formats:
         try:
             dt = datetime.strptime(s, fmt)
             if dt.hour == 0 and dt.minute == 0 and dt.second == 0:
@@ -64,7 +84,7 @@ def normalize_iin_bin(value) -> Optional[str]:
     # Remove non-breaking spaces
     s = s.replace('\xa0', '').replace(' ', '')
     # Remove any non-digit characters
-    digits = re.sub(r'\D', '', s)
+    digits = _NON_DIGIT_RE.sub('', s)
 
     if not digits:
         return s if s else None
@@ -88,7 +108,10 @@ def normalize_amount(value) -> Optional[float]:
     if not s:
         return None
 
-    # Remove thousand separators (non-breaking space, regular space)
+    # Remove thousand separators (non-breaking space, regular space).
+    # Chained replace() beats str.translate here: on short cells a
+    # replace with nothing to remove returns the same string, while
+    # translate always builds a new one (2-6x slower when measured)
     s = s.replace('\xa0', '').replace(' ', '')
     # Remove currency symbols
     s = s.replace('₸', '').replace('$', '').replace('€', '')
@@ -106,6 +129,29 @@ def normalize_amount(value) -> Optional[float]:
         return None
 
 
+def normalize_amount_column(values) -> list:
+    """Normalize a whole amount column.
+
+    Numeric cells (the usual case for .xlsx/.xls) are rounded directly;
+    text cells go through normalize_amount once per distinct value.
+    """
+    cache = {}
+    result = []
+    for value in values:
+        cls = value.__class__
+        if cls is float or cls is int:
+            result.append(round(float(value), 2))
+        elif value is None:
+            result.append(None)
+        else:
+            try:
+                normalized = cache[value]
+            except KeyError:
+                normalized = cache[value] = normalize_amount(value)
+            result.append(normalized)
+    return result
+
+
 def normalize_amount_abs(value) -> Optional[float]:
     """Normalize amount and return absolute value."""
     result = normalize_amount(value)
@@ -114,6 +160,22 @@ def normalize_amount_abs(value) -> Optional[float]:
     return None
 
 
+def first_amount(*amounts) -> Optional[float]:
+    """Pick the first non-zero amount, else the first one present (may be 0.0).
+
+    Used for debit/credit column pairs where the unused side is empty or 0.
+    """
+    present = None
+    for amount in amounts:
+        if amount is None:
+            continue
+        if amount != 0:
+            return amount
+        if present is None:
+            present = amount
+    return present
+
+
 def normalize_currency(value) -> Optional[str]:
     """Normalize currency to ISO code."""
     if value is None:
@@ -152,6 +214,15 @@ def normalize_currency(value) -> Optional[str]:
     return s.upper() if s else None
 
 
+def direction_from_amounts(debit: Optional[float], credit: Optional[float]) -> Optional[str]:
+    """Direction from already-normalized debit/credit amounts (one side set, the other empty)."""
+    if credit and credit > 0 and (not debit or debit == 0):
+        return 'Приход'
+    if debit and debit > 0 and (not credit or credit == 0):
+        return 'Расход'
+    return None
+
+
 def determine_direction(debit_amount=None, credit_amount=None,
                         operation_type=None, raw_direction=None) -> Optional[str]:
     """Determine transaction direction (Приход/Расход)."""
@@ -169,13 +240,9 @@ def determine_direction(debit_amount=None, credit_amount=None,
                 return 'Расход'
 
     # 2. Separate debit/credit amounts
-    credit_val = normalize_amount(credit_amount)
-    debit_val = normalize_amount(debit_amount)
-
-    if credit_val and credit_val > 0 and (not debit_val or debit_val == 0):
-        return 'Приход'
-    if debit_val and debit_val > 0 and (not credit_val or credit_val == 0):
-        return 'Расход'
+    direction = direction_from_amounts(normalize_amount(debit_amount), normalize_amount(credit_amount))
+    if direction:
+        return direction
 
     # 3. Operation type text
     if operation_type:
@@ -193,13 +260,34 @@ def determine_direction(debit_amount=None, credit_amount=None,
     return None
 
 
+def normalize_column(normalizer, values) -> list:
+    """Apply a normalizer to a whole column, computing each distinct value once.
+
+    Statement columns (dates, amounts, currencies) repeat heavily, so this
+    avoids re-parsing the same raw cell value row after row.
+    """
+    cache = {}
+    result = []
+    for value in values:
+        key = (value.__class__, value)  # keep 1, 1.0 and True apart
+        try:
+            normalized = cache[key]
+        except KeyError:
+            normalized = cache[key] = normalizer(value)
+        except TypeError:  # unhashable cell value
+            normalized = normalizer(value)
+        result.append(normalized)
+    return result
+
+
 def clean_string(value) -> Optional[str]:
     """Clean a string value — strip whitespace, normalize spaces."""
     if value is None:
         return None
-    s = str(value).strip()
-    if not s or s.lower() == 'none':
+    # Cells are usually str already; skip the str() copy for them
+    s = value if value.__class__ is str else str(value)
+    # Collapse whitespace runs to single spaces (also strips both ends)
+    s = ' '.join(s.split())
+    if not s or (len(s) == 4 and s.lower() == 'none'):
         return None
-    # Normalize multiple spaces to single
-    s = re.sub(r'\s+', ' ', s)
     return s
@@ -39,9 +39,7 @@ def save_combined_output(results: List[ParseResult], output_dir: str = None) ->
     out_dir = output_dir or OUTPUT_DIR
     os.makedirs(out_dir, exist_ok=True)
 
-    all_transactions = []
-    for r in results:
-        all_transactions.extend([t.to_dict() for t in r.transactions])
+    all_transactions = [t.to_dict() for r in results for t in r.transactions]
 
     out_path = os.path.join(out_dir, 'all_transactions.json')
     with open(out_path, 'w', encoding='utf-8') as f:
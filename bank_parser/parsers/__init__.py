@@ -1,9 +1,37 @@
-"""Parser registry. All parsers auto-register via the register_parser decorator."""
+"""Parser registry. All parsers auto-register via the register_parser decorator.
+
+Parser modules are imported on first use (load_parsers), not when the
+package is imported, so tools that never detect a file skip the cost.
+"""
+
+import importlib
 
 PARSER_REGISTRY = []
 
+# Parser modules, in registration (= detection tie-break) order
+PARSER_MODULES = (
+    'standard_18col', 'narodny', 'kaspi', 'otbasy', 'tengri',
+    'alatau', 'tsesnabank', 'al_hilal', 'kazkom',
+    'forte', 'bank_rbk', 'eurasian', 'kassa_nova', 'delta',
+    'bcc', 'kzi', 'nurbank', 'altyn',
+    'halyk_finance', 'citibank', 'bank_razvitiya',
+    'china_banks', 'zaman',
+)
+
+_loaded = False
+
 
 def register_parser(cls):
     """Decorator to register a parser class in the global registry."""
     PARSER_REGISTRY.append(cls)
     return cls
+
+
+def load_parsers() -> list:
+    """Import all parser modules once so they register themselves."""
+    global _loaded
+    if not _loaded:
+        for name in PARSER_MODULES:
+            importlib.import_module(f'.{name}', __name__)
+        _loaded = True
+    return PARSER_REGISTRY
@@ -0,0 +1,21 @@
+"""Precompiled patterns shared by several parsers.
+
+Header-row signatures are bank-specific and stay in their parser module;
+this module holds the account/IIN/BIN patterns that recur across banks.
+"""
+
+import re
+
+from ..normalizer import IBAN_RE, STRICT_IBAN_RE  # noqa: F401 — re-exported for parsers
+
+# IBAN in sheet names/filenames ("KZ72551N129228750KZT"); tighter bound than
+# IBAN_RE so trailing filename text is not swallowed
+SHORT_IBAN_RE = re.compile(r'(KZ\w{16,20})')
+
+# IIN/BIN and account embedded in a multi-line counterparty cell
+# ("ТОО Ромат\nИИК: KZ...\nБИН: 123456789012"), both in one scan:
+# finditer and dispatch on m.lastgroup ('iin' or 'account')
+LABELED_PARTY_RE = re.compile(
+    r'(?:БИН|ИИН|BIN|IIN)[:\s]*(?P<iin>\d{12})'
+    r'|(?:ИИК|IIK|Счет)[:\s]*(?P<account>KZ\w{16,22})'
+)
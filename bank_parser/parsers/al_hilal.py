@@ -12,26 +12,49 @@ from ..base_parser import BaseParser
 from ..models import Transaction
 from ..file_reader import SheetData
 from ..normalizer import (
-    normalize_date, normalize_iin_bin, normalize_amount,
-    normalize_currency, determine_direction, clean_string
+    IBAN_RE, normalize_date, normalize_iin_bin, normalize_amount_column,
+    normalize_currency, direction_from_amounts, clean_string
 )
 from . import register_parser
 
+# Bank name / SWIFT code in the top rows of both Al Hilal formats;
+# the actual score depends on the layout and is decided in can_parse
+AL_HILAL_MARKERS = {'hlalkzkz': 1.0, 'al hilal': 1.0}
+
+# Header-row signatures, one search per row text:
+# 6-col: 'дата транзакции', or 'дата' together with 'кредит'/'дебет' (either order);
+# re.S because header cells may hold newlines ("Дата\nтранзакции")
+_SIMPLE_HEADER_RE = re.compile(r'дата транзакции|дата.*(?:кредит|дебет)|(?:кредит|дебет).*дата', re.S)
+# 20-col: group header row, and the column header row that may follow it
+_FULL_HEADER_RE = re.compile(r'отправитель|получатель|сумма')
+_FULL_SUBHEADER_RE = re.compile(r'счет|рнн|код')
+
+# 6-col format header cells: matched verbatim, then (substrings, field) rules in order
+_SIMPLE_EXACT_HEADERS = {'дата': 'date', 'кредит': 'credit', 'дебет': 'debit', 'баланс': 'balance'}
+_SIMPLE_HEADER_RULES = (
+    (('дата транзакции',), 'date'),
+    (('дата валют',), 'value_date'),
+    (('детали',), 'details'),
+    (('описание',), 'details'),
+)
+# Date-column text of summary rows in the 6-col format
+_SIMPLE_SUMMARY_WORDS = ('итого', 'остаток', 'входящий')
+
 
 @register_parser
 class AlHilalParser(BaseParser):
     """Al Hilal 6-column .xlsx format."""
     BANK_NAME = 'АО Исламский Банк Al Hilal'
+    MARKERS = AL_HILAL_MARKERS
+    MARKER_ROWS = 5
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
-        for row in sheet.rows[:5]:
-            for cell in row:
-                if cell and ('HLALKZKZ' in str(cell) or 'Al Hilal' in str(cell)):
-                    # Check if this is the simple 6-col format (few columns)
-                    if sheet.num_cols <= 10:
-                        return 0.95
-                    return 0.5  # Let the full parser take priority
+        if cls.marker_score(sheet):
+            # Check if this is the simple 6-col format (few columns)
+            if sheet.num_cols <= 10:
+                return 0.95
+            return 0.5  # Let the full parser take priority
         folder = file_info.get('folder_name', '').lower()
         if 'al hilal' in folder and sheet.num_cols <= 10:
             return 0.8
@@ -39,17 +62,13 @@ class AlHilalParser(BaseParser):
 
     def parse_sheet(self, sheet: SheetData, file_info: dict) -> Tuple[List[Transaction], dict]:
         rows = sheet.rows
-        transactions = []
         account_number = None
         currency = None
 
         # Extract metadata
-        for row in rows[:10]:
-            for cell in row:
-                if cell is None:
-                    continue
-                s = str(cell)
-                match = re.search(r'(KZ\w{16,22})', s)
+        for cells in sheet.top_cells(10):
+            for s in cells:
+                match = IBAN_RE.search(s)
                 if match:
                     account_number = match.group(1)
                 if 'валюта:' in s.lower():
@@ -64,9 +83,9 @@ class AlHilalParser(BaseParser):
 
         # Find header
         header_idx = None
-        for i, row in enumerate(rows[:15]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
-            if 'дата транзакции' in row_text or ('дата' in row_text and ('кредит' in row_text or 'дебет' in row_text)):
+        row_texts, _ = sheet.top_lower(15)
+        for i, row_text in enumerate(row_texts):
+            if _SIMPLE_HEADER_RE.search(row_text):
                 header_idx = i
                 break
 
@@ -78,93 +97,69 @@ class AlHilalParser(BaseParser):
 
         col_map = {}
         for i, h in enumerate(header_lower):
-            if 'дата транзакции' in h or (h == 'дата' and 'date' not in col_map):
-                col_map['date'] = i
-            elif 'дата валют' in h:
-                col_map['value_date'] = i
-            elif 'детали' in h or 'описание' in h:
-                col_map['details'] = i
-            elif h == 'кредит':
-                col_map['credit'] = i
-            elif h == 'дебет':
-                col_map['debit'] = i
-            elif h == 'баланс':
-                col_map['balance'] = i
-
-        for row_idx in range(header_idx + 1, len(rows)):
-            row = rows[row_idx]
-            if not row or all(c is None for c in row):
-                continue
+            key = self.header_field(h, _SIMPLE_EXACT_HEADERS, _SIMPLE_HEADER_RULES)
+            if key == 'date' and h == 'дата' and 'date' in col_map:
+                continue  # a bare 'Дата' never replaces an earlier date column
+            if key is not None:
+                col_map[key] = i
 
-            date_val = self._get(row, col_map.get('date'))
-            if date_val is None:
-                continue
+        fetch = self.row_getter(col_map, ['date', 'credit', 'debit', 'details'])
 
-            if isinstance(date_val, str) and any(w in date_val.lower() for w in ['итого', 'остаток', 'входящий']):
-                continue
+        data_rows = self.dated_rows(rows, header_idx + 1, col_map.get('date'), _SIMPLE_SUMMARY_WORDS)
+        data = [fetch(row) for row in data_rows]
 
-            credit = normalize_amount(self._get(row, col_map.get('credit')))
-            debit = normalize_amount(self._get(row, col_map.get('debit')))
-            direction = determine_direction(debit_amount=debit, credit_amount=credit)
-            amount = credit or debit
+        # Credit/debit columns are normalized in bulk, column by column
+        credits = normalize_amount_column([cells[1] for cells in data])
+        debits = normalize_amount_column([cells[2] for cells in data])
+        currency_code = normalize_currency(currency)
 
-            t = Transaction(
-                transaction_date=normalize_date(date_val),
-                amount=amount,
-                currency=normalize_currency(currency),
-                amount_tenge=amount if currency == 'KZT' else None,
-                direction=direction,
-                payer=None, payer_iin_bin=None, payer_bank=None, payer_account=None,
-                recipient=None, recipient_iin_bin=None, recipient_bank=None, recipient_account=None,
-                operation_type=None, knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('details'))),
-                document_number=None,
-                statement_bank=self.BANK_NAME,
-                account_number=account_number,
-                source_file=file_info['filename'],
-            )
-            transactions.append(t)
+        amount_is_tenge = currency == 'KZT'
+        source_file = file_info['filename']
 
-        return transactions, {'account_number': account_number, 'warnings': [], 'errors': []}
+        buf = []  # one field-ordered tuple per row
+        for (date_val, _, _, details_cell), credit, debit in zip(data, credits, debits):
+            amount = credit or debit
+            buf.append((
+                normalize_date(date_val),  # transaction_date
+                amount,  # amount
+                currency_code,  # currency
+                amount if amount_is_tenge else None,  # amount_tenge
+                direction_from_amounts(debit, credit),  # direction
+                None, None, None, None,  # payer, payer_iin_bin, payer_bank, payer_account
+                None, None, None, None,  # recipient, recipient_iin_bin, recipient_bank, recipient_account
+                None,  # operation_type
+                None,  # knp
+                clean_string(details_cell),  # payment_purpose
+                None,  # document_number
+                self.BANK_NAME,  # statement_bank
+                account_number,  # account_number
+                source_file,  # source_file
+            ))
+        transactions = [Transaction.from_positional(*t) for t in buf]
 
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
+        return transactions, {'account_number': account_number, 'warnings': [], 'errors': []}
 
 
 @register_parser
 class AlHilalFullParser(BaseParser):
     """Al Hilal 20-col .xls format (outgoing transfers)."""
     BANK_NAME = 'АО Исламский Банк Al Hilal'
+    MARKERS = AL_HILAL_MARKERS
+    MARKER_ROWS = 20
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
         folder = file_info.get('folder_name', '').lower()
 
         # Scan for Al Hilal bank identifiers
-        found_al_hilal_id = False
-        for row in sheet.rows[:20]:
-            for cell in row:
-                if cell:
-                    cs = str(cell)
-                    if 'HLALKZKZ' in cs or 'Al Hilal' in cs or 'AL HILAL' in cs.upper():
-                        found_al_hilal_id = True
-                        break
-            if found_al_hilal_id:
-                break
+        found_al_hilal_id = cls.marker_score(sheet) > 0
 
         # Check for РНН (unique to Al Hilal) in headers
-        has_rnn = False
-        for row in sheet.rows[:5]:
-            if any(c and 'рнн' in str(c).lower() for c in row):
-                has_rnn = True
-                break
+        row_texts, _ = sheet.top_lower(5)
+        has_rnn = any('рнн' in row_text for row_text in row_texts)
 
         # Header at row 0-2 with full column set
-        for row in sheet.rows[:3]:
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        for row_text in row_texts[:3]:
             if 'отправитель' in row_text and 'получатель' in row_text:
                 if found_al_hilal_id:
                     return 0.97
@@ -192,7 +187,6 @@ class AlHilalFullParser(BaseParser):
 
     def parse_sheet(self, sheet: SheetData, file_info: dict) -> Tuple[List[Transaction], dict]:
         rows = sheet.rows
-        transactions = []
 
         # Detect currency from filename/sheetname
         fn_lower = (file_info.get('filename', '') + ' ' + sheet.name).lower()
@@ -209,16 +203,16 @@ class AlHilalFullParser(BaseParser):
 
         # Find header — check rows 0-5 for column names
         header_idx = None
-        for i, row in enumerate(rows[:5]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
-            if 'отправитель' in row_text or 'получатель' in row_text or 'сумма' in row_text:
+        row_texts, _ = sheet.top_lower(6)
+        for i, row_text in enumerate(row_texts[:5]):
+            if _FULL_HEADER_RE.search(row_text):
                 header_idx = i
                 break
 
         # Could be 2-row header (row 0 = group headers, row 1 = column headers)
         if header_idx is not None and header_idx + 1 < len(rows):
-            next_text = ' '.join(str(c).lower() for c in rows[header_idx + 1] if c)
-            if 'счет' in next_text or 'рнн' in next_text or 'код' in next_text:
+            next_text = row_texts[header_idx + 1]
+            if _FULL_SUBHEADER_RE.search(next_text):
                 header_idx = header_idx + 1
 
         if header_idx is None:
@@ -265,58 +259,71 @@ class AlHilalFullParser(BaseParser):
             row = rows[data_start]
             if row and any(c is not None for c in row):
                 # Check if it's a numeric index row (all small numbers)
-                vals = [c for c in row if c is not None]
-                text = ' '.join(str(v) for v in vals)
-                if all(str(v).strip().isdigit() and int(str(v).strip()) < 30 for v in vals if str(v).strip()):
+                texts = [str(c).strip() for c in row if c is not None]
+                if all(t.isdigit() and int(t) < 30 for t in texts if t):
                     data_start += 1
                     continue
             break
 
-        for row_idx in range(data_start, len(rows)):
+        fetch = self.row_getter(col_map, [
+            'date', 'value_date', 'amount', 'payer', 'payer_iin', 'payer_account',
+            'recipient', 'recipient_iin', 'recipient_account', 'knp', 'purpose', 'code',
+        ])
+
+        # Rows without a date are skipped, so with no date column there is nothing to scan
+        end = len(rows) if ('date' in col_map or 'value_date' in col_map) else data_start
+
+        data = []
+        for row_idx in range(data_start, end):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
 
-            date_val = self._get(row, col_map.get('date'))
+            cells = fetch(row)
+            date_val = cells[0]
             if date_val is None:
                 # Try value_date
-                date_val = self._get(row, col_map.get('value_date'))
+                date_val = cells[1]
             if date_val is None:
                 continue
 
             if isinstance(date_val, str) and any(w in date_val.lower() for w in ['итого', 'всего']):
                 continue
 
-            amount = normalize_amount(self._get(row, col_map.get('amount')))
-
-            t = Transaction(
-                transaction_date=normalize_date(date_val),
-                amount=amount,
-                currency=normalize_currency(currency),
-                amount_tenge=amount if currency == 'KZT' else None,
-                direction=direction,
-                payer=clean_string(self._get(row, col_map.get('payer'))),
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('payer_iin'))),
-                payer_bank=None,
-                payer_account=clean_string(self._get(row, col_map.get('payer_account'))),
-                recipient=clean_string(self._get(row, col_map.get('recipient'))),
-                recipient_iin_bin=normalize_iin_bin(self._get(row, col_map.get('recipient_iin'))),
-                recipient_bank=None,
-                recipient_account=clean_string(self._get(row, col_map.get('recipient_account'))),
-                operation_type=None,
-                knp=clean_string(self._get(row, col_map.get('knp'))),
-                payment_purpose=clean_string(self._get(row, col_map.get('purpose'))),
-                document_number=clean_string(self._get(row, col_map.get('code'))),
-                statement_bank=self.BANK_NAME,
-                account_number=None,
-                source_file=file_info['filename'],
-            )
-            transactions.append(t)
+            data.append((date_val, cells))
+
+        # Amount column is normalized in bulk
+        amounts = normalize_amount_column([cells[2] for _, cells in data])
+        currency_code = normalize_currency(currency)
+        source_file = file_info['filename']
+
+        buf = []  # one field-ordered tuple per row
+        for (date_val, cells), amount in zip(data, amounts):
+            (_, _, _, payer_cell, payer_iin_cell, payer_account_cell,
+             recipient_cell, recipient_iin_cell, recipient_account_cell,
+             knp_cell, purpose_cell, code_cell) = cells
+            buf.append((
+                normalize_date(date_val),  # transaction_date
+                amount,  # amount
+                currency_code,  # currency
+                amount if currency == 'KZT' else None,  # amount_tenge
+                direction,  # direction
+                clean_string(payer_cell),  # payer
+                normalize_iin_bin(payer_iin_cell),  # payer_iin_bin
+                None,  # payer_bank
+                clean_string(payer_account_cell),  # payer_account
+                clean_string(recipient_cell),  # recipient
+                normalize_iin_bin(recipient_iin_cell),  # recipient_iin_bin
+                None,  # recipient_bank
+                clean_string(recipient_account_cell),  # recipient_account
+                None,  # operation_type
+                clean_string(knp_cell),  # knp
+                clean_string(purpose_cell),  # payment_purpose
+                clean_string(code_cell),  # document_number
+                self.BANK_NAME,  # statement_bank
+                None,  # account_number
+                source_file,  # source_file
+            ))
+        transactions = [Transaction.from_positional(*t) for t in buf]
 
         return transactions, {'account_number': None, 'warnings': [], 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
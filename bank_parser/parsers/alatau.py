@@ -5,22 +5,28 @@ File naming: Statement_standard_KZxxx.xlsx
 Some files may have only 1 row (empty statements).
 """
 
-import re
 from typing import List, Tuple, Optional
 
 from ..base_parser import BaseParser
 from ..models import Transaction
 from ..file_reader import SheetData
 from ..normalizer import (
-    normalize_date, normalize_iin_bin, normalize_amount,
-    normalize_currency, determine_direction, clean_string
+    IBAN_RE, normalize_date, normalize_iin_bin, normalize_amount_column, normalize_column,
+    normalize_currency, direction_from_amounts, clean_string
 )
 from . import register_parser
 
+# Header row: a date column plus one of the turnover columns
+_HEADER_AMOUNT_WORDS = ('дебет', 'кредит', 'оборот')
+_HEADER_PARTY_WORDS = ('плательщик', 'получатель')
+# Date-column text of summary rows below the data
+_SUMMARY_WORDS = ('итого', 'остаток')
+
 
 @register_parser
 class AlatauCityParser(BaseParser):
     BANK_NAME = 'АО Alatau City Bank'
+    MARKERS = {'alatau city': 0.85}
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
@@ -32,30 +38,25 @@ class AlatauCityParser(BaseParser):
         if 'alatau' in folder:
             return 0.8
 
-        for row in sheet.rows[:10]:
-            for cell in row:
-                if cell and 'alatau city' in str(cell).lower():
-                    return 0.85
-        return 0.0
+        return cls.marker_score(sheet)
 
     def parse_sheet(self, sheet: SheetData, file_info: dict) -> Tuple[List[Transaction], dict]:
         rows = sheet.rows
-        transactions = []
         account_number = None
 
         # Extract account from filename
-        match = re.search(r'(KZ\w{16,22})', file_info.get('filename', ''))
+        match = IBAN_RE.search(file_info.get('filename', ''))
         if match:
             account_number = match.group(1)
 
         # Find header row
         header_idx = None
-        for i, row in enumerate(rows[:20]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
-            if 'дата' in row_text and ('дебет' in row_text or 'кредит' in row_text or 'оборот' in row_text):
+        row_texts, _ = sheet.top_lower(20)
+        for i, row_text in enumerate(row_texts):
+            if 'дата' in row_text and any(w in row_text for w in _HEADER_AMOUNT_WORDS):
                 header_idx = i
                 break
-            if 'плательщик' in row_text or 'получатель' in row_text:
+            if any(w in row_text for w in _HEADER_PARTY_WORDS):
                 header_idx = i
                 break
 
@@ -85,46 +86,42 @@ class AlatauCityParser(BaseParser):
             elif 'иин' in h or 'бин' in h:
                 col_map.setdefault('iin', i)
 
-        for row_idx in range(header_idx + 1, len(rows)):
-            row = rows[row_idx]
-            if not row or all(c is None for c in row):
-                continue
+        fetch = self.row_getter(col_map, ['date', 'debit', 'credit', 'currency', 'payer', 'recipient', 'purpose'])
 
-            date_val = self._get(row, col_map.get('date'))
-            if date_val is None:
-                continue
+        data_rows = self.dated_rows(rows, header_idx + 1, col_map.get('date'), _SUMMARY_WORDS)
+        data = [fetch(row) for row in data_rows]
 
-            if isinstance(date_val, str) and any(w in date_val.lower() for w in ['итого', 'остаток']):
-                continue
+        # Debit/credit oborot columns are normalized in bulk, column by column
+        debits = normalize_amount_column([cells[1] for cells in data])
+        credits = normalize_amount_column([cells[2] for cells in data])
+        # Repetitive text columns: one normalized (shared) string per distinct value
+        currencies = normalize_column(normalize_currency, [cells[3] for cells in data])
+        payers = normalize_column(clean_string, [cells[4] for cells in data])
+        recipients = normalize_column(clean_string, [cells[5] for cells in data])
 
-            debit = normalize_amount(self._get(row, col_map.get('debit')))
-            credit = normalize_amount(self._get(row, col_map.get('credit')))
-            direction = determine_direction(debit_amount=debit, credit_amount=credit)
+        source_file = file_info['filename']
+        buf = []  # one field-ordered tuple per row
+        for cells, debit, credit, currency, payer, recipient in zip(
+                data, debits, credits, currencies, payers, recipients):
             amount = credit or debit
-
-            t = Transaction(
-                transaction_date=normalize_date(date_val),
-                amount=amount,
-                currency=normalize_currency(self._get(row, col_map.get('currency'))),
-                amount_tenge=amount,
-                direction=direction,
-                payer=clean_string(self._get(row, col_map.get('payer'))),
-                payer_iin_bin=None, payer_bank=None, payer_account=None,
-                recipient=clean_string(self._get(row, col_map.get('recipient'))),
-                recipient_iin_bin=None, recipient_bank=None, recipient_account=None,
-                operation_type=None, knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('purpose'))),
-                document_number=None,
-                statement_bank=self.BANK_NAME,
-                account_number=account_number,
-                source_file=file_info['filename'],
-            )
-            transactions.append(t)
+            buf.append((
+                normalize_date(cells[0]),  # transaction_date
+                amount,  # amount
+                currency,  # currency
+                amount,  # amount_tenge
+                direction_from_amounts(debit, credit),  # direction
+                payer,  # payer
+                None, None, None,  # payer_iin_bin, payer_bank, payer_account
+                recipient,  # recipient
+                None, None, None,  # recipient_iin_bin, recipient_bank, recipient_account
+                None,  # operation_type
+                None,  # knp
+                clean_string(cells[6]),  # payment_purpose
+                None,  # document_number
+                self.BANK_NAME,  # statement_bank
+                account_number,  # account_number
+                source_file,  # source_file
+            ))
+        transactions = [Transaction.from_positional(*t) for t in buf]
 
         return transactions, {'account_number': account_number, 'warnings': [], 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
@@ -11,21 +11,67 @@ Columns: Дата и время операции | Валюта | Направл
          Код назначения платежа | Описание
 """
 
+from functools import lru_cache
+from itertools import repeat
 from typing import List, Tuple, Optional
 
 from ..base_parser import BaseParser
 from ..models import Transaction
 from ..file_reader import SheetData
 from ..normalizer import (
-    normalize_date, normalize_iin_bin, normalize_amount,
+    normalize_date, normalize_iin_bin, normalize_amount_column, normalize_column,
     normalize_currency, determine_direction, clean_string
 )
 from . import register_parser
 
 
+# Header cells matched exactly
+_EXACT_HEADERS = {'валюта': 'currency', 'направление': 'direction'}
+# (substrings that must all occur, field) — first matching rule wins
+_HEADER_RULES = (
+    (('дата и время',), 'date'),
+    (('сумма операции',), 'amount'),
+    (('сумма в тенге',), 'amount_tenge'),
+    (('плательщик', 'наименование'), 'payer'),
+    (('плательщик', 'фио'), 'payer'),
+    (('иин', 'плательщик'), 'payer_iin'),
+    (('банк плательщик',), 'payer_bank'),
+    (('счет', 'плательщик'), 'payer_account'),
+    (('получател', 'наименование'), 'recipient'),
+    (('получател', 'фио'), 'recipient'),
+    (('иин', 'получател'), 'recipient_iin'),
+    (('банк получател',), 'recipient_bank'),
+    (('счет', 'получател'), 'recipient_account'),
+    (('код назначен',), 'knp'),
+    (('описание',), 'payment_purpose'),
+    (('назначение',), 'payment_purpose'),
+)
+
+
+@lru_cache(maxsize=16)
+def _map_header(header_lower: tuple) -> dict:
+    """Map field names to column indices, cached by header signature.
+
+    Callers get a shared dict and must not modify it.
+    """
+    col_map = {}
+    for i, h in enumerate(header_lower):
+        key = BaseParser.header_field(h, _EXACT_HEADERS, _HEADER_RULES)
+        if key is not None:
+            col_map[key] = i
+    return col_map
+
+
+def _direction(value) -> Optional[str]:
+    """Направление cell -> Приход/Расход."""
+    return determine_direction(raw_direction=clean_string(value))
+
+
 @register_parser
 class AltynBankParser(BaseParser):
     BANK_NAME = 'АО Altyn Bank'
+    MARKERS = {'altyn bank': 0.85}
+    MARKER_ROWS = 5
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
@@ -33,14 +79,13 @@ class AltynBankParser(BaseParser):
         if 'altyn bank' in folder:
             return 0.85
 
-        for row in sheet.rows[:5]:
-            for cell in row:
-                if cell and 'altyn bank' in str(cell).lower():
-                    return 0.85
+        score = cls.marker_score(sheet)
+        if score:
+            return score
 
         # Check for 17-col header with Направление
-        for row in sheet.rows[:5]:
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(5)
+        for row_text in row_texts:
             if 'направление' in row_text and 'сумма операции' in row_text and 'описание' in row_text:
                 return 0.8
         return 0.0
@@ -48,12 +93,11 @@ class AltynBankParser(BaseParser):
     def parse_sheet(self, sheet: SheetData, file_info: dict) -> Tuple[List[Transaction], dict]:
         rows = sheet.rows
         warnings = []
-        transactions = []
 
         # Find header row
         header_idx = None
-        for i, row in enumerate(rows[:10]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(10)
+        for i, row_text in enumerate(row_texts):
             if 'дата и время операции' in row_text and 'направление' in row_text:
                 header_idx = i
                 break
@@ -64,91 +108,45 @@ class AltynBankParser(BaseParser):
         header = rows[header_idx]
         header_lower = [str(c).lower().strip() if c else '' for c in header]
 
-        # Map columns
-        col_map = {}
-        for i, h in enumerate(header_lower):
-            if 'дата и время' in h:
-                col_map['date'] = i
-            elif h == 'валюта':
-                col_map['currency'] = i
-            elif h == 'направление':
-                col_map['direction'] = i
-            elif 'сумма операции' in h:
-                col_map['amount'] = i
-            elif 'сумма в тенге' in h:
-                col_map['amount_tenge'] = i
-            elif 'плательщик' in h and ('наименование' in h or 'фио' in h):
-                col_map['payer'] = i
-            elif 'иин' in h and 'плательщик' in h:
-                col_map['payer_iin'] = i
-            elif 'банк плательщик' in h:
-                col_map['payer_bank'] = i
-            elif 'счет' in h and 'плательщик' in h:
-                col_map['payer_account'] = i
-            elif 'получател' in h and ('наименование' in h or 'фио' in h):
-                col_map['recipient'] = i
-            elif 'иин' in h and 'получател' in h:
-                col_map['recipient_iin'] = i
-            elif 'банк получател' in h:
-                col_map['recipient_bank'] = i
-            elif 'счет' in h and 'получател' in h:
-                col_map['recipient_account'] = i
-            elif 'код назначен' in h:
-                col_map['knp'] = i
-            elif 'описание' in h or 'назначение' in h:
-                col_map['payment_purpose'] = i
-            # Residency columns — just skip, they contain "Казахстан" etc
-            elif 'резидентство' in h and 'плательщик' in h:
-                col_map['payer_residency'] = i
-            elif 'резидентство' in h and 'получател' in h:
-                col_map['recipient_residency'] = i
-
-        # Handle residency columns by position if header names don't contain party name
-        if 'payer_residency' not in col_map and 'recipient_residency' not in col_map:
-            res_indices = [i for i, h in enumerate(header_lower) if h == 'резидентство']
-            # First residency after payer IIN = payer residency, second = recipient
-            # Skip — not needed for output
-
-        for row_idx in range(header_idx + 1, len(rows)):
-            row = rows[row_idx]
-            if not row or all(c is None for c in row):
-                continue
-
-            date_val = self._get(row, col_map.get('date'))
-            if date_val is None:
-                continue
-
-            raw_direction = clean_string(self._get(row, col_map.get('direction')))
-            direction = determine_direction(raw_direction=raw_direction)
-
-            t = Transaction(
-                transaction_date=normalize_date(date_val),
-                amount=normalize_amount(self._get(row, col_map.get('amount'))),
-                currency=normalize_currency(self._get(row, col_map.get('currency'))),
-                amount_tenge=normalize_amount(self._get(row, col_map.get('amount_tenge'))),
-                direction=direction,
-                payer=clean_string(self._get(row, col_map.get('payer'))),
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('payer_iin'))),
-                payer_bank=clean_string(self._get(row, col_map.get('payer_bank'))),
-                payer_account=clean_string(self._get(row, col_map.get('payer_account'))),
-                recipient=clean_string(self._get(row, col_map.get('recipient'))),
-                recipient_iin_bin=normalize_iin_bin(self._get(row, col_map.get('recipient_iin'))),
-                recipient_bank=clean_string(self._get(row, col_map.get('recipient_bank'))),
-                recipient_account=clean_string(self._get(row, col_map.get('recipient_account'))),
-                operation_type=None,
-                knp=clean_string(self._get(row, col_map.get('knp'))),
-                payment_purpose=clean_string(self._get(row, col_map.get('payment_purpose'))),
-                document_number=None,
-                statement_bank=self.BANK_NAME,
-                account_number=None,
-                source_file=file_info['filename'],
-            )
-            transactions.append(t)
+        col_map = _map_header(tuple(header_lower))
+
+        # Keep references to the data rows only; columns are pulled out one at
+        # a time below, so no per-row copy of the cells is ever built
+        data_rows = self.dated_rows(rows, header_idx + 1, col_map.get('date'))
+
+        def column(key, normalizer):
+            # Repeated values (currencies, directions, counterparties) are
+            # converted once per distinct value
+            return normalize_column(normalizer, self.column_values(data_rows, col_map.get(key)))
+
+        dates = column('date', normalize_date)
+        directions = column('direction', _direction)
+        amounts = normalize_amount_column(self.column_values(data_rows, col_map.get('amount')))
+        currencies = column('currency', normalize_currency)
+        amounts_tenge = normalize_amount_column(self.column_values(data_rows, col_map.get('amount_tenge')))
+        payers, payer_banks, payer_accounts = (
+            column(key, clean_string) for key in ('payer', 'payer_bank', 'payer_account')
+        )
+        recipients, recipient_banks, recipient_accounts, knps, purposes = (
+            column(key, clean_string)
+            for key in ('recipient', 'recipient_bank', 'recipient_account', 'knp', 'payment_purpose')
+        )
+        payer_iins, recipient_iins = (
+            column(key, normalize_iin_bin) for key in ('payer_iin', 'recipient_iin')
+        )
+
+        source_file = file_info['filename']
+        buf = zip(  # one field-ordered tuple per row
+            dates, amounts, currencies, amounts_tenge, directions,
+            payers, payer_iins, payer_banks, payer_accounts,
+            recipients, recipient_iins, recipient_banks, recipient_accounts,
+            repeat(None),  # operation_type
+            knps, purposes,
+            repeat(None),  # document_number
+            repeat(self.BANK_NAME),  # statement_bank
+            repeat(None),  # account_number
+            repeat(source_file),  # source_file
+        )
+        transactions = [Transaction.from_positional(*t) for t in buf]
 
         return transactions, {'account_number': None, 'warnings': warnings, 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
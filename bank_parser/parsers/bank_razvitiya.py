@@ -5,7 +5,6 @@ Format: System code format starting with "PC01_515_S".
 Columns include: Референс, Дата, Банк корресп., Счет корресп., etc.
 """
 
-import re
 from typing import List, Tuple, Optional
 
 from ..base_parser import BaseParser
@@ -16,22 +15,20 @@ from ..normalizer import (
     normalize_currency, clean_string
 )
 from . import register_parser
+from ._regex import IBAN_RE
 
 
 @register_parser
 class BankRazvitiyaParser(BaseParser):
     BANK_NAME = 'АО Банк Развития Казахстана'
+    MARKERS = {'dvkakzka': 0.95, 'pc01_515': 0.95, 'банк развития': 0.9}
+    MARKER_ROWS = 5
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
-        for row in sheet.rows[:5]:
-            for cell in row:
-                if cell:
-                    s = str(cell)
-                    if 'DVKAKZKA' in s or 'PC01_515' in s:
-                        return 0.95
-                    if 'Банк Развития' in s:
-                        return 0.9
+        score = cls.marker_score(sheet)
+        if score:
+            return score
         folder = file_info.get('folder_name', '').lower()
         if 'банк развития' in folder:
             return 0.8
@@ -43,14 +40,14 @@ class BankRazvitiyaParser(BaseParser):
         account_number = None
 
         # Extract account from filename
-        match = re.search(r'(KZ\w{16,22})', file_info.get('filename', ''))
+        match = IBAN_RE.search(file_info.get('filename', ''))
         if match:
             account_number = match.group(1)
 
         # Find header — can be deep in the file (row 23+)
         header_idx = None
-        for i, row in enumerate(rows[:40]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(40)
+        for i, row_text in enumerate(row_texts):
             if 'дата' in row_text and ('референс' in row_text or 'корресп' in row_text):
                 header_idx = i
                 break
@@ -92,21 +89,27 @@ class BankRazvitiyaParser(BaseParser):
             if 'док' in sub_text or 'корресп' in sub_text:
                 data_start += 1
 
+        fetch = self.row_getter(col_map, [
+            'date', 'amount', 'debit', 'credit', 'currency', 'amount_tenge',
+            'corr_bank', 'corr_account', 'purpose', 'ref',
+        ])
+
         for row_idx in range(data_start, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
 
-            date_val = self._get(row, col_map.get('date'))
+            (date_val, amount_val, debit_val, credit_val, currency_val, amount_tenge_val,
+             corr_bank, corr_account, purpose, ref) = fetch(row)
             if date_val is None:
                 continue
 
             if isinstance(date_val, str) and any(w in date_val.lower() for w in ['итого', 'остаток']):
                 continue
 
-            amount = normalize_amount(self._get(row, col_map.get('amount')))
-            debit = normalize_amount(self._get(row, col_map.get('debit')))
-            credit = normalize_amount(self._get(row, col_map.get('credit')))
+            amount = normalize_amount(amount_val)
+            debit = normalize_amount(debit_val)
+            credit = normalize_amount(credit_val)
 
             from ..normalizer import determine_direction
             direction = determine_direction(debit_amount=debit, credit_amount=credit)
@@ -116,16 +119,16 @@ class BankRazvitiyaParser(BaseParser):
             t = Transaction(
                 transaction_date=normalize_date(date_val),
                 amount=amount,
-                currency=normalize_currency(self._get(row, col_map.get('currency'))) or 'KZT',
-                amount_tenge=normalize_amount(self._get(row, col_map.get('amount_tenge'))),
+                currency=normalize_currency(currency_val) or 'KZT',
+                amount_tenge=normalize_amount(amount_tenge_val),
                 direction=direction,
                 payer=None, payer_iin_bin=None, payer_bank=None, payer_account=None,
                 recipient=None, recipient_iin_bin=None,
-                recipient_bank=clean_string(self._get(row, col_map.get('corr_bank'))),
-                recipient_account=clean_string(self._get(row, col_map.get('corr_account'))),
+                recipient_bank=clean_string(corr_bank),
+                recipient_account=clean_string(corr_account),
                 operation_type=None, knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('purpose'))),
-                document_number=clean_string(self._get(row, col_map.get('ref'))),
+                payment_purpose=clean_string(purpose),
+                document_number=clean_string(ref),
                 statement_bank=self.BANK_NAME,
                 account_number=account_number,
                 source_file=file_info['filename'],
@@ -133,9 +136,3 @@ class BankRazvitiyaParser(BaseParser):
             transactions.append(t)
 
         return transactions, {'account_number': account_number, 'warnings': [], 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
@@ -24,8 +24,8 @@ class BankRBKCardParser(BaseParser):
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
-        for row in sheet.rows[:3]:
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(3)
+        for row_text in row_texts:
             if 'posting_date' in row_text and 'trans_amount' in row_text:
                 return 0.95
         folder = file_info.get('folder_name', '').lower()
@@ -82,23 +82,28 @@ class BankRBKCardParser(BaseParser):
 
         account = sheet.name if sheet.name.startswith('KZ') else None
 
+        fetch = self.row_getter(col_map, [
+            'date', 'amount', 'currency', 'client', 'itn', 'cpid', 'type', 'description', 'ref',
+        ])
+
         for row_idx in range(header_idx + 1, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
 
-            date_val = self._get(row, col_map.get('date'))
+            (date_val, amount_val, currency_val, client_val, itn_val, cpid_val, type_val,
+             description_val, ref_val) = fetch(row)
             if date_val is None:
                 continue
 
-            raw_amount = normalize_amount(self._get(row, col_map.get('amount')))
+            raw_amount = normalize_amount(amount_val)
             direction = None
             amount = None
             if raw_amount is not None:
                 direction = 'Расход' if raw_amount < 0 else 'Приход'
                 amount = abs(raw_amount)
 
-            currency = normalize_currency(self._get(row, col_map.get('currency')))
+            currency = normalize_currency(currency_val)
             amount_tenge = amount if currency == 'KZT' else None
 
             t = Transaction(
@@ -107,18 +112,18 @@ class BankRBKCardParser(BaseParser):
                 currency=currency,
                 amount_tenge=amount_tenge,
                 direction=direction,
-                payer=clean_string(self._get(row, col_map.get('client'))),
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('itn'))),
+                payer=clean_string(client_val),
+                payer_iin_bin=normalize_iin_bin(itn_val),
                 payer_bank=self.BANK_NAME,
                 payer_account=account,
-                recipient=clean_string(self._get(row, col_map.get('cpid'))),
+                recipient=clean_string(cpid_val),
                 recipient_iin_bin=None,
                 recipient_bank=None,
                 recipient_account=None,
-                operation_type=clean_string(self._get(row, col_map.get('type'))),
+                operation_type=clean_string(type_val),
                 knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('description'))),
-                document_number=clean_string(self._get(row, col_map.get('ref'))),
+                payment_purpose=clean_string(description_val),
+                document_number=clean_string(ref_val),
                 statement_bank=self.BANK_NAME,
                 account_number=account,
                 source_file=file_info['filename'],
@@ -127,12 +132,6 @@ class BankRBKCardParser(BaseParser):
 
         return transactions, {'account_number': account, 'warnings': warnings, 'errors': []}
 
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
-
 
 @register_parser
 class BankRBKSimpleParser(BaseParser):
@@ -141,8 +140,8 @@ class BankRBKSimpleParser(BaseParser):
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
-        for row in sheet.rows[:5]:
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(5)
+        for row_text in row_texts:
             if 'номер карты' in row_text and 'назначение платежа' in row_text:
                 folder = file_info.get('folder_name', '').lower()
                 if 'rbk' in folder or 'рбк' in folder:
@@ -160,8 +159,8 @@ class BankRBKSimpleParser(BaseParser):
         transactions = []
 
         header_idx = None
-        for i, row in enumerate(rows[:10]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(10)
+        for i, row_text in enumerate(row_texts):
             if 'дата' in row_text and 'сумма' in row_text:
                 header_idx = i
                 break
@@ -191,27 +190,32 @@ class BankRBKSimpleParser(BaseParser):
             elif 'назначение' in h:
                 col_map['purpose'] = i
 
+        fetch = self.row_getter(col_map, [
+            'date', 'amount', 'currency', 'amount_tenge', 'client', 'iin', 'purpose',
+        ])
+
         for row_idx in range(header_idx + 1, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
-            date_val = self._get(row, col_map.get('date'))
+            (date_val, amount_val, currency_val, amount_tenge_val, client_val, iin_val,
+             purpose_val) = fetch(row)
             if date_val is None:
                 continue
 
             t = Transaction(
                 transaction_date=normalize_date(date_val),
-                amount=normalize_amount(self._get(row, col_map.get('amount'))),
-                currency=normalize_currency(self._get(row, col_map.get('currency'))),
-                amount_tenge=normalize_amount(self._get(row, col_map.get('amount_tenge'))),
+                amount=normalize_amount(amount_val),
+                currency=normalize_currency(currency_val),
+                amount_tenge=normalize_amount(amount_tenge_val),
                 direction=None,
-                payer=clean_string(self._get(row, col_map.get('client'))),
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('iin'))),
+                payer=clean_string(client_val),
+                payer_iin_bin=normalize_iin_bin(iin_val),
                 payer_bank=self.BANK_NAME,
                 payer_account=None,
                 recipient=None, recipient_iin_bin=None, recipient_bank=None, recipient_account=None,
                 operation_type=None, knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('purpose'))),
+                payment_purpose=clean_string(purpose_val),
                 document_number=None,
                 statement_bank=self.BANK_NAME,
                 account_number=None,
@@ -220,9 +224,3 @@ class BankRBKSimpleParser(BaseParser):
             transactions.append(t)
 
         return transactions, {'account_number': None, 'warnings': [], 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
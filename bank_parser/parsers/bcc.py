@@ -14,24 +14,98 @@ from ..base_parser import BaseParser
 from ..models import Transaction
 from ..file_reader import SheetData
 from ..normalizer import (
-    normalize_date, normalize_iin_bin, normalize_amount,
-    normalize_currency, determine_direction, clean_string
+    normalize_date, normalize_iin_bin, normalize_amount_column, normalize_column,
+    normalize_currency, determine_direction, direction_from_amounts, clean_string
 )
 from . import register_parser
+from ._regex import IBAN_RE
+
+# Client BIN in the client movement title ("БИН 123456789012")
+_TITLE_BIN_RE = re.compile(r'БИН\s*(\d{12})')
+
+# Header-row signatures, one search per lowercased row text (cells may hold newlines):
+# full: 'дата операции' with 'отправитель'/'получатель', 'күні / дата', or 'дата' with 'дебетовый оборот'
+_FULL_HEADER_RE = re.compile(
+    r'дата операции.*(?:отправитель|получатель)|(?:отправитель|получатель).*дата операции'
+    r'|күні / дата|дата.*дебетовый оборот|дебетовый оборот.*дата',
+    re.S,
+)
+# client movement: 'дата операции', or 'дата' with 'сумма'/'наименование'
+_CLIENT_HEADER_RE = re.compile(r'дата операции|дата.*(?:сумма|наименование)|(?:сумма|наименование).*дата', re.S)
+
+# Header cell -> field: (substrings that must all occur, field), first matching rule wins
+_SIMPLE_HEADER_RULES = (
+    (('дата',), 'date'),
+    (('сумма',), 'amount'),
+    (('примечание',), 'note'),
+    (('описание',), 'note'),
+)
+_FULL_HEADER_RULES = (
+    (('дата',), 'date'),
+    (('валюта',), 'currency'),
+    (('сумма операции',), 'amount'),
+    (('сумма по курсу',), 'amount_tenge'),
+    (('курс нб',), 'amount_tenge'),
+    (('отправитель',), 'sender'),
+    (('получатель',), 'recipient'),
+    (('наименование контрагента',), 'recipient'),
+    (('назначение',), 'purpose'),
+    (('төлем мақсаты',), 'purpose'),
+    (('дебетовый оборот',), 'debit'),
+    (('кредитовый оборот',), 'credit'),
+    (('дебет', 'кредит'), None),  # a combined Дебет/Кредит cell is neither side
+    (('дебет',), 'debit'),
+    (('кредит',), 'credit'),
+    (('иин', 'бин'), 'iin'),
+    (('№ документа',), 'doc_number'),
+    (('құжат',), 'doc_number'),
+    (('банк корресп',), 'corr_bank'),
+    (('корресп. банк',), 'corr_bank'),
+    (('счет-корреспондент',), 'corr_account'),
+    (('корресп. есепшоты',), 'corr_account'),
+    (('кнп',), 'knp'),
+    (('тмк',), 'knp'),
+)
+_CLIENT_HEADER_RULES = (
+    (('дата',), 'date'),
+    (('сумма',), 'amount'),
+    (('дебет',), 'debit_name'),
+    (('кредит',), 'credit_name'),
+    (('бин',), 'bin'),
+    (('основание',), 'purpose'),
+    (('назначение',), 'purpose'),
+    (('подразделение',), 'branch'),
+)
+
+# Lowercase words marking a text date cell as a summary row
+_FULL_SUMMARY_WORDS = ('итого', 'выписка', 'барлығы')
+_CLIENT_SUMMARY_WORDS = ('итого', 'всего')
+
+# Text columns read by BCCFullParser's row loop, in unpacking order
+_FULL_TEXT_KEYS = (
+    'currency', 'sender', 'iin', 'corr_bank', 'corr_account',
+    'recipient', 'knp', 'purpose', 'doc_number',
+)
+
+
+def _has_bcc_id(sheet: SheetData, max_rows: int) -> bool:
+    """True if the first max_rows rows name BCC (SWIFT code or bank name)."""
+    return any(
+        'BCCBKZKX' in s or 'ЦЕНТРКРЕДИТ' in s.upper()
+        for cells in sheet.top_cells(max_rows) for s in cells
+    )
 
 
 @register_parser
 class BCCSimpleParser(BaseParser):
     """BCC deposit movement (3-column format)."""
     BANK_NAME = 'АО Банк ЦентрКредит'
+    MARKERS = {'движение денежных средств по депозитному': 0.9}
+    MARKER_ROWS = 5
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
-        for row in sheet.rows[:5]:
-            for cell in row:
-                if cell and 'движение денежных средств по депозитному' in str(cell).lower():
-                    return 0.9
-        return 0.0
+        return cls.marker_score(sheet)
 
     def parse_sheet(self, sheet: SheetData, file_info: dict) -> Tuple[List[Transaction], dict]:
         rows = sheet.rows
@@ -39,20 +113,15 @@ class BCCSimpleParser(BaseParser):
         account_number = None
 
         # Extract account from title row
-        for row in rows[:3]:
-            for cell in row:
-                if cell:
-                    match = re.search(r'(KZ\w{16,22})', str(cell))
-                    if match:
-                        account_number = match.group(1)
+        for cells in sheet.top_cells(3):
+            for s in cells:
+                match = IBAN_RE.search(s)
+                if match:
+                    account_number = match.group(1)
 
         # Find header
-        header_idx = None
-        for i, row in enumerate(rows[:10]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
-            if 'дата' in row_text and 'сумма' in row_text:
-                header_idx = i
-                break
+        row_texts, _ = sheet.top_lower(10)
+        header_idx = next((i for i, t in enumerate(row_texts) if 'дата' in t and 'сумма' in t), None)
 
         if header_idx is None:
             return [], {'warnings': [], 'errors': ['Header not found'], 'account_number': account_number}
@@ -62,32 +131,26 @@ class BCCSimpleParser(BaseParser):
 
         col_map = {}
         for i, h in enumerate(header_lower):
-            if 'дата' in h:
-                col_map['date'] = i
-            elif 'сумма' in h:
-                col_map['amount'] = i
-            elif 'примечание' in h or 'описание' in h:
-                col_map['note'] = i
-
-        for row_idx in range(header_idx + 1, len(rows)):
-            row = rows[row_idx]
-            if not row or all(c is None for c in row):
-                continue
-
-            date_val = self._get(row, col_map.get('date'))
-            if date_val is None:
-                continue
-
-            note = clean_string(self._get(row, col_map.get('note')))
+            key = self.header_field(h, {}, _SIMPLE_HEADER_RULES)
+            if key is not None:
+                col_map[key] = i
+
+        data_rows = self.dated_rows(rows, header_idx + 1, col_map.get('date'))
+        date_cells, note_cells = self.columns(data_rows, col_map, ('date', 'note'))
+        dates = normalize_column(normalize_date, date_cells)
+        amounts = normalize_amount_column(self.column_values(data_rows, col_map.get('amount')))
+
+        for date_norm, amount, note_cell in zip(dates, amounts, note_cells):
+            note = clean_string(note_cell)
             direction = None
             if note:
                 direction = determine_direction(raw_direction=note)
 
             t = Transaction(
-                transaction_date=normalize_date(date_val),
-                amount=normalize_amount(self._get(row, col_map.get('amount'))),
+                transaction_date=date_norm,
+                amount=amount,
                 currency='KZT',
-                amount_tenge=normalize_amount(self._get(row, col_map.get('amount'))),
+                amount_tenge=amount,
                 direction=direction,
                 payer=None, payer_iin_bin=None, payer_bank=None, payer_account=None,
                 recipient=None, recipient_iin_bin=None, recipient_bank=None, recipient_account=None,
@@ -102,12 +165,6 @@ class BCCSimpleParser(BaseParser):
 
         return transactions, {'account_number': account_number, 'warnings': [], 'errors': []}
 
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
-
 
 @register_parser
 class BCCFullParser(BaseParser):
@@ -117,19 +174,10 @@ class BCCFullParser(BaseParser):
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
         # Scan for BCC identifiers in metadata
-        found_bcc_id = False
-        for row in sheet.rows[:20]:
-            for cell in row:
-                if cell:
-                    cs = str(cell)
-                    if 'BCCBKZKX' in cs or 'ЦентрКредит' in cs or 'ЦЕНТРКРЕДИТ' in cs.upper():
-                        found_bcc_id = True
-                        break
-            if found_bcc_id:
-                break
-
-        for row in sheet.rows[:20]:
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        found_bcc_id = _has_bcc_id(sheet, 20)
+
+        row_texts, _ = sheet.top_lower(20)
+        for row_text in row_texts:
             if 'отправитель' in row_text and 'получатель' in row_text and 'назначение' in row_text:
                 return 0.9
             if 'движение денежных средств по счету клиента' in row_text:
@@ -158,13 +206,10 @@ class BCCFullParser(BaseParser):
         account_number = None
 
         # Find ALL header rows (file may contain multiple account blocks)
-        header_indices = []
-        for i, row in enumerate(rows):
-            row_text = ' '.join(str(c).lower() for c in row if c)
-            if 'дата операции' in row_text and ('отправитель' in row_text or 'получатель' in row_text):
-                header_indices.append(i)
-            elif 'күні / дата' in row_text or ('дата' in row_text and 'дебетовый оборот' in row_text):
-                header_indices.append(i)
+        header_indices = [
+            i for i, row in enumerate(rows)
+            if _FULL_HEADER_RE.search(' '.join(str(c) for c in row if c).lower())
+        ]
 
         if not header_indices:
             return [], {'warnings': [], 'errors': ['Header not found'], 'account_number': None}
@@ -176,7 +221,7 @@ class BCCFullParser(BaseParser):
             for row in rows[search_start:header_idx]:
                 for cell in row:
                     if cell:
-                        match = re.search(r'(KZ\w{16,22})', str(cell))
+                        match = IBAN_RE.search(str(cell))
                         if match:
                             block_account = match.group(1)
             if not account_number:
@@ -187,77 +232,54 @@ class BCCFullParser(BaseParser):
 
             col_map = {}
             for i, h in enumerate(header_lower):
-                if 'дата' in h:
-                    col_map.setdefault('date', i)
-                elif 'валюта' in h:
-                    col_map['currency'] = i
-                elif 'сумма операции' in h:
-                    col_map['amount'] = i
-                elif 'сумма по курсу' in h or 'курс нб' in h:
-                    col_map['amount_tenge'] = i
-                elif 'отправитель' in h:
-                    col_map['sender'] = i
-                elif 'получатель' in h or 'наименование контрагента' in h:
-                    col_map['recipient'] = i
-                elif 'назначение' in h or 'төлем мақсаты' in h:
-                    col_map['purpose'] = i
-                elif 'дебетовый оборот' in h or ('дебет' in h and 'кредит' not in h):
-                    col_map['debit'] = i
-                elif 'кредитовый оборот' in h or ('кредит' in h and 'дебет' not in h):
-                    col_map['credit'] = i
-                elif 'иин' in h and 'бин' in h:
-                    col_map['iin'] = i
-                elif '№ документа' in h or 'құжат' in h:
-                    col_map['doc_number'] = i
-                elif 'банк корресп' in h or 'корресп. банк' in h:
-                    col_map['corr_bank'] = i
-                elif 'счет-корреспондент' in h or 'корресп. есепшоты' in h:
-                    col_map['corr_account'] = i
-                elif 'кнп' in h or 'тмк' in h:
-                    col_map['knp'] = i
+                key = self.header_field(h, {}, _FULL_HEADER_RULES)
+                if key == 'date' and 'date' in col_map:
+                    continue  # the first date column wins
+                if key is not None:
+                    col_map[key] = i
 
             # Data ends at next header or end of file
             end_idx = header_indices[block_idx + 1] if block_idx + 1 < len(header_indices) else len(rows)
 
-            for row_idx in range(header_idx + 1, end_idx):
-                row = rows[row_idx]
-                if not row or all(c is None for c in row):
-                    continue
-
-                date_val = self._get(row, col_map.get('date'))
-                if date_val is None:
-                    continue
-                if isinstance(date_val, str) and not date_val.strip():
-                    continue
-                # Skip summary/total rows
-                if isinstance(date_val, str) and any(w in date_val.lower() for w in ['итого', 'выписка', 'барлығы']):
-                    continue
-
-                amount = normalize_amount(self._get(row, col_map.get('amount')))
-                debit = normalize_amount(self._get(row, col_map.get('debit')))
-                credit = normalize_amount(self._get(row, col_map.get('credit')))
-                direction = determine_direction(debit_amount=debit, credit_amount=credit) if (debit or credit) else None
+            date_idx = col_map.get('date')
+            data_rows = [
+                row for row in self.dated_rows(rows[header_idx + 1:end_idx], 0, date_idx, _FULL_SUMMARY_WORDS)
+                if not isinstance(row[date_idx], str) or row[date_idx].strip()
+            ]
+            dates = normalize_column(normalize_date, self.column_values(data_rows, date_idx))
+            amounts, debits, credits, amounts_tenge = (
+                normalize_amount_column(self.column_values(data_rows, col_map.get(key)))
+                for key in ('amount', 'debit', 'credit', 'amount_tenge')
+            )
+
+            for (date_norm, amount, debit, credit, amount_tenge,
+                 currency_cell, sender_cell, iin_cell, corr_bank_cell, corr_account_cell,
+                 recipient_cell, knp_cell, purpose_cell, doc_number_cell) in zip(
+                dates, amounts, debits, credits, amounts_tenge,
+                *self.columns(data_rows, col_map, _FULL_TEXT_KEYS)
+            ):
+                direction = direction_from_amounts(debit, credit)
                 if not amount:
                     amount = credit or debit
 
                 t = Transaction(
-                    transaction_date=normalize_date(date_val),
+                    transaction_date=date_norm,
                     amount=amount,
-                    currency=normalize_currency(self._get(row, col_map.get('currency'))),
-                    amount_tenge=normalize_amount(self._get(row, col_map.get('amount_tenge'))) or amount,
+                    currency=normalize_currency(currency_cell),
+                    amount_tenge=amount_tenge or amount,
                     direction=direction,
-                    payer=clean_string(self._get(row, col_map.get('sender'))),
-                    payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('iin'))) if direction == 'Приход' else None,
-                    payer_bank=clean_string(self._get(row, col_map.get('corr_bank'))) if direction == 'Приход' else None,
-                    payer_account=clean_string(self._get(row, col_map.get('corr_account'))) if direction == 'Приход' else None,
-                    recipient=clean_string(self._get(row, col_map.get('recipient'))),
-                    recipient_iin_bin=normalize_iin_bin(self._get(row, col_map.get('iin'))) if direction == 'Расход' else None,
-                    recipient_bank=clean_string(self._get(row, col_map.get('corr_bank'))) if direction == 'Расход' else None,
-                    recipient_account=clean_string(self._get(row, col_map.get('corr_account'))) if direction == 'Расход' else None,
+                    payer=clean_string(sender_cell),
+                    payer_iin_bin=normalize_iin_bin(iin_cell) if direction == 'Приход' else None,
+                    payer_bank=clean_string(corr_bank_cell) if direction == 'Приход' else None,
+                    payer_account=clean_string(corr_account_cell) if direction == 'Приход' else None,
+                    recipient=clean_string(recipient_cell),
+                    recipient_iin_bin=normalize_iin_bin(iin_cell) if direction == 'Расход' else None,
+                    recipient_bank=clean_string(corr_bank_cell) if direction == 'Расход' else None,
+                    recipient_account=clean_string(corr_account_cell) if direction == 'Расход' else None,
                     operation_type=None,
-                    knp=clean_string(self._get(row, col_map.get('knp'))),
-                    payment_purpose=clean_string(self._get(row, col_map.get('purpose'))),
-                    document_number=clean_string(self._get(row, col_map.get('doc_number'))),
+                    knp=clean_string(knp_cell),
+                    payment_purpose=clean_string(purpose_cell),
+                    document_number=clean_string(doc_number_cell),
                     statement_bank=self.BANK_NAME,
                     account_number=block_account or account_number,
                     source_file=file_info['filename'],
@@ -266,39 +288,30 @@ class BCCFullParser(BaseParser):
 
         return transactions, {'account_number': account_number, 'warnings': [], 'errors': []}
 
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
-
 
 @register_parser
 class BCCClientMovementParser(BaseParser):
     """BCC multi-sheet 'Движение по счету клиента' format (e.g. Dos Group)."""
     BANK_NAME = 'АО Банк ЦентрКредит'
+    MARKERS = {'движение денежных средств по счету клиента': 0.93}
+    MARKER_ROWS = 3
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
-        for row in sheet.rows[:3]:
-            for cell in row:
-                if cell and 'движение денежных средств по счету клиента' in str(cell).lower():
-                    return 0.93
+        score = cls.marker_score(sheet)
+        if score:
+            return score
         # Check sheet names for direction-based multi-sheet
         sn = sheet.name.lower()
         if 'входящие' in sn or 'исходящие' in sn or 'снятие' in sn:
             # Check for BCC-specific header columns (unique)
-            for row in sheet.rows[:5]:
-                row_text = ' '.join(str(c).lower() for c in row if c)
+            row_texts, _ = sheet.top_lower(5)
+            for row_text in row_texts:
                 if 'наименование дебет' in row_text or 'подразделение' in row_text:
                     return 0.88  # Unique BCC header
             # Check for BCC identifiers in metadata
-            for row in sheet.rows[:10]:
-                for cell in row:
-                    if cell:
-                        cs = str(cell)
-                        if 'BCCBKZKX' in cs or 'ЦентрКредит' in cs or 'ЦЕНТРКРЕДИТ' in cs.upper():
-                            return 0.88
+            if _has_bcc_id(sheet, 10):
+                return 0.88
             folder = file_info.get('folder_name', '').lower()
             if 'центркредит' in folder:
                 return 0.88
@@ -313,38 +326,24 @@ class BCCClientMovementParser(BaseParser):
         # Determine direction from title or sheet name
         direction = None
         sn = sheet.name.lower()
-        title_text = ''
-        for row in rows[:3]:
-            for cell in row:
-                if cell:
-                    title_text += ' ' + str(cell).lower()
+        title_text = ' '.join(sheet.top_lower(3)[0])
 
         if 'входящ' in sn or 'входящ' in title_text:
             direction = 'Приход'
         elif 'исходящ' in sn or 'исходящ' in title_text or 'снятие' in sn or 'снятие' in title_text:
             direction = 'Расход'
 
-        # Extract BIN/client from title
+        # Extract client BIN from title
         client_bin = None
-        client_name = None
-        for row in rows[:3]:
-            for cell in row:
-                if cell:
-                    m = re.search(r'БИН\s*(\d{12})', str(cell))
-                    if m:
-                        client_bin = m.group(1)
-                    # Extract client name between quotes
-                    m2 = re.search(r'[«"](.+?)[»"]', str(cell))
-                    if m2:
-                        client_name = m2.group(1)
+        for cells in sheet.top_cells(3):
+            for s in cells:
+                m = _TITLE_BIN_RE.search(s)
+                if m:
+                    client_bin = m.group(1)
 
         # Find header
-        header_idx = None
-        for i, row in enumerate(rows[:5]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
-            if 'дата операции' in row_text or ('дата' in row_text and ('сумма' in row_text or 'наименование' in row_text)):
-                header_idx = i
-                break
+        row_texts, _ = sheet.top_lower(5)
+        header_idx = next((i for i, t in enumerate(row_texts) if _CLIENT_HEADER_RE.search(t)), None)
 
         if header_idx is None:
             return [], {'warnings': [], 'errors': ['Header not found'], 'account_number': None}
@@ -354,39 +353,26 @@ class BCCClientMovementParser(BaseParser):
 
         col_map = {}
         for i, h in enumerate(header_lower):
-            if 'дата' in h:
-                col_map.setdefault('date', i)
-            elif 'сумма' in h:
-                col_map['amount'] = i
-            elif 'наименование дебет' in h or 'дебет' in h:
-                col_map['debit_name'] = i
-            elif 'наименование кредит' in h or 'кредит' in h:
-                col_map['credit_name'] = i
-            elif h == 'бин' or 'бин' in h:
-                col_map['bin'] = i
-            elif 'основание' in h or 'назначение' in h:
-                col_map['purpose'] = i
-            elif 'подразделение' in h:
-                col_map['branch'] = i
-
-        for row_idx in range(header_idx + 1, len(rows)):
-            row = rows[row_idx]
-            if not row or all(c is None for c in row):
-                continue
-
-            date_val = self._get(row, col_map.get('date'))
-            if date_val is None:
-                continue
-            if isinstance(date_val, str) and any(w in date_val.lower() for w in ['итого', 'всего']):
-                continue
-
-            amount = normalize_amount(self._get(row, col_map.get('amount')))
-            payer = clean_string(self._get(row, col_map.get('debit_name')))
-            recipient = clean_string(self._get(row, col_map.get('credit_name')))
-            bin_val = normalize_iin_bin(self._get(row, col_map.get('bin')))
+            key = self.header_field(h, {}, _CLIENT_HEADER_RULES)
+            if key == 'date' and 'date' in col_map:
+                continue  # the first date column wins
+            if key is not None:
+                col_map[key] = i
+
+        data_rows = self.dated_rows(rows, header_idx + 1, col_map.get('date'), _CLIENT_SUMMARY_WORDS)
+        dates = normalize_column(normalize_date, self.column_values(data_rows, col_map.get('date')))
+        amounts = normalize_amount_column(self.column_values(data_rows, col_map.get('amount')))
+
+        for date_norm, amount, debit_name_cell, credit_name_cell, bin_cell, purpose_cell in zip(
+            dates, amounts,
+            *self.columns(data_rows, col_map, ('debit_name', 'credit_name', 'bin', 'purpose'))
+        ):
+            payer = clean_string(debit_name_cell)
+            recipient = clean_string(credit_name_cell)
+            bin_val = normalize_iin_bin(bin_cell)
 
             t = Transaction(
-                transaction_date=normalize_date(date_val),
+                transaction_date=date_norm,
                 amount=amount,
                 currency='KZT',
                 amount_tenge=amount,
@@ -398,7 +384,7 @@ class BCCClientMovementParser(BaseParser):
                 recipient_iin_bin=client_bin if direction == 'Приход' else bin_val,
                 recipient_bank=None, recipient_account=None,
                 operation_type=None, knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('purpose'))),
+                payment_purpose=clean_string(purpose_cell),
                 document_number=None,
                 statement_bank=self.BANK_NAME,
                 account_number=account_number,
@@ -407,9 +393,3 @@ class BCCClientMovementParser(BaseParser):
             transactions.append(t)
 
         return transactions, {'account_number': account_number, 'warnings': [], 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
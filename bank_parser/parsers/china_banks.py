@@ -12,23 +12,84 @@ from ..base_parser import BaseParser
 from ..models import Transaction
 from ..file_reader import SheetData
 from ..normalizer import (
-    normalize_date, normalize_iin_bin, normalize_amount,
-    normalize_currency, determine_direction, clean_string
+    normalize_date, normalize_iin_bin, normalize_amount_column,
+    normalize_column, normalize_currency, direction_from_amounts, clean_string
 )
 from . import register_parser
+from ._regex import IBAN_RE, LABELED_PARTY_RE
+
+# Header-row signatures, one search per lowercased row text (cells may hold newlines):
+# Bank of China: 'дата' with an amount or party column
+_KITAYA_HEADER_RE = re.compile(
+    r'дата.*(?:сумма|получатель|плательщик|дебет|кредит)'
+    r'|(?:сумма|получатель|плательщик|дебет|кредит).*дата',
+    re.S,
+)
+# TPB: operation-date column (Russian or Kazakh), or 'дата' with an amount column
+_TPB_HEADER_RE = re.compile(
+    r'дата операции|операция жасалатын күн'
+    r'|дата.*(?:дебет|кредит|сумма)|(?:дебет|кредит|сумма).*дата',
+    re.S,
+)
+
+# Header cell -> field: (substrings that must all occur, field), first matching rule wins
+_KITAYA_HEADER_RULES = (
+    (('дата',), 'date'),
+    (('тенге',), 'amount_tenge'),
+    (('сумма',), 'amount'),
+    (('эквивалент',), 'amount_tenge'),
+    (('валюта',), 'currency'),
+    (('иин', 'плательщик'), 'payer_iin'),
+    (('иин', 'получатель'), 'recipient_iin'),
+    (('плательщик', 'банк'), None),  # payer's bank: not mapped
+    (('плательщик',), 'payer'),
+    (('получатель', 'банк'), None),  # recipient's bank: not mapped
+    (('получатель',), 'recipient'),
+    (('назначение',), 'purpose'),
+    (('дебет',), 'debit'),
+    (('кредит',), 'credit'),
+)
+_TPB_HEADER_RULES = (
+    (('дата',), 'date'),
+    (('күн',), 'date'),
+    (('референс',), 'purpose'),
+    (('назначение',), 'purpose'),
+    (('дебет',), 'debit'),
+    (('кредит',), 'credit'),
+    (('несие',), 'credit'),
+    (('эквивалент',), 'amount_tenge'),
+    (('тенге',), 'amount_tenge'),
+    (('бенефициар', 'банк'), 'beneficiary_bank'),
+    (('бенефициар',), 'beneficiary'),
+    (('корреспондент',), 'counterparty'),
+    (('контрагент',), 'counterparty'),
+    (('описание',), 'description'),
+)
+
+# Lowercase words marking a text date cell as a summary row
+_KITAYA_SUMMARY_WORDS = ('итого', 'остаток', 'барлығы')
+_TPB_SUMMARY_WORDS = ('итого', 'остаток', 'входящий', 'барлығы', 'оборот')
+
+# Text columns read by each parser's row loop, in unpacking order
+_KITAYA_TEXT_KEYS = ('currency', 'payer', 'payer_iin', 'recipient', 'recipient_iin', 'purpose')
+_TPB_TEXT_KEYS = ('beneficiary', 'beneficiary_bank', 'counterparty', 'purpose')
 
 
 @register_parser
 class BankKitayaParser(BaseParser):
     """АО ДБ Банк Китая в Казахстане."""
     BANK_NAME = 'АО ДБ Банк Китая в Казахстане'
+    MARKERS = {'банк китая в казахстане': 0.95}
+    MARKER_ROWS = 15
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
-        for row in sheet.rows[:15]:
-            for cell in row:
-                if cell:
-                    s = str(cell).lower()
+        # The shared marker scan rules most sheets out; a hit still has to be
+        # told apart from the Торгово-промышленный банк Китая name
+        if cls.marker_score(sheet):
+            _, row_cells = sheet.top_lower(cls.MARKER_ROWS)
+            for cells in row_cells:
+                for s in cells:
                     if 'банк китая в казахстане' in s and 'торгово' not in s:
                         return 0.95
         folder = file_info.get('folder_name', '').lower()
@@ -42,15 +103,8 @@ class BankKitayaParser(BaseParser):
         account_number = None
 
         # Find header — scan up to 35 rows
-        header_idx = None
-        for i, row in enumerate(rows[:35]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
-            if 'дата' in row_text and ('сумма' in row_text or 'получатель' in row_text or 'плательщик' in row_text):
-                header_idx = i
-                break
-            if 'дата' in row_text and ('дебет' in row_text or 'кредит' in row_text):
-                header_idx = i
-                break
+        row_texts, _ = sheet.top_lower(35)
+        header_idx = next((i for i, t in enumerate(row_texts) if _KITAYA_HEADER_RE.search(t)), None)
 
         if header_idx is None:
             return [], {'warnings': [], 'errors': ['Header not found'], 'account_number': None}
@@ -60,28 +114,12 @@ class BankKitayaParser(BaseParser):
 
         col_map = {}
         for i, h in enumerate(header_lower):
-            if 'дата' in h and 'date' not in col_map:
-                col_map['date'] = i
-            elif 'сумма' in h and 'тенге' not in h:
-                col_map['amount'] = i
-            elif 'тенге' in h or 'эквивалент' in h:
-                col_map['amount_tenge'] = i
-            elif 'валюта' in h:
-                col_map['currency'] = i
-            elif 'плательщик' in h and 'банк' not in h and 'иин' not in h:
-                col_map['payer'] = i
-            elif 'получатель' in h and 'банк' not in h and 'иин' not in h:
-                col_map['recipient'] = i
-            elif 'иин' in h and 'плательщик' in h:
-                col_map['payer_iin'] = i
-            elif 'иин' in h and 'получатель' in h:
-                col_map['recipient_iin'] = i
-            elif 'назначение' in h:
-                col_map['purpose'] = i
-            elif 'дебет' in h:
-                col_map['debit'] = i
-            elif 'кредит' in h:
-                col_map['credit'] = i
+            key = self.header_field(h, {}, _KITAYA_HEADER_RULES)
+            if key == 'date' and 'date' in col_map:
+                # Only the first date column is the date; later ones map by their other words
+                key = self.header_field(h, {}, _KITAYA_HEADER_RULES[1:])
+            if key is not None:
+                col_map[key] = i
 
         # Check for sub-header row (e.g. Дебет / Кредит on next row)
         data_start = header_idx + 1
@@ -97,37 +135,36 @@ class BankKitayaParser(BaseParser):
                         col_map['credit'] = i
                 data_start = header_idx + 2
 
-        for row_idx in range(data_start, len(rows)):
-            row = rows[row_idx]
-            if not row or all(c is None for c in row):
-                continue
-
-            date_val = self._get(row, col_map.get('date'))
-            if date_val is None:
-                continue
-
-            if isinstance(date_val, str) and any(w in date_val.lower() for w in ['итого', 'остаток', 'барлығы']):
-                continue
-
-            debit = normalize_amount(self._get(row, col_map.get('debit')))
-            credit = normalize_amount(self._get(row, col_map.get('credit')))
-            amount = normalize_amount(self._get(row, col_map.get('amount'))) or credit or debit
-            direction = determine_direction(debit_amount=debit, credit_amount=credit)
+        data_rows = self.dated_rows(rows, data_start, col_map.get('date'), _KITAYA_SUMMARY_WORDS)
+        dates = normalize_column(normalize_date, self.column_values(data_rows, col_map.get('date')))
+        debits, credits, amounts, amounts_tenge = (
+            normalize_amount_column(self.column_values(data_rows, col_map.get(key)))
+            for key in ('debit', 'credit', 'amount', 'amount_tenge')
+        )
+
+        for (date_norm, debit, credit, amount, amount_tenge,
+             currency_cell, payer_cell, payer_iin_cell, recipient_cell, recipient_iin_cell,
+             purpose_cell) in zip(
+            dates, debits, credits, amounts, amounts_tenge,
+            *self.columns(data_rows, col_map, _KITAYA_TEXT_KEYS)
+        ):
+            amount = amount or credit or debit
+            direction = direction_from_amounts(debit, credit)
 
             t = Transaction(
-                transaction_date=normalize_date(date_val),
+                transaction_date=date_norm,
                 amount=amount,
-                currency=normalize_currency(self._get(row, col_map.get('currency'))),
-                amount_tenge=normalize_amount(self._get(row, col_map.get('amount_tenge'))),
+                currency=normalize_currency(currency_cell),
+                amount_tenge=amount_tenge,
                 direction=direction,
-                payer=clean_string(self._get(row, col_map.get('payer'))),
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('payer_iin'))),
+                payer=clean_string(payer_cell),
+                payer_iin_bin=normalize_iin_bin(payer_iin_cell),
                 payer_bank=None, payer_account=None,
-                recipient=clean_string(self._get(row, col_map.get('recipient'))),
-                recipient_iin_bin=normalize_iin_bin(self._get(row, col_map.get('recipient_iin'))),
+                recipient=clean_string(recipient_cell),
+                recipient_iin_bin=normalize_iin_bin(recipient_iin_cell),
                 recipient_bank=None, recipient_account=None,
                 operation_type=None, knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('purpose'))),
+                payment_purpose=clean_string(purpose_cell),
                 document_number=None,
                 statement_bank=self.BANK_NAME,
                 account_number=account_number,
@@ -137,12 +174,6 @@ class BankKitayaParser(BaseParser):
 
         return transactions, {'account_number': account_number, 'warnings': [], 'errors': []}
 
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
-
 
 @register_parser
 class TPBKitayaParser(BaseParser):
@@ -156,13 +187,11 @@ class TPBKitayaParser(BaseParser):
             # Skip garbled Chinese-only sheets (e.g. '页面1-1') and sheets without data headers
             if s.num_cols < 3:
                 continue
-            has_data_header = False
-            for row in s.rows[:5]:
-                row_text = ' '.join(str(c).lower() for c in row if c)
-                if 'дата' in row_text or 'күн' in row_text or 'дебет' in row_text or 'референс' in row_text:
-                    has_data_header = True
-                    break
-            if has_data_header:
+            row_texts, _ = s.top_lower(5)
+            if any(
+                'дата' in row_text or 'күн' in row_text or 'дебет' in row_text or 'референс' in row_text
+                for row_text in row_texts
+            ):
                 relevant.append(s)
         if not relevant:
             relevant = sheets  # fallback
@@ -170,21 +199,18 @@ class TPBKitayaParser(BaseParser):
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
-        for row in sheet.rows[:5]:
-            for cell in row:
-                if cell:
-                    s = str(cell).lower()
-                    if 'шоттан үзінді' in s or 'тпбк' in s:
+        _, row_cells = sheet.top_lower(10)
+        for cells in row_cells[:5]:
+            for s in cells:
+                if 'шоттан үзінді' in s or 'тпбк' in s:
+                    return 0.95
+                if 'выписка со счета' in s:
+                    folder = file_info.get('folder_name', '').lower()
+                    if 'торгово-промышленный' in folder or 'тпб' in folder:
                         return 0.95
-                    if 'выписка со счета' in s:
-                        folder = file_info.get('folder_name', '').lower()
-                        if 'торгово-промышленный' in folder or 'тпб' in folder:
-                            return 0.95
-                        return 0.5
-        for row in sheet.rows[:10]:
-            for cell in row:
-                if cell and 'торгово-промышленный' in str(cell).lower():
-                    return 0.93
+                    return 0.5
+        if any('торгово-промышленный' in s for cells in row_cells for s in cells):
+            return 0.93
         folder = file_info.get('folder_name', '').lower()
         if 'торгово-промышленный' in folder:
             return 0.85
@@ -197,28 +223,19 @@ class TPBKitayaParser(BaseParser):
 
         # Extract account number and currency from metadata rows
         currency = None
-        for row in rows[:20]:
-            for cell in row:
-                if cell:
-                    s = str(cell)
-                    # Account number (KZ...)
-                    m = re.search(r'(KZ\w{16,22})', s)
-                    if m and not account_number:
-                        account_number = m.group(1)
-                    # Currency from metadata (e.g. row 14 col 4)
-                    if s.strip() in ('KZT', 'USD', 'EUR', 'CNY', 'RUB', 'GBP'):
-                        currency = s.strip()
+        for cells in sheet.top_cells(20):
+            for s in cells:
+                # Account number (KZ...)
+                m = IBAN_RE.search(s)
+                if m and not account_number:
+                    account_number = m.group(1)
+                # Currency from metadata (e.g. row 14 col 4)
+                if s.strip() in ('KZT', 'USD', 'EUR', 'CNY', 'RUB', 'GBP'):
+                    currency = s.strip()
 
         # Find header — scan up to row 35
-        header_idx = None
-        for i, row in enumerate(rows[:35]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
-            if ('дата операции' in row_text or 'операция жасалатын күн' in row_text):
-                header_idx = i
-                break
-            if 'дата' in row_text and ('дебет' in row_text or 'кредит' in row_text or 'сумма' in row_text):
-                header_idx = i
-                break
+        row_texts, _ = sheet.top_lower(35)
+        header_idx = next((i for i, t in enumerate(row_texts) if _TPB_HEADER_RE.search(t)), None)
 
         if header_idx is None:
             return [], {'warnings': [], 'errors': ['Header not found'], 'account_number': account_number}
@@ -228,24 +245,13 @@ class TPBKitayaParser(BaseParser):
 
         col_map = {}
         for i, h in enumerate(header_lower):
-            if 'дата' in h or 'күн' in h:
+            key = self.header_field(h, {}, _TPB_HEADER_RULES)
+            if key == 'date':
                 col_map.setdefault('date', i)
-            elif 'референс' in h or 'назначение' in h:
-                col_map['purpose'] = i
-            elif 'дебет' in h:
-                col_map['debit'] = i
-            elif 'кредит' in h or 'несие' in h:
-                col_map['credit'] = i
-            elif 'эквивалент' in h or 'тенге' in h:
-                col_map['amount_tenge'] = i
-            elif 'бенефициар' in h and 'банк' not in h:
-                col_map['beneficiary'] = i
-            elif 'банк' in h and 'бенефициар' in h:
-                col_map['beneficiary_bank'] = i
-            elif 'корреспондент' in h or 'контрагент' in h:
-                col_map['counterparty'] = i
-            elif 'описание' in h:
-                col_map.setdefault('purpose', i)
+            elif key == 'description':
+                col_map.setdefault('purpose', i)  # only without a референс/назначение column
+            elif key is not None:
+                col_map[key] = i
 
         # Check for sub-header row with Дебет/Кредит
         data_start = header_idx + 1
@@ -261,43 +267,37 @@ class TPBKitayaParser(BaseParser):
                         col_map['credit'] = i
                 data_start = header_idx + 2
 
-        for row_idx in range(data_start, len(rows)):
-            row = rows[row_idx]
-            if not row or all(c is None for c in row):
-                continue
-
-            date_val = self._get(row, col_map.get('date'))
-            if date_val is None:
-                continue
-            if isinstance(date_val, str) and any(w in date_val.lower() for w in ['итого', 'остаток', 'входящий', 'барлығы', 'оборот']):
-                continue
-
-            debit = normalize_amount(self._get(row, col_map.get('debit')))
-            credit = normalize_amount(self._get(row, col_map.get('credit')))
-            direction = determine_direction(debit_amount=debit, credit_amount=credit)
+        data_rows = self.dated_rows(rows, data_start, col_map.get('date'), _TPB_SUMMARY_WORDS)
+        dates = normalize_column(normalize_date, self.column_values(data_rows, col_map.get('date')))
+        debits, credits, amounts_tenge = (
+            normalize_amount_column(self.column_values(data_rows, col_map.get(key)))
+            for key in ('debit', 'credit', 'amount_tenge')
+        )
+
+        for (date_norm, debit, credit, amount_tenge,
+             beneficiary_cell, beneficiary_bank_cell, counterparty_cell, purpose_cell) in zip(
+            dates, debits, credits, amounts_tenge,
+            *self.columns(data_rows, col_map, _TPB_TEXT_KEYS)
+        ):
+            direction = direction_from_amounts(debit, credit)
             amount = credit or debit
 
-            amount_tenge = normalize_amount(self._get(row, col_map.get('amount_tenge')))
-
             # Beneficiary info
-            beneficiary = clean_string(self._get(row, col_map.get('beneficiary')))
-            beneficiary_bank = clean_string(self._get(row, col_map.get('beneficiary_bank')))
-            counterparty = clean_string(self._get(row, col_map.get('counterparty')))
+            beneficiary = clean_string(beneficiary_cell)
+            beneficiary_bank = clean_string(beneficiary_bank_cell)
+            counterparty = clean_string(counterparty_cell)
             party = beneficiary or counterparty
 
             # Extract IIN/BIN from beneficiary string (e.g. "ТОО Ромат\nИИК: KZ...\nБИН: 123456789012")
-            party_iin = None
-            party_account = None
+            labeled = {}  # group -> first match
             if party:
-                iin_m = re.search(r'(?:БИН|ИИН|BIN|IIN)[:\s]*(\d{12})', party)
-                if iin_m:
-                    party_iin = iin_m.group(1)
-                acc_m = re.search(r'(?:ИИК|IIK|Счет)[:\s]*(KZ\w{16,22})', party)
-                if acc_m:
-                    party_account = acc_m.group(1)
+                for m in LABELED_PARTY_RE.finditer(party):
+                    labeled.setdefault(m.lastgroup, m.group(m.lastgroup))
+            party_iin = labeled.get('iin')
+            party_account = labeled.get('account')
 
             t = Transaction(
-                transaction_date=normalize_date(date_val),
+                transaction_date=date_norm,
                 amount=amount,
                 currency=currency,
                 amount_tenge=amount_tenge or amount,
@@ -311,7 +311,7 @@ class TPBKitayaParser(BaseParser):
                 recipient_bank=beneficiary_bank if direction == 'Расход' else None,
                 recipient_account=party_account if direction == 'Расход' else None,
                 operation_type=None, knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('purpose'))),
+                payment_purpose=clean_string(purpose_cell),
                 document_number=None,
                 statement_bank=self.BANK_NAME,
                 account_number=account_number,
@@ -320,9 +320,3 @@ class TPBKitayaParser(BaseParser):
             transactions.append(t)
 
         return transactions, {'account_number': account_number, 'warnings': [], 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
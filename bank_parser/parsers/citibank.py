@@ -4,7 +4,6 @@ Format: Certificate/report format "Справка по движению дене
 14 columns with header-heavy metadata.
 """
 
-import re
 from typing import List, Tuple, Optional
 
 from ..base_parser import BaseParser
@@ -20,15 +19,16 @@ from . import register_parser
 @register_parser
 class CitibankParser(BaseParser):
     BANK_NAME = 'АО Ситибанк Казахстан'
+    MARKERS = {'справка по движению': 0.9}
+    MARKER_ROWS = 5
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
-        for row in sheet.rows[:5]:
-            for cell in row:
-                if cell and 'справка по движению' in str(cell).lower():
-                    return 0.9
+        score = cls.marker_score(sheet)
+        if score:
+            return score
         folder = file_info.get('folder_name', '').lower()
-        if 'ситибанк' in folder or 'citibank' in folder.lower():
+        if 'ситибанк' in folder or 'citibank' in folder:
             return 0.8
         fn = file_info.get('filename', '').lower()
         if 'справка' in fn and 'spsd' in fn:
@@ -39,19 +39,18 @@ class CitibankParser(BaseParser):
         rows = sheet.rows
         transactions = []
 
-        # Find table header
-        header_idx = None
-        for i, row in enumerate(rows[:20]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
-            if 'дата' in row_text and ('сумма' in row_text or 'получатель' in row_text or 'отправитель' in row_text):
-                header_idx = i
-                break
+        # Find table header in the same cached top-row view can_parse scanned
+        row_texts, _ = sheet.top_lower(20)
+        header_idx = next(
+            (i for i, t in enumerate(row_texts)
+             if 'дата' in t and ('сумма' in t or 'получатель' in t or 'отправитель' in t)),
+            None,
+        )
 
         if header_idx is None:
             return [], {'warnings': ['Certificate format — limited transaction data'], 'errors': [], 'account_number': None}
 
-        header = rows[header_idx]
-        header_lower = [str(c).lower().strip() if c else '' for c in header]
+        header_lower = sheet.header_lower(header_idx)
 
         col_map = {}
         for i, h in enumerate(header_lower):
@@ -70,27 +69,31 @@ class CitibankParser(BaseParser):
             elif 'иин' in h or 'бин' in h:
                 col_map.setdefault('iin', i)
 
+        fetch = self.row_getter(col_map, [
+            'date', 'amount', 'currency', 'sender', 'recipient', 'purpose',
+        ])
+
         for row_idx in range(header_idx + 1, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
 
-            date_val = self._get(row, col_map.get('date'))
+            date_val, amount_val, currency_val, sender_val, recipient_val, purpose_val = fetch(row)
             if date_val is None:
                 continue
 
             t = Transaction(
                 transaction_date=normalize_date(date_val),
-                amount=normalize_amount(self._get(row, col_map.get('amount'))),
-                currency=normalize_currency(self._get(row, col_map.get('currency'))),
+                amount=normalize_amount(amount_val),
+                currency=normalize_currency(currency_val),
                 amount_tenge=None,
                 direction=None,
-                payer=clean_string(self._get(row, col_map.get('sender'))),
+                payer=clean_string(sender_val),
                 payer_iin_bin=None, payer_bank=None, payer_account=None,
-                recipient=clean_string(self._get(row, col_map.get('recipient'))),
+                recipient=clean_string(recipient_val),
                 recipient_iin_bin=None, recipient_bank=None, recipient_account=None,
                 operation_type=None, knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('purpose'))),
+                payment_purpose=clean_string(purpose_val),
                 document_number=None,
                 statement_bank=self.BANK_NAME,
                 account_number=None,
@@ -99,9 +102,3 @@ class CitibankParser(BaseParser):
             transactions.append(t)
 
         return transactions, {'account_number': None, 'warnings': [], 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
@@ -8,45 +8,46 @@ Multiple sheets per file (incoming, outgoing, by currency).
 """
 
 import re
+from itertools import repeat
 from typing import List, Tuple, Optional
 
 from ..base_parser import BaseParser
 from ..models import Transaction
 from ..file_reader import SheetData
 from ..normalizer import (
-    normalize_date, normalize_iin_bin, normalize_amount, clean_string
+    normalize_date, normalize_iin_bin, normalize_amount_column, normalize_column, clean_string
 )
 from . import register_parser
 
+# Client IIN in the title row ("Клиент, Маханов ..., ИИН 123456789012")
+_CLIENT_IIN_RE = re.compile(r'ИИН\s*(\d{12})')
+
 
 @register_parser
 class DeltaBankParser(BaseParser):
     BANK_NAME = 'АО Delta Bank'
+    MARKERS = {'delta bank': 0.88}
+    MARKER_ROWS = 5
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
         folder = file_info.get('folder_name', '').lower()
+        if 'delta bank' in folder:
+            return 0.9
+        score = cls.marker_score(sheet)
+        if score:
+            return score
 
-        found_delta_mention = False
         found_company_header = False
         found_direction_label = False
 
-        for row in sheet.rows[:5]:
-            for cell in row:
-                if cell:
-                    cl = str(cell).lower().strip()
-                    if 'delta bank' in cl:
-                        found_delta_mention = True
-                    if cl in ('входящие платежи', 'исходящие платежи'):
-                        found_direction_label = True
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, row_cells = sheet.top_lower(5)
+        for row_text, cells in zip(row_texts, row_cells):
+            if any(cl.strip() in ('входящие платежи', 'исходящие платежи') for cl in cells):
+                found_direction_label = True
             if 'наименование компании' in row_text and 'дата операции' in row_text:
                 found_company_header = True
 
-        if 'delta bank' in folder:
-            return 0.9
-        if found_delta_mention:
-            return 0.88
         # Unique Delta combo: direction label + "Наименование компании" + "Дата операции"
         if found_direction_label and found_company_header:
             return 0.88
@@ -54,31 +55,8 @@ class DeltaBankParser(BaseParser):
             return 0.80
         return 0.0
 
-    def parse(self, sheets, file_info):
-        """Override to handle multiple sheets (incoming/outgoing)."""
-        from ..models import ParseResult
-        result = ParseResult(
-            filepath=file_info['filepath'],
-            source_file=file_info['filename'],
-            bank_detected=self.BANK_NAME,
-            parser_used=self.__class__.__name__,
-        )
-
-        all_transactions = []
-        for sheet in sheets:
-            txns, meta = self.parse_sheet(sheet, file_info)
-            all_transactions.extend(txns)
-            if meta.get('account_number'):
-                result.account_number = meta['account_number']
-
-        result.transactions = all_transactions
-        result.total_transactions = len(all_transactions)
-        result.parse_status = 'success' if all_transactions else 'failed'
-        return result
-
     def parse_sheet(self, sheet: SheetData, file_info: dict) -> Tuple[List[Transaction], dict]:
         rows = sheet.rows
-        transactions = []
 
         # Determine direction from sheet name or content
         direction = None
@@ -89,21 +67,20 @@ class DeltaBankParser(BaseParser):
             direction = 'Расход'
 
         # Also check first rows for direction
-        for row in rows[:5]:
-            for cell in row:
-                if cell:
-                    s = str(cell).lower()
-                    if 'входящие' in s:
-                        direction = 'Приход'
-                    elif 'исходящие' in s:
-                        direction = 'Расход'
+        _, row_cells = sheet.top_lower(5)
+        for cells in row_cells:
+            for s in cells:
+                if 'входящие' in s:
+                    direction = 'Приход'
+                elif 'исходящие' in s:
+                    direction = 'Расход'
 
         # Extract client info from row 0
         client_iin = None
-        for row in rows[:3]:
-            for cell in row:
-                if cell and 'ИИН' in str(cell):
-                    match = re.search(r'ИИН\s*(\d{12})', str(cell))
+        for cells in sheet.top_cells(3):
+            for s in cells:
+                if 'ИИН' in s:
+                    match = _CLIENT_IIN_RE.search(s)
                     if match:
                         client_iin = match.group(1)
 
@@ -115,18 +92,16 @@ class DeltaBankParser(BaseParser):
             currency = 'EUR'
 
         # Find header
-        header_idx = None
-        for i, row in enumerate(rows[:10]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
-            if '№' in row_text and ('наименование' in row_text or 'дата' in row_text):
-                header_idx = i
-                break
+        row_texts, _ = sheet.top_lower(10)
+        header_idx = next(
+            (i for i, t in enumerate(row_texts) if '№' in t and ('наименование' in t or 'дата' in t)),
+            None,
+        )
 
         if header_idx is None:
             return [], {'warnings': [], 'errors': [], 'account_number': None}
 
-        header = rows[header_idx]
-        header_lower = [str(c).lower().strip() if c else '' for c in header]
+        header_lower = sheet.header_lower(header_idx)
 
         col_map = {}
         for i, h in enumerate(header_lower):
@@ -141,47 +116,52 @@ class DeltaBankParser(BaseParser):
             elif 'назначение' in h:
                 col_map['purpose'] = i
 
-        for row_idx in range(header_idx + 1, len(rows)):
-            row = rows[row_idx]
-            if not row or all(c is None for c in row):
-                continue
-
-            date_val = self._get(row, col_map.get('date'))
-            if date_val is None:
-                continue
-
-            amount = normalize_amount(self._get(row, col_map.get('amount')))
+        # Filter to dated rows, then normalize column by column; names and
+        # IINs repeat across payments, so each distinct value is converted once
+        data_rows = self.dated_rows(rows, header_idx + 1, col_map.get('date'))
+        date_cells, amount_cells, name_cells, iin_cells, purpose_cells = self.columns(
+            data_rows, col_map, ('date', 'amount', 'name', 'iin', 'purpose'))
+        dates = normalize_column(normalize_date, date_cells)
+        amounts = normalize_amount_column(amount_cells)
+        counterparties = normalize_column(clean_string, name_cells)
+        counterparty_iins = normalize_column(normalize_iin_bin, iin_cells)
+
+        # Direction and currency are per sheet: pick the payer/recipient
+        # columns once instead of branching on them for every row
+        incoming, outgoing = direction == 'Приход', direction == 'Расход'
+        payers = counterparties if incoming else repeat(None)
+        payer_iins = counterparty_iins if incoming else repeat(client_iin)
+        recipients = counterparties if outgoing else repeat(None)
+        recipient_iins = counterparty_iins if outgoing else repeat(client_iin)
+        in_tenge = currency == 'KZT'
+
+        bank_name = self.BANK_NAME
+        source_file = file_info['filename']
+        buf = []  # one field-ordered tuple per row
+        for date_norm, amount, payer, payer_iin, recipient, recipient_iin, purpose_cell in zip(
+                dates, amounts, payers, payer_iins, recipients, recipient_iins, purpose_cells):
             if amount is None:
                 continue
 
-            counterparty = clean_string(self._get(row, col_map.get('name')))
-            counterparty_iin = normalize_iin_bin(self._get(row, col_map.get('iin')))
-
-            t = Transaction(
-                transaction_date=normalize_date(date_val),
-                amount=amount,
-                currency=currency,
-                amount_tenge=amount if currency == 'KZT' else None,
-                direction=direction,
-                payer=counterparty if direction == 'Приход' else None,
-                payer_iin_bin=counterparty_iin if direction == 'Приход' else client_iin,
-                payer_bank=None, payer_account=None,
-                recipient=counterparty if direction == 'Расход' else None,
-                recipient_iin_bin=counterparty_iin if direction == 'Расход' else client_iin,
-                recipient_bank=None, recipient_account=None,
-                operation_type=None, knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('purpose'))),
-                document_number=None,
-                statement_bank=self.BANK_NAME,
-                account_number=None,
-                source_file=file_info['filename'],
-            )
-            transactions.append(t)
+            buf.append((
+                date_norm,  # transaction_date
+                amount,  # amount
+                currency,  # currency
+                amount if in_tenge else None,  # amount_tenge
+                direction,  # direction
+                payer,  # payer
+                payer_iin,  # payer_iin_bin
+                None, None,  # payer_bank, payer_account
+                recipient,  # recipient
+                recipient_iin,  # recipient_iin_bin
+                None, None,  # recipient_bank, recipient_account
+                None, None,  # operation_type, knp
+                clean_string(purpose_cell),  # payment_purpose
+                None,  # document_number
+                bank_name,  # statement_bank
+                None,  # account_number
+                source_file,  # source_file
+            ))
+        transactions = [Transaction.from_positional(*t) for t in buf]
 
         return transactions, {'account_number': None, 'warnings': [], 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
@@ -13,10 +13,27 @@ from ..base_parser import BaseParser
 from ..models import Transaction
 from ..file_reader import SheetData
 from ..normalizer import (
-    normalize_date, normalize_iin_bin, normalize_amount,
-    normalize_currency, determine_direction, clean_string
+    normalize_date, normalize_iin_bin, normalize_amount, normalize_currency,
+    normalize_column, determine_direction, direction_from_amounts, clean_string
 )
 from . import register_parser
+from ._regex import IBAN_RE
+
+
+def _find_statement_header(sheet: SheetData) -> Optional[int]:
+    """Find the statement's "Дата проводки" header row in the first 30 rows.
+
+    Cached on the sheet: detection and parsing both ask for it.
+    """
+    cache = sheet._probe_cache
+    if 'eurasian.statement_header_idx' not in cache:
+        # Header can be deep (row 16+)
+        row_texts, _ = sheet.top_lower(30)
+        cache['eurasian.statement_header_idx'] = next(
+            (i for i, t in enumerate(row_texts) if 'дата проводки' in t and 'вид операции' in t),
+            None,
+        )
+    return cache['eurasian.statement_header_idx']
 
 
 @register_parser
@@ -25,37 +42,34 @@ class EurasianCardParser(BaseParser):
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
-        for row in sheet.rows[:5]:
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, row_cells = sheet.top_lower(5)
+        for row_text, cells in zip(row_texts, row_cells):
             if 'тип операции' in row_text and 'детали операции' in row_text:
                 return 0.9
             # 7-col with one unique marker
-            if len([c for c in row if c]) == 7:
+            if len(cells) == 7:
                 if 'тип операции' in row_text or 'детали операции' in row_text:
                     return 0.8
         folder = file_info.get('folder_name', '').lower()
         if 'евразийский' in folder:
-            for row in sheet.rows[:5]:
-                if len([c for c in row if c]) == 7:
-                    return 0.7
+            if any(len(cells) == 7 for cells in row_cells):
+                return 0.7
         return 0.0
 
     def parse_sheet(self, sheet: SheetData, file_info: dict) -> Tuple[List[Transaction], dict]:
         rows = sheet.rows
         transactions = []
 
-        header_idx = None
-        for i, row in enumerate(rows[:5]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
-            if 'иин' in row_text and 'тип операции' in row_text:
-                header_idx = i
-                break
+        row_texts, _ = sheet.top_lower(5)
+        header_idx = next(
+            (i for i, t in enumerate(row_texts) if 'иин' in t and 'тип операции' in t),
+            None,
+        )
 
         if header_idx is None:
             return [], {'warnings': [], 'errors': ['Header not found'], 'account_number': None}
 
-        header = rows[header_idx]
-        header_lower = [str(c).lower().strip() if c else '' for c in header]
+        header_lower = sheet.header_lower(header_idx)
 
         col_map = {}
         for i, h in enumerate(header_lower):
@@ -74,40 +88,38 @@ class EurasianCardParser(BaseParser):
             elif 'детали' in h:
                 col_map['details'] = i
 
-        account = None
-        for row_idx in range(header_idx + 1, len(rows)):
-            row = rows[row_idx]
-            if not row or all(c is None for c in row):
-                continue
+        # Operation dates repeat across rows: parse each distinct one once
+        data_rows = self.dated_rows(rows, header_idx + 1, col_map.get('date'))
+        dates = normalize_column(normalize_date, self.column_values(data_rows, col_map.get('date')))
 
-            date_val = self._get(row, col_map.get('date'))
-            if date_val is None:
-                continue
-
-            op_type = clean_string(self._get(row, col_map.get('type')))
+        fetch = self.row_getter(col_map, ['type', 'account', 'currency', 'amount', 'iin', 'details'])
+        account = None
+        for row, date_norm in zip(data_rows, dates):
+            type_cell, account_cell, currency_cell, amount_cell, iin_cell, details_cell = fetch(row)
+            op_type = clean_string(type_cell)
             direction = determine_direction(operation_type=op_type)
 
-            acct = clean_string(self._get(row, col_map.get('account')))
+            acct = clean_string(account_cell)
             if acct and not account:
                 account = acct
 
-            currency = normalize_currency(self._get(row, col_map.get('currency')))
-            amount = normalize_amount(self._get(row, col_map.get('amount')))
+            currency = normalize_currency(currency_cell)
+            amount = normalize_amount(amount_cell)
             amount_tenge = amount if currency == 'KZT' else None
 
             t = Transaction(
-                transaction_date=normalize_date(date_val),
+                transaction_date=date_norm,
                 amount=amount,
                 currency=currency,
                 amount_tenge=amount_tenge,
                 direction=direction,
                 payer=None,
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('iin'))),
+                payer_iin_bin=normalize_iin_bin(iin_cell),
                 payer_bank=self.BANK_NAME,
                 payer_account=acct,
                 recipient=None, recipient_iin_bin=None, recipient_bank=None, recipient_account=None,
                 operation_type=op_type, knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('details'))),
+                payment_purpose=clean_string(details_cell),
                 document_number=None,
                 statement_bank=self.BANK_NAME,
                 account_number=account,
@@ -117,66 +129,49 @@ class EurasianCardParser(BaseParser):
 
         return transactions, {'account_number': account, 'warnings': [], 'errors': []}
 
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
-
 
 @register_parser
 class EurasianStatementParser(BaseParser):
     """Eurasian Bank full statement format (15-col with metadata header)."""
     BANK_NAME = 'АО Евразийский Банк'
+    MARKERS = {'eurikzka': 0.95}  # bank's BIC in the metadata header
+    MARKER_ROWS = 10
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
-        for row in sheet.rows[:10]:
-            for cell in row:
-                if cell and 'EURIKZKA' in str(cell):
-                    return 0.95
+        score = cls.marker_score(sheet)
+        if score:
+            return score
         # Check for "Дата проводки" header deeper in file
-        for row in sheet.rows[:25]:
-            row_text = ' '.join(str(c).lower() for c in row if c)
-            if 'дата проводки' in row_text and 'вид операции' in row_text:
-                return 0.9
+        header_idx = _find_statement_header(sheet)
+        if header_idx is not None and header_idx < 25:
+            return 0.9
         folder = file_info.get('folder_name', '').lower()
         if 'евразийский' in folder:
             # Check for metadata pattern
-            for row in sheet.rows[:10]:
-                for cell in row:
-                    if cell and 'отделение' in str(cell).lower():
-                        return 0.6
+            _, row_cells = sheet.top_lower(10)
+            if any('отделение' in cl for cells in row_cells for cl in cells):
+                return 0.6
         return 0.0
 
     def parse_sheet(self, sheet: SheetData, file_info: dict) -> Tuple[List[Transaction], dict]:
-        import re
         rows = sheet.rows
         transactions = []
         account_number = None
 
         # Extract metadata
-        for row in rows[:20]:
-            for cell in row:
-                if cell:
-                    s = str(cell)
-                    match = re.search(r'(KZ\w{16,22})', s)
-                    if match:
-                        account_number = match.group(1)
-
-        # Find header — can be deep (row 16+)
-        header_idx = None
-        for i, row in enumerate(rows[:30]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
-            if 'дата проводки' in row_text and 'вид операции' in row_text:
-                header_idx = i
-                break
+        for cells in sheet.top_cells(20):
+            for s in cells:
+                match = IBAN_RE.search(s)
+                if match:
+                    account_number = match.group(1)
+
+        header_idx = _find_statement_header(sheet)
 
         if header_idx is None:
             return [], {'warnings': [], 'errors': ['Header not found'], 'account_number': account_number}
 
-        header = rows[header_idx]
-        header_lower = [str(c).lower().strip() if c else '' for c in header]
+        header_lower = sheet.header_lower(header_idx)
 
         col_map = {}
         for i, h in enumerate(header_lower):
@@ -201,45 +196,49 @@ class EurasianStatementParser(BaseParser):
             elif 'кредит' in h:
                 col_map['credit'] = i
 
-        for row_idx in range(header_idx + 1, len(rows)):
-            row = rows[row_idx]
-            if not row or all(c is None for c in row):
-                continue
-
-            date_val = self._get(row, col_map.get('date'))
-            if date_val is None:
-                continue
-
-            if isinstance(date_val, str) and any(w in date_val.lower() for w in ['итого', 'остаток']):
-                continue
-
-            debit = normalize_amount(self._get(row, col_map.get('debit')))
-            credit = normalize_amount(self._get(row, col_map.get('credit')))
-            direction = determine_direction(debit_amount=debit, credit_amount=credit)
+        data_rows = self.dated_rows(rows, header_idx + 1, col_map.get('date'), ('итого', 'остаток'))
+        dates = normalize_column(normalize_date, self.column_values(data_rows, col_map.get('date')))
+
+        fetch = self.row_getter(col_map, [
+            'debit', 'credit', 'type', 'counterparty', 'iin', 'bank', 'account', 'purpose', 'doc_number',
+        ])
+        for row, date_norm in zip(data_rows, dates):
+            (debit_cell, credit_cell, type_cell, counterparty_cell, iin_cell, bank_cell,
+             account_cell, purpose_cell, doc_number_cell) = fetch(row)
+            debit = normalize_amount(debit_cell)
+            credit = normalize_amount(credit_cell)
+            direction = direction_from_amounts(debit, credit)
             amount = credit or debit
 
-            op_type = clean_string(self._get(row, col_map.get('type')))
+            op_type = clean_string(type_cell)
             if not direction and op_type:
                 direction = determine_direction(operation_type=op_type)
 
+            # The counterparty is the payer on income and the recipient on expense
+            incoming, outgoing = direction == 'Приход', direction == 'Расход'
+            counterparty = clean_string(counterparty_cell)
+            counterparty_iin = normalize_iin_bin(iin_cell)
+            counterparty_bank = clean_string(bank_cell)
+            counterparty_account = clean_string(account_cell)
+
             t = Transaction(
-                transaction_date=normalize_date(date_val),
+                transaction_date=date_norm,
                 amount=amount,
                 currency='KZT',
                 amount_tenge=amount,
                 direction=direction,
-                payer=clean_string(self._get(row, col_map.get('counterparty'))) if direction == 'Приход' else None,
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('iin'))) if direction == 'Приход' else None,
-                payer_bank=clean_string(self._get(row, col_map.get('bank'))) if direction == 'Приход' else None,
-                payer_account=clean_string(self._get(row, col_map.get('account'))) if direction == 'Приход' else None,
-                recipient=clean_string(self._get(row, col_map.get('counterparty'))) if direction == 'Расход' else None,
-                recipient_iin_bin=normalize_iin_bin(self._get(row, col_map.get('iin'))) if direction == 'Расход' else None,
-                recipient_bank=clean_string(self._get(row, col_map.get('bank'))) if direction == 'Расход' else None,
-                recipient_account=clean_string(self._get(row, col_map.get('account'))) if direction == 'Расход' else None,
+                payer=counterparty if incoming else None,
+                payer_iin_bin=counterparty_iin if incoming else None,
+                payer_bank=counterparty_bank if incoming else None,
+                payer_account=counterparty_account if incoming else None,
+                recipient=counterparty if outgoing else None,
+                recipient_iin_bin=counterparty_iin if outgoing else None,
+                recipient_bank=counterparty_bank if outgoing else None,
+                recipient_account=counterparty_account if outgoing else None,
                 operation_type=op_type,
                 knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('purpose'))),
-                document_number=clean_string(self._get(row, col_map.get('doc_number'))),
+                payment_purpose=clean_string(purpose_cell),
+                document_number=clean_string(doc_number_cell),
                 statement_bank=self.BANK_NAME,
                 account_number=account_number,
                 source_file=file_info['filename'],
@@ -247,9 +246,3 @@ class EurasianStatementParser(BaseParser):
             transactions.append(t)
 
         return transactions, {'account_number': account_number, 'warnings': [], 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
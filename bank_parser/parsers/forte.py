@@ -25,19 +25,19 @@ from . import register_parser
 @register_parser
 class ForteBankSDPParser(BaseParser):
     BANK_NAME = 'АО ForteBank'
+    # Report title, also in its misspelled form
+    MARKERS = {'инфорация по переводам': 0.95, 'информация по переводам': 0.95}
+    MARKER_ROWS = 10
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
-        for row in sheet.rows[:10]:
-            for cell in row:
-                if cell and 'инфорация по переводам' in str(cell).lower():
-                    return 0.95
-                if cell and 'информация по переводам' in str(cell).lower():
-                    return 0.95
+        score = cls.marker_score(sheet)
+        if score:
+            return score
 
         # Check for SDP header structure
-        for row in sheet.rows[:15]:
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(15)
+        for row_text in row_texts:
             if 'вид перевода' in row_text and 'состояние' in row_text:
                 return 0.9
             if 'золотая корона' in row_text:
@@ -59,8 +59,8 @@ class ForteBankSDPParser(BaseParser):
 
         # Find header row
         header_idx = None
-        for i, row in enumerate(rows[:15]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(15)
+        for i, row_text in enumerate(row_texts):
             if ('отделение' in row_text or 'вид перевода' in row_text) and 'дата' in row_text:
                 header_idx = i
                 break
@@ -101,37 +101,42 @@ class ForteBankSDPParser(BaseParser):
             elif 'иин' in h:
                 col_map.setdefault('sender_iin', i)
 
+        fetch = self.row_getter(col_map, [
+            'date', 'direction', 'amount', 'currency', 'sender', 'sender_iin', 'recipient',
+            'transfer_type',
+        ])
+
         for row_idx in range(header_idx + 1, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
 
-            date_val = self._get(row, col_map.get('date'))
+            (date_val, direction_val, amount_raw, currency_val, sender_val, sender_iin_val,
+             recipient_val, transfer_type_val) = fetch(row)
             if date_val is None:
                 continue
 
-            raw_dir = clean_string(self._get(row, col_map.get('direction')))
+            raw_dir = clean_string(direction_val)
             direction = determine_direction(raw_direction=raw_dir)
 
-            amount_raw = self._get(row, col_map.get('amount'))
             # ForteBank amounts may have leading spaces
             amount = normalize_amount(amount_raw)
 
             t = Transaction(
                 transaction_date=normalize_date(date_val),
                 amount=amount,
-                currency=normalize_currency(self._get(row, col_map.get('currency'))),
+                currency=normalize_currency(currency_val),
                 amount_tenge=amount,  # Most transfers in KZT
                 direction=direction,
-                payer=clean_string(self._get(row, col_map.get('sender'))),
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('sender_iin'))),
+                payer=clean_string(sender_val),
+                payer_iin_bin=normalize_iin_bin(sender_iin_val),
                 payer_bank=self.BANK_NAME,
                 payer_account=None,
-                recipient=clean_string(self._get(row, col_map.get('recipient'))),
+                recipient=clean_string(recipient_val),
                 recipient_iin_bin=None, recipient_bank=None, recipient_account=None,
-                operation_type=clean_string(self._get(row, col_map.get('transfer_type'))),
+                operation_type=clean_string(transfer_type_val),
                 knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('transfer_type'))),
+                payment_purpose=clean_string(transfer_type_val),
                 document_number=None,
                 statement_bank=self.BANK_NAME,
                 account_number=None,
@@ -141,12 +146,6 @@ class ForteBankSDPParser(BaseParser):
 
         return transactions, {'account_number': None, 'warnings': [], 'errors': []}
 
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
-
 
 @register_parser
 class ForteBankRegistryParser(BaseParser):
@@ -159,8 +158,8 @@ class ForteBankRegistryParser(BaseParser):
         folder = file_info.get('folder_name', '').lower()
         if 'forte' in folder and ('prilozhenie' in fn or 'pril_' in fn):
             return 0.95
-        for row in sheet.rows[:5]:
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(5)
+        for row_text in row_texts:
             if 'наименование организации' in row_text and 'код гк' in row_text:
                 return 0.9
         return 0.0
@@ -24,8 +24,8 @@ class HalykFinanceParser(BaseParser):
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
-        for row in sheet.rows[:3]:
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(3)
+        for row_text in row_texts:
             if 'режим сделки' in row_text or 'тикер' in row_text:
                 return 0.9
             if 'сорт д-та' in row_text or 'сорта д-та' in row_text:
@@ -45,8 +45,8 @@ class HalykFinanceParser(BaseParser):
         transactions = []
 
         header_idx = 0
-        for i, row in enumerate(rows[:5]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(5)
+        for i, row_text in enumerate(row_texts):
             if 'клиент' in row_text and 'дата' in row_text:
                 header_idx = i
                 break
@@ -81,16 +81,22 @@ class HalykFinanceParser(BaseParser):
             elif 'счет прихода' in h:
                 col_map['credit_account'] = i
 
+        fetch = self.row_getter(col_map, [
+            'date', 'doc_type', 'amount', 'currency_code', 'client', 'debit_account',
+            'counterparty', 'credit_account', 'comment',
+        ])
+
         for row_idx in range(header_idx + 1, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
 
-            date_val = self._get(row, col_map.get('date'))
+            (date_val, doc_type_val, amount_val, currency_code_val, client_val, debit_account_val,
+             counterparty_val, credit_account_val, comment_val) = fetch(row)
             if date_val is None:
                 continue
 
-            doc_type = clean_string(self._get(row, col_map.get('doc_type')))
+            doc_type = clean_string(doc_type_val)
             direction = None
             if doc_type:
                 dt_lower = doc_type.lower()
@@ -101,19 +107,19 @@ class HalykFinanceParser(BaseParser):
 
             t = Transaction(
                 transaction_date=normalize_date(date_val),
-                amount=normalize_amount(self._get(row, col_map.get('amount'))),
-                currency=normalize_currency(self._get(row, col_map.get('currency_code'))),
+                amount=normalize_amount(amount_val),
+                currency=normalize_currency(currency_code_val),
                 amount_tenge=None,
                 direction=direction,
-                payer=clean_string(self._get(row, col_map.get('client'))),
+                payer=clean_string(client_val),
                 payer_iin_bin=None, payer_bank=None,
-                payer_account=clean_string(self._get(row, col_map.get('debit_account'))),
-                recipient=clean_string(self._get(row, col_map.get('counterparty'))),
+                payer_account=clean_string(debit_account_val),
+                recipient=clean_string(counterparty_val),
                 recipient_iin_bin=None, recipient_bank=None,
-                recipient_account=clean_string(self._get(row, col_map.get('credit_account'))),
+                recipient_account=clean_string(credit_account_val),
                 operation_type=doc_type,
                 knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('comment'))),
+                payment_purpose=clean_string(comment_val),
                 document_number=None,
                 statement_bank=self.BANK_NAME,
                 account_number=None,
@@ -122,9 +128,3 @@ class HalykFinanceParser(BaseParser):
             transactions.append(t)
 
         return transactions, {'account_number': None, 'warnings': ['Securities format'], 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
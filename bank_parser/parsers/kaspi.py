@@ -6,7 +6,6 @@ Multiple formats:
 3. Terminal/partner list — just BIN+Terminal_id (skip)
 """
 
-import re
 from typing import List, Tuple, Optional
 from datetime import datetime
 
@@ -18,6 +17,7 @@ from ..normalizer import (
     normalize_currency, determine_direction, clean_string
 )
 from . import register_parser
+from ._regex import SHORT_IBAN_RE
 
 
 @register_parser
@@ -83,14 +83,14 @@ class KaspiStatementParser(BaseParser):
                     continue
                 s = str(cell)
                 # Look for account number
-                match = re.search(r'(KZ\w{16,20})', s)
+                match = SHORT_IBAN_RE.search(s)
                 if match:
                     account_number = match.group(1)
 
         # Find header row — look for row with "Плательщик" or "Дата"
         header_idx = None
-        for i, row in enumerate(rows[:25]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(25)
+        for i, row_text in enumerate(row_texts):
             if ('дата' in row_text and ('плательщик' in row_text or 'получател' in row_text)):
                 header_idx = i
                 break
@@ -181,12 +181,21 @@ class KaspiStatementParser(BaseParser):
             ):
                 data_start += 1
 
+        fetch = self.row_getter(col_map, [
+            'date', 'direction', 'operation_type', 'amount', 'currency', 'amount_tenge', 'payer',
+            'payer_iin', 'payer_bank', 'payer_account', 'recipient', 'recipient_iin',
+            'recipient_bank', 'recipient_account', 'knp', 'payment_purpose',
+        ])
+
         for row_idx in range(data_start, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
 
-            date_val = self._get(row, col_map.get('date'))
+            (date_val, direction_val, operation_type_val, amount_val, currency_val,
+             amount_tenge_val, payer_val, payer_iin_val, payer_bank_val, payer_account_val,
+             recipient_val, recipient_iin_val, recipient_bank_val, recipient_account_val, knp_val,
+             payment_purpose_val) = fetch(row)
             if date_val is None:
                 continue
 
@@ -196,8 +205,8 @@ class KaspiStatementParser(BaseParser):
                 if any(w in d_lower for w in ['итого', 'остаток', 'входящий', 'исходящий']):
                     continue
 
-            raw_dir = clean_string(self._get(row, col_map.get('direction')))
-            op_type = clean_string(self._get(row, col_map.get('operation_type')))
+            raw_dir = clean_string(direction_val)
+            op_type = clean_string(operation_type_val)
             direction = determine_direction(raw_direction=raw_dir) if raw_dir else None
 
             # Determine direction from operation type if not explicit
@@ -210,21 +219,21 @@ class KaspiStatementParser(BaseParser):
 
             t = Transaction(
                 transaction_date=normalize_date(date_val),
-                amount=normalize_amount(self._get(row, col_map.get('amount'))),
-                currency=normalize_currency(self._get(row, col_map.get('currency'))),
-                amount_tenge=normalize_amount(self._get(row, col_map.get('amount_tenge'))),
+                amount=normalize_amount(amount_val),
+                currency=normalize_currency(currency_val),
+                amount_tenge=normalize_amount(amount_tenge_val),
                 direction=direction,
-                payer=clean_string(self._get(row, col_map.get('payer'))),
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('payer_iin'))),
-                payer_bank=clean_string(self._get(row, col_map.get('payer_bank'))),
-                payer_account=clean_string(self._get(row, col_map.get('payer_account'))),
-                recipient=clean_string(self._get(row, col_map.get('recipient'))),
-                recipient_iin_bin=normalize_iin_bin(self._get(row, col_map.get('recipient_iin'))),
-                recipient_bank=clean_string(self._get(row, col_map.get('recipient_bank'))),
-                recipient_account=clean_string(self._get(row, col_map.get('recipient_account'))),
+                payer=clean_string(payer_val),
+                payer_iin_bin=normalize_iin_bin(payer_iin_val),
+                payer_bank=clean_string(payer_bank_val),
+                payer_account=clean_string(payer_account_val),
+                recipient=clean_string(recipient_val),
+                recipient_iin_bin=normalize_iin_bin(recipient_iin_val),
+                recipient_bank=clean_string(recipient_bank_val),
+                recipient_account=clean_string(recipient_account_val),
                 operation_type=op_type,
-                knp=clean_string(self._get(row, col_map.get('knp'))),
-                payment_purpose=clean_string(self._get(row, col_map.get('payment_purpose'))),
+                knp=clean_string(knp_val),
+                payment_purpose=clean_string(payment_purpose_val),
                 document_number=None,
                 statement_bank=self.BANK_NAME,
                 account_number=account_number,
@@ -234,12 +243,6 @@ class KaspiStatementParser(BaseParser):
 
         return transactions, {'account_number': account_number, 'warnings': warnings, 'errors': []}
 
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
-
 
 @register_parser
 class KaspiStatisticsParser(BaseParser):
@@ -265,8 +268,8 @@ class KaspiStatisticsParser(BaseParser):
 
         # Find header
         header_idx = None
-        for i, row in enumerate(rows[:10]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(10)
+        for i, row_text in enumerate(row_texts):
             if 'дата' in row_text and ('сумма' in row_text or 'бин' in row_text):
                 header_idx = i
                 break
@@ -292,29 +295,31 @@ class KaspiStatisticsParser(BaseParser):
             elif 'валюта' in h:
                 col_map['currency'] = i
 
+        fetch = self.row_getter(col_map, ['date', 'type', 'amount', 'currency', 'name', 'bin'])
+
         for row_idx in range(header_idx + 1, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
-            date_val = self._get(row, col_map.get('date'))
+            date_val, type_val, amount_val, currency_val, name_val, bin_val = fetch(row)
             if date_val is None:
                 continue
 
-            op_type = clean_string(self._get(row, col_map.get('type')))
+            op_type = clean_string(type_val)
             direction = determine_direction(raw_direction=op_type)
 
             t = Transaction(
                 transaction_date=normalize_date(date_val),
-                amount=normalize_amount(self._get(row, col_map.get('amount'))),
-                currency=normalize_currency(self._get(row, col_map.get('currency'))) or 'KZT',
-                amount_tenge=normalize_amount(self._get(row, col_map.get('amount'))),
+                amount=normalize_amount(amount_val),
+                currency=normalize_currency(currency_val) or 'KZT',
+                amount_tenge=normalize_amount(amount_val),
                 direction=direction,
                 payer=None,
                 payer_iin_bin=None,
                 payer_bank=None,
                 payer_account=None,
-                recipient=clean_string(self._get(row, col_map.get('name'))),
-                recipient_iin_bin=normalize_iin_bin(self._get(row, col_map.get('bin'))),
+                recipient=clean_string(name_val),
+                recipient_iin_bin=normalize_iin_bin(bin_val),
                 recipient_bank=None,
                 recipient_account=None,
                 operation_type=op_type,
@@ -328,9 +333,3 @@ class KaspiStatisticsParser(BaseParser):
             transactions.append(t)
 
         return transactions, {'account_number': None, 'warnings': warnings, 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
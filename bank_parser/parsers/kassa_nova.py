@@ -66,7 +66,7 @@ class KassaNovaParser(BaseParser):
         current_direction = None
 
         for row_idx, row in enumerate(rows):
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
 
             # Detect section markers
@@ -18,14 +18,25 @@ from ..normalizer import (
     normalize_date, normalize_iin_bin, normalize_amount, clean_string
 )
 from . import register_parser
+from ._regex import IBAN_RE
+
+_TEXT_DATE_RE = re.compile(r'(\d{2}\.\d{2}\.\d{2,4})')
+_TEXT_AMOUNT_RE = re.compile(r'(\d[\d\s]*\d)\s*(тг|тенге)')
 
 
 @register_parser
 class KazkomParser(BaseParser):
     BANK_NAME = 'АО Казкоммерцбанк'
+    # Unique misspelling in the Kazkom card format
+    MARKERS = {'дата постирования': 0.95}
+    MARKER_ROWS = 15
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
+        score = cls.marker_score(sheet)
+        if score:
+            return score
+
         found_kazkom_id = False
         found_statement_title = False
         found_dot_pattern = False
@@ -41,8 +52,6 @@ class KazkomParser(BaseParser):
                     # Bank name only in metadata rows (first 10), not in data
                     if i < 10 and ('казкоммерцбанк' in cl and 'облигации' not in cl):
                         found_kazkom_id = True
-                    if 'дата постирования' in cl:
-                        return 0.95  # Unique misspelling in Kazkom card format
                     if 'выписка по счету' in cl:
                         found_statement_title = True
                     if '. . . :' in cs:
@@ -104,14 +113,14 @@ class KazkomParser(BaseParser):
             for cell in row:
                 if cell:
                     s = str(cell)
-                    match = re.search(r'(KZ\w{16,22})', s)
+                    match = IBAN_RE.search(s)
                     if match:
                         account_number = match.group(1)
 
         # Find header row (Дата | Дебет | Кредит or similar)
         header_idx = None
-        for i, row in enumerate(rows[:20]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(20)
+        for i, row_text in enumerate(row_texts):
             if 'дата' in row_text and ('дебет' in row_text or 'кредит' in row_text or 'сумма' in row_text):
                 header_idx = i
                 break
@@ -135,9 +144,11 @@ class KazkomParser(BaseParser):
         current_date = None
         current_purpose = []
 
+        fetch = self.row_getter(col_map, ['date', 'debit', 'credit'])
+
         for row_idx in range(header_idx + 1, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
 
             # Check for separator (dashes)
@@ -145,9 +156,9 @@ class KazkomParser(BaseParser):
             if '---' in first_cell:
                 continue
 
-            date_val = self._get(row, col_map.get('date'))
-            debit = normalize_amount(self._get(row, col_map.get('debit')))
-            credit = normalize_amount(self._get(row, col_map.get('credit')))
+            date_val, debit_val, credit_val = fetch(row)
+            debit = normalize_amount(debit_val)
+            credit = normalize_amount(credit_val)
 
             if date_val and (debit or credit):
                 # This is a transaction row
@@ -195,8 +206,8 @@ class KazkomParser(BaseParser):
                 continue
             text = ' '.join(str(c) for c in row if c)
             # Look for date + amount pattern
-            date_match = re.search(r'(\d{2}\.\d{2}\.\d{2,4})', text)
-            amount_match = re.search(r'(\d[\d\s]*\d)\s*(тг|тенге)', text.lower())
+            date_match = _TEXT_DATE_RE.search(text)
+            amount_match = _TEXT_AMOUNT_RE.search(text.lower())
             if date_match and amount_match:
                 amt_str = amount_match.group(1).replace(' ', '')
                 t = Transaction(
@@ -217,9 +228,3 @@ class KazkomParser(BaseParser):
                 transactions.append(t)
 
         return transactions, {'account_number': account_number, 'warnings': ['Unstructured text format'], 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
@@ -27,8 +27,8 @@ class KZIBankParser(BaseParser):
         found_kzi_header = False
         found_sdp_header = False
 
-        for row in sheet.rows[:10]:
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(10)
+        for row_text in row_texts:
             if 'дата транзакции' in row_text and 'держатель карты' in row_text:
                 return 0.95
             if 'вход. оборот' in row_text or 'исход. оборот' in row_text:
@@ -57,8 +57,8 @@ class KZIBankParser(BaseParser):
 
         folder = file_info.get('folder_name', '').lower()
         if 'кзи банк' in folder or 'кзи' in folder:
-            for row in sheet.rows[:15]:
-                row_text = ' '.join(str(c).lower() for c in row if c)
+            row_texts, _ = sheet.top_lower(15)
+            for row_text in row_texts:
                 if ('дата' in row_text and 'сумма' in row_text) or 'наименование' in row_text:
                     return 0.8
             return 0.7
@@ -69,8 +69,8 @@ class KZIBankParser(BaseParser):
         transactions = []
 
         header_idx = None
-        for i, row in enumerate(rows[:15]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(15)
+        for i, row_text in enumerate(row_texts):
             if 'дата транзакции' in row_text:
                 header_idx = i
                 break
@@ -127,24 +127,31 @@ class KZIBankParser(BaseParser):
             if vals and all(isinstance(v, (int, float)) and v < 50 for v in vals):
                 data_start += 1
 
+        fetch = self.row_getter(col_map, [
+            'date', 'credit', 'debit', 'amount', 'currency', 'sender', 'client_name', 'iin',
+            'account', 'recipient', 'type', 'name', 'purpose',
+        ])
+
         for row_idx in range(data_start, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
 
-            date_val = self._get(row, col_map.get('date'))
+            (date_val, credit_val, debit_val, amount_val, currency_cell, sender_val,
+             client_name_val, iin_val, account_val, recipient_val, type_val, name_val,
+             purpose_val) = fetch(row)
             if date_val is None:
                 continue
 
-            credit = normalize_amount(self._get(row, col_map.get('credit')))
-            debit = normalize_amount(self._get(row, col_map.get('debit')))
+            credit = normalize_amount(credit_val)
+            debit = normalize_amount(debit_val)
             direction = determine_direction(debit_amount=debit, credit_amount=credit)
             amount = credit or debit
             # Fallback to 'amount' column for simple format
             if not amount:
-                amount = normalize_amount(self._get(row, col_map.get('amount')))
+                amount = normalize_amount(amount_val)
 
-            currency_val = clean_string(self._get(row, col_map.get('currency')))
+            currency_val = clean_string(currency_cell)
 
             t = Transaction(
                 transaction_date=normalize_date(date_val),
@@ -152,26 +159,20 @@ class KZIBankParser(BaseParser):
                 currency=normalize_currency(currency_val) if currency_val else 'KZT',
                 amount_tenge=amount,
                 direction=direction,
-                payer=clean_string(self._get(row, col_map.get('sender'))) or clean_string(self._get(row, col_map.get('client_name'))),
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('iin'))),
+                payer=clean_string(sender_val) or clean_string(client_name_val),
+                payer_iin_bin=normalize_iin_bin(iin_val),
                 payer_bank=None,
-                payer_account=clean_string(self._get(row, col_map.get('account'))),
-                recipient=clean_string(self._get(row, col_map.get('recipient'))),
+                payer_account=clean_string(account_val),
+                recipient=clean_string(recipient_val),
                 recipient_iin_bin=None, recipient_bank=None, recipient_account=None,
-                operation_type=clean_string(self._get(row, col_map.get('type'))) or clean_string(self._get(row, col_map.get('name'))),
+                operation_type=clean_string(type_val) or clean_string(name_val),
                 knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('purpose'))),
+                payment_purpose=clean_string(purpose_val),
                 document_number=None,
                 statement_bank=self.BANK_NAME,
-                account_number=clean_string(self._get(row, col_map.get('account'))),
+                account_number=clean_string(account_val),
                 source_file=file_info['filename'],
             )
             transactions.append(t)
 
         return transactions, {'account_number': None, 'warnings': [], 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
@@ -16,8 +16,8 @@ from ..base_parser import BaseParser
 from ..models import Transaction
 from ..file_reader import SheetData
 from ..normalizer import (
-    normalize_date, normalize_iin_bin, normalize_amount,
-    normalize_currency, determine_direction, clean_string
+    normalize_date, normalize_iin_bin, normalize_amount_column, normalize_column,
+    normalize_currency, direction_from_amounts, clean_string
 )
 from . import register_parser
 
@@ -55,7 +55,6 @@ class NarodnyBankParser(BaseParser):
     def parse_sheet(self, sheet: SheetData, file_info: dict) -> Tuple[List[Transaction], dict]:
         rows = sheet.rows
         warnings = []
-        transactions = []
 
         # Extract metadata from header rows
         account_number = None
@@ -141,12 +140,20 @@ class NarodnyBankParser(BaseParser):
             if non_none and all(isinstance(c, (int, float)) for c in non_none):
                 data_start += 1
 
+        fetch = self.row_getter(col_map, [
+            'date', 'credit_amount', 'debit_amount', 'credit_tenge', 'debit_tenge', 'currency',
+            'payer', 'payer_iin', 'payer_bank', 'payer_account', 'recipient', 'recipient_iin',
+            'recipient_bank', 'recipient_account', 'operation_type', 'knp', 'payment_purpose',
+        ])
+
+        data = []
         for row_idx in range(data_start, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
 
-            date_val = self._get(row, col_map.get('date'))
+            cells = fetch(row)
+            date_val = cells[0]
             if date_val is None:
                 continue
 
@@ -155,47 +162,65 @@ class NarodnyBankParser(BaseParser):
             if any(w in date_str for w in ['итого', 'входящий', 'исходящий', 'остаток', 'всего']):
                 continue
 
-            credit_amt = normalize_amount(self._get(row, col_map.get('credit_amount')))
-            debit_amt = normalize_amount(self._get(row, col_map.get('debit_amount')))
-            credit_tenge = normalize_amount(self._get(row, col_map.get('credit_tenge')))
-            debit_tenge = normalize_amount(self._get(row, col_map.get('debit_tenge')))
-
-            direction = determine_direction(debit_amount=debit_amt, credit_amount=credit_amt)
+            data.append(cells)
+
+        # Amount columns are normalized in bulk, column by column
+        credit_amts = normalize_amount_column([cells[1] for cells in data])
+        debit_amts = normalize_amount_column([cells[2] for cells in data])
+        credit_tenges = normalize_amount_column([cells[3] for cells in data])
+        debit_tenges = normalize_amount_column([cells[4] for cells in data])
+
+        def column(pos, normalizer):
+            # Counterparties, banks and codes repeat row after row:
+            # each distinct value is normalized once
+            return normalize_column(normalizer, [cells[pos] for cells in data])
+
+        currencies = column(5, normalize_currency)
+        payers, payer_banks, payer_accounts = (column(pos, clean_string) for pos in (6, 8, 9))
+        recipients, recipient_banks, recipient_accounts = (column(pos, clean_string) for pos in (10, 12, 13))
+        operation_types, knps = (column(pos, clean_string) for pos in (14, 15))
+        payer_iins, recipient_iins = (column(pos, normalize_iin_bin) for pos in (7, 11))
+
+        source_file = file_info['filename']
+        buf = []  # one field-ordered tuple per row
+        for (cells, credit_amt, debit_amt, credit_tenge, debit_tenge, currency,
+             payer, payer_iin, payer_bank, payer_account,
+             recipient, recipient_iin, recipient_bank, recipient_account,
+             operation_type, knp) in zip(
+                data, credit_amts, debit_amts, credit_tenges, debit_tenges, currencies,
+                payers, payer_iins, payer_banks, payer_accounts,
+                recipients, recipient_iins, recipient_banks, recipient_accounts,
+                operation_types, knps):
+            direction = direction_from_amounts(debit_amt, credit_amt)
             amount = credit_amt or debit_amt
             amount_tenge = credit_tenge or debit_tenge
 
-            t = Transaction(
-                transaction_date=normalize_date(date_val),
-                amount=amount,
-                currency=normalize_currency(self._get(row, col_map.get('currency'))),
-                amount_tenge=amount_tenge,
-                direction=direction,
-                payer=clean_string(self._get(row, col_map.get('payer'))),
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('payer_iin'))),
-                payer_bank=clean_string(self._get(row, col_map.get('payer_bank'))),
-                payer_account=clean_string(self._get(row, col_map.get('payer_account'))),
-                recipient=clean_string(self._get(row, col_map.get('recipient'))),
-                recipient_iin_bin=normalize_iin_bin(self._get(row, col_map.get('recipient_iin'))),
-                recipient_bank=clean_string(self._get(row, col_map.get('recipient_bank'))),
-                recipient_account=clean_string(self._get(row, col_map.get('recipient_account'))),
-                operation_type=clean_string(self._get(row, col_map.get('operation_type'))),
-                knp=clean_string(self._get(row, col_map.get('knp'))),
-                payment_purpose=clean_string(self._get(row, col_map.get('payment_purpose'))),
-                document_number=None,
-                statement_bank=self.BANK_NAME,
-                account_number=account_number,
-                source_file=file_info['filename'],
-            )
-            transactions.append(t)
+            buf.append((
+                normalize_date(cells[0]),  # transaction_date
+                amount,  # amount
+                currency,  # currency
+                amount_tenge,  # amount_tenge
+                direction,  # direction
+                payer,  # payer
+                payer_iin,  # payer_iin_bin
+                payer_bank,  # payer_bank
+                payer_account,  # payer_account
+                recipient,  # recipient
+                recipient_iin,  # recipient_iin_bin
+                recipient_bank,  # recipient_bank
+                recipient_account,  # recipient_account
+                operation_type,  # operation_type
+                knp,  # knp
+                clean_string(cells[16]),  # payment_purpose
+                None,  # document_number
+                self.BANK_NAME,  # statement_bank
+                account_number,  # account_number
+                source_file,  # source_file
+            ))
+        transactions = [Transaction.from_positional(*t) for t in buf]
 
         return transactions, {
             'account_number': account_number,
             'warnings': warnings,
             'errors': [],
         }
-
-    @staticmethod
-    def _get(row: list, idx: Optional[int]):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
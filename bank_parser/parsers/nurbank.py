@@ -5,26 +5,32 @@ Two formats:
 2. 13-col .xls: Bilingual (Kazakh/Russian) — Дата, № Документа, Счет ГК, Дебет, Кредит, etc.
 """
 
-import re
 from typing import List, Tuple, Optional
 
 from ..base_parser import BaseParser
 from ..models import Transaction
 from ..file_reader import SheetData
 from ..normalizer import (
-    normalize_date, normalize_iin_bin, normalize_amount,
-    normalize_currency, determine_direction, clean_string
+    normalize_date, normalize_iin_bin, normalize_amount_column, normalize_column,
+    normalize_currency, direction_from_amounts, clean_string
 )
 from . import register_parser
+from ._regex import IBAN_RE
 
 
 @register_parser
 class NurbankParser(BaseParser):
     """Nurbank 23-col or 16-col .xlsx format."""
     BANK_NAME = 'АО Нурбанк'
+    MARKERS = {'операции, проведенные в абис': 0.95}
+    MARKER_ROWS = 10
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
+        score = cls.marker_score(sheet)
+        if score:
+            return score
+
         # Scan for SWIFT/BIK code or bank name in metadata
         found_nurbank_id = False
         for row in sheet.rows[:15]:
@@ -37,15 +43,10 @@ class NurbankParser(BaseParser):
             if found_nurbank_id:
                 break
 
-        for row in sheet.rows[:10]:
-            for cell in row:
-                if cell and 'операции, проведенные в абис' in str(cell).lower():
-                    return 0.95
-
         # 16-col format
         folder = file_info.get('folder_name', '').lower()
-        for row in sheet.rows[:20]:
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(20)
+        for row_text in row_texts:
             if '№ п/п' in row_text and ('дата операции' in row_text or 'категория' in row_text):
                 if found_nurbank_id:
                     return 0.92
@@ -62,12 +63,11 @@ class NurbankParser(BaseParser):
 
     def parse_sheet(self, sheet: SheetData, file_info: dict) -> Tuple[List[Transaction], dict]:
         rows = sheet.rows
-        transactions = []
 
         # Find header row — scan deeper for some formats
         header_idx = None
-        for i, row in enumerate(rows[:20]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(20)
+        for i, row_text in enumerate(row_texts):
             if '№ п/п' in row_text and ('дата операции' in row_text or 'категория' in row_text):
                 header_idx = i
                 break
@@ -124,50 +124,79 @@ class NurbankParser(BaseParser):
             if vals and all(isinstance(v, (int, float)) and v < 50 for v in vals):
                 data_start += 1
 
+        fetch = self.row_getter(col_map, [
+            'date', 'amount', 'currency', 'amount_tenge', 'payer', 'payer_iin', 'payer_bank',
+            'payer_account', 'recipient', 'recipient_iin', 'recipient_bank', 'recipient_account',
+            'category', 'knp', 'purpose', 'doc_number',
+        ])
+
+        data = []
         for row_idx in range(data_start, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
 
-            date_val = self._get(row, col_map.get('date'))
+            cells = fetch(row)
+            date_val = cells[0]
             if date_val is None:
                 continue
 
             if isinstance(date_val, str) and any(w in date_val.lower() for w in ['итого', 'всего']):
                 continue
 
-            t = Transaction(
-                transaction_date=normalize_date(date_val),
-                amount=normalize_amount(self._get(row, col_map.get('amount'))),
-                currency=normalize_currency(self._get(row, col_map.get('currency'))),
-                amount_tenge=normalize_amount(self._get(row, col_map.get('amount_tenge'))),
-                direction=None,
-                payer=clean_string(self._get(row, col_map.get('payer'))),
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('payer_iin'))),
-                payer_bank=clean_string(self._get(row, col_map.get('payer_bank'))),
-                payer_account=clean_string(self._get(row, col_map.get('payer_account'))),
-                recipient=clean_string(self._get(row, col_map.get('recipient'))),
-                recipient_iin_bin=normalize_iin_bin(self._get(row, col_map.get('recipient_iin'))),
-                recipient_bank=clean_string(self._get(row, col_map.get('recipient_bank'))),
-                recipient_account=clean_string(self._get(row, col_map.get('recipient_account'))),
-                operation_type=clean_string(self._get(row, col_map.get('category'))),
-                knp=clean_string(self._get(row, col_map.get('knp'))),
-                payment_purpose=clean_string(self._get(row, col_map.get('purpose'))),
-                document_number=clean_string(self._get(row, col_map.get('doc_number'))),
-                statement_bank=self.BANK_NAME,
-                account_number=None,
-                source_file=file_info['filename'],
-            )
-            transactions.append(t)
+            data.append(cells)
+
+        # Amount columns are normalized in bulk, column by column
+        amounts = normalize_amount_column([cells[1] for cells in data])
+        amounts_tenge = normalize_amount_column([cells[3] for cells in data])
+
+        def column(pos, normalizer):
+            # Counterparties, banks and codes repeat row after row:
+            # each distinct value is normalized once
+            return normalize_column(normalizer, [cells[pos] for cells in data])
+
+        currencies = column(2, normalize_currency)
+        payers, payer_banks, payer_accounts = (column(pos, clean_string) for pos in (4, 6, 7))
+        recipients, recipient_banks, recipient_accounts = (column(pos, clean_string) for pos in (8, 10, 11))
+        categories, knps = (column(pos, clean_string) for pos in (12, 13))
+        payer_iins, recipient_iins = (column(pos, normalize_iin_bin) for pos in (5, 9))
+
+        source_file = file_info['filename']
+        buf = []  # one field-ordered tuple per row
+        for (cells, amount, amount_tenge, currency,
+             payer, payer_iin, payer_bank, payer_account,
+             recipient, recipient_iin, recipient_bank, recipient_account,
+             category, knp) in zip(
+                data, amounts, amounts_tenge, currencies,
+                payers, payer_iins, payer_banks, payer_accounts,
+                recipients, recipient_iins, recipient_banks, recipient_accounts,
+                categories, knps):
+            buf.append((
+                normalize_date(cells[0]),  # transaction_date
+                amount,  # amount
+                currency,  # currency
+                amount_tenge,  # amount_tenge
+                None,  # direction
+                payer,  # payer
+                payer_iin,  # payer_iin_bin
+                payer_bank,  # payer_bank
+                payer_account,  # payer_account
+                recipient,  # recipient
+                recipient_iin,  # recipient_iin_bin
+                recipient_bank,  # recipient_bank
+                recipient_account,  # recipient_account
+                category,  # operation_type
+                knp,  # knp
+                clean_string(cells[14]),  # payment_purpose
+                clean_string(cells[15]),  # document_number
+                self.BANK_NAME,  # statement_bank
+                None,  # account_number
+                source_file,  # source_file
+            ))
+        transactions = [Transaction.from_positional(*t) for t in buf]
 
         return transactions, {'account_number': None, 'warnings': [], 'errors': []}
 
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
-
 
 @register_parser
 class NurbankXlsParser(BaseParser):
@@ -189,8 +218,8 @@ class NurbankXlsParser(BaseParser):
                 break
 
         folder = file_info.get('folder_name', '').lower()
-        for row in sheet.rows[:15]:
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(15)
+        for row_text in row_texts:
             if ('дата' in row_text and 'дебет' in row_text and 'кредит' in row_text and
                     ('корреспондент' in row_text or 'назначение' in row_text)):
                 if found_nurbank_id:
@@ -205,21 +234,20 @@ class NurbankXlsParser(BaseParser):
 
     def parse_sheet(self, sheet: SheetData, file_info: dict) -> Tuple[List[Transaction], dict]:
         rows = sheet.rows
-        transactions = []
         account_number = None
 
         # Extract account from metadata
         for row in rows[:10]:
             for cell in row:
                 if cell:
-                    m = re.search(r'(KZ\w{16,22})', str(cell))
+                    m = IBAN_RE.search(str(cell))
                     if m:
                         account_number = m.group(1)
 
         # Find header
         header_idx = None
-        for i, row in enumerate(rows[:15]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(15)
+        for i, row_text in enumerate(row_texts):
             if 'дата' in row_text and 'дебет' in row_text and 'кредит' in row_text:
                 header_idx = i
                 break
@@ -257,58 +285,69 @@ class NurbankXlsParser(BaseParser):
             elif 'назначение' in h:
                 col_map['purpose'] = i
 
+        fetch = self.row_getter(col_map, [
+            'date', 'debit', 'credit', 'debit_equiv', 'credit_equiv', 'counterparty', 'iin',
+            'corr_bank', 'corr_account', 'purpose', 'doc_number',
+        ])
+
+        data = []
         for row_idx in range(header_idx + 1, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
 
-            date_val = self._get(row, col_map.get('date'))
+            cells = fetch(row)
+            date_val = cells[0]
             if date_val is None:
                 continue
             if isinstance(date_val, str) and any(w in date_val.lower() for w in ['итого', 'всего', 'остаток', 'входящий']):
                 continue
 
-            debit = normalize_amount(self._get(row, col_map.get('debit')))
-            credit = normalize_amount(self._get(row, col_map.get('credit')))
-            direction = determine_direction(debit_amount=debit, credit_amount=credit)
+            data.append(cells)
+
+        # Amount columns are normalized in bulk, column by column
+        debits = normalize_amount_column([cells[1] for cells in data])
+        credits = normalize_amount_column([cells[2] for cells in data])
+        debit_equivs = normalize_amount_column([cells[3] for cells in data])
+        credit_equivs = normalize_amount_column([cells[4] for cells in data])
+
+        # Counterparty columns repeat row after row: each distinct value is normalized once
+        counterparties, corr_banks, corr_accounts = (
+            normalize_column(clean_string, [cells[pos] for cells in data]) for pos in (5, 7, 8)
+        )
+        iins = normalize_column(normalize_iin_bin, [cells[6] for cells in data])
+
+        source_file = file_info['filename']
+        buf = []  # one field-ordered tuple per row
+        for cells, debit, credit, debit_equiv, credit_equiv, counterparty, iin, corr_bank, corr_account in zip(
+                data, debits, credits, debit_equivs, credit_equivs,
+                counterparties, iins, corr_banks, corr_accounts):
+            direction = direction_from_amounts(debit, credit)
             amount = credit or debit
 
-            debit_equiv = normalize_amount(self._get(row, col_map.get('debit_equiv')))
-            credit_equiv = normalize_amount(self._get(row, col_map.get('credit_equiv')))
             amount_tenge = credit_equiv or debit_equiv or amount
 
-            counterparty = clean_string(self._get(row, col_map.get('counterparty')))
-            iin = normalize_iin_bin(self._get(row, col_map.get('iin')))
-            corr_bank = clean_string(self._get(row, col_map.get('corr_bank')))
-            corr_account = clean_string(self._get(row, col_map.get('corr_account')))
-
-            t = Transaction(
-                transaction_date=normalize_date(date_val),
-                amount=amount,
-                currency='KZT',
-                amount_tenge=amount_tenge,
-                direction=direction,
-                payer=counterparty if direction == 'Приход' else None,
-                payer_iin_bin=iin if direction == 'Приход' else None,
-                payer_bank=corr_bank if direction == 'Приход' else None,
-                payer_account=corr_account if direction == 'Приход' else None,
-                recipient=counterparty if direction == 'Расход' else None,
-                recipient_iin_bin=iin if direction == 'Расход' else None,
-                recipient_bank=corr_bank if direction == 'Расход' else None,
-                recipient_account=corr_account if direction == 'Расход' else None,
-                operation_type=None, knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('purpose'))),
-                document_number=clean_string(self._get(row, col_map.get('doc_number'))),
-                statement_bank=self.BANK_NAME,
-                account_number=account_number,
-                source_file=file_info['filename'],
-            )
-            transactions.append(t)
+            buf.append((
+                normalize_date(cells[0]),  # transaction_date
+                amount,  # amount
+                'KZT',  # currency
+                amount_tenge,  # amount_tenge
+                direction,  # direction
+                counterparty if direction == 'Приход' else None,  # payer
+                iin if direction == 'Приход' else None,  # payer_iin_bin
+                corr_bank if direction == 'Приход' else None,  # payer_bank
+                corr_account if direction == 'Приход' else None,  # payer_account
+                counterparty if direction == 'Расход' else None,  # recipient
+                iin if direction == 'Расход' else None,  # recipient_iin_bin
+                corr_bank if direction == 'Расход' else None,  # recipient_bank
+                corr_account if direction == 'Расход' else None,  # recipient_account
+                None, None,  # operation_type, knp
+                clean_string(cells[9]),  # payment_purpose
+                clean_string(cells[10]),  # document_number
+                self.BANK_NAME,  # statement_bank
+                account_number,  # account_number
+                source_file,  # source_file
+            ))
+        transactions = [Transaction.from_positional(*t) for t in buf]
 
         return transactions, {'account_number': account_number, 'warnings': [], 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
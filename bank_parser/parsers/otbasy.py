@@ -7,7 +7,6 @@ Row 1: "SWIFT Банка: HCSKKZKA"
 Then 18-col header similar to standard format.
 """
 
-import re
 from typing import List, Tuple, Optional
 
 from ..base_parser import BaseParser
@@ -18,6 +17,7 @@ from ..normalizer import (
     normalize_currency, clean_string
 )
 from . import register_parser
+from ._regex import IBAN_RE
 
 
 @register_parser
@@ -48,7 +48,7 @@ class OtbasyParser(BaseParser):
                 if cell is None:
                     continue
                 s = str(cell)
-                match = re.search(r'(KZ\w{16,22})', s)
+                match = IBAN_RE.search(s)
                 if match:
                     account_number = match.group(1)
 
@@ -120,19 +120,27 @@ class OtbasyParser(BaseParser):
             if non_none and all(isinstance(c, (int, float)) for c in non_none):
                 data_start += 1
 
+        fetch = self.row_getter(col_map, [
+            'date', 'operation_type', 'amount', 'currency', 'amount_tenge', 'payer', 'payer_iin',
+            'payer_bank', 'payer_account', 'recipient', 'recipient_iin', 'recipient_bank',
+            'recipient_account', 'knp', 'payment_purpose',
+        ])
+
         for row_idx in range(data_start, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
 
-            date_val = self._get(row, col_map.get('date'))
+            (date_val, operation_type_val, amount_val, currency_val, amount_tenge_val, payer_val,
+             payer_iin_val, payer_bank_val, payer_account_val, recipient_val, recipient_iin_val,
+             recipient_bank_val, recipient_account_val, knp_val, payment_purpose_val) = fetch(row)
             if date_val is None:
                 continue
 
             if isinstance(date_val, str) and any(w in date_val.lower() for w in ['итого', 'остаток']):
                 continue
 
-            op_type = clean_string(self._get(row, col_map.get('operation_type')))
+            op_type = clean_string(operation_type_val)
             direction = None
             if op_type:
                 op_lower = op_type.lower()
@@ -143,21 +151,21 @@ class OtbasyParser(BaseParser):
 
             t = Transaction(
                 transaction_date=normalize_date(date_val),
-                amount=normalize_amount(self._get(row, col_map.get('amount'))),
-                currency=normalize_currency(self._get(row, col_map.get('currency'))),
-                amount_tenge=normalize_amount(self._get(row, col_map.get('amount_tenge'))),
+                amount=normalize_amount(amount_val),
+                currency=normalize_currency(currency_val),
+                amount_tenge=normalize_amount(amount_tenge_val),
                 direction=direction,
-                payer=clean_string(self._get(row, col_map.get('payer'))),
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('payer_iin'))),
-                payer_bank=clean_string(self._get(row, col_map.get('payer_bank'))),
-                payer_account=clean_string(self._get(row, col_map.get('payer_account'))),
-                recipient=clean_string(self._get(row, col_map.get('recipient'))),
-                recipient_iin_bin=normalize_iin_bin(self._get(row, col_map.get('recipient_iin'))),
-                recipient_bank=clean_string(self._get(row, col_map.get('recipient_bank'))),
-                recipient_account=clean_string(self._get(row, col_map.get('recipient_account'))),
+                payer=clean_string(payer_val),
+                payer_iin_bin=normalize_iin_bin(payer_iin_val),
+                payer_bank=clean_string(payer_bank_val),
+                payer_account=clean_string(payer_account_val),
+                recipient=clean_string(recipient_val),
+                recipient_iin_bin=normalize_iin_bin(recipient_iin_val),
+                recipient_bank=clean_string(recipient_bank_val),
+                recipient_account=clean_string(recipient_account_val),
                 operation_type=op_type,
-                knp=clean_string(self._get(row, col_map.get('knp'))),
-                payment_purpose=clean_string(self._get(row, col_map.get('payment_purpose'))),
+                knp=clean_string(knp_val),
+                payment_purpose=clean_string(payment_purpose_val),
                 document_number=None,
                 statement_bank=self.BANK_NAME,
                 account_number=account_number,
@@ -166,9 +174,3 @@ class OtbasyParser(BaseParser):
             transactions.append(t)
 
         return transactions, {'account_number': account_number, 'warnings': warnings, 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
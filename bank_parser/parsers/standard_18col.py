@@ -8,17 +8,19 @@ VTB: header at row 0, 18 cols, dates "YYYY.MM.DD HH:MM:SS", currency "KZT - Те
 Freedom Finance/Bank: header at row 1 (row 0 is empty), 17 cols (no Назначение платежа)
 """
 
+from functools import lru_cache
 from typing import List, Tuple, Optional
-import re
 
 from ..base_parser import BaseParser
 from ..models import Transaction
 from ..file_reader import SheetData
+from ..matcher import KeywordMatcher
 from ..normalizer import (
     normalize_date, normalize_iin_bin, normalize_amount,
-    normalize_currency, clean_string
+    normalize_currency, normalize_column, clean_string
 )
 from . import register_parser
+from ._regex import SHORT_IBAN_RE
 
 
 # Standard 18-column headers (Shinhan/Home Credit)
@@ -34,21 +36,121 @@ STANDARD_MARKERS = [
 # VTB-specific: "Вид операции (КД)" instead of "Виды операции (категория документа)"
 VTB_MARKERS = ['вид операции (кд)', 'резиденство']  # Note: VTB has typo "резиденство"
 
+BANK_VTB = 'ДО АО Банк ВТБ (Казахстан)'
+BANK_SHINHAN = 'АО Шинхан Банк Казахстан'
+BANK_HOME_CREDIT = 'АО Home Credit Bank'
+BANK_FREEDOM_FINANCE = 'АО Банк Фридом Финанс Казахстан'
+BANK_FREEDOM = 'АО Фридом Банк Казахстан'
+
+# Lowercased keywords found in cell text, in priority order (SWIFT codes first)
+BANK_KEYWORDS = [
+    ('vtbakzka', BANK_VTB),
+    ('shbkkzka', BANK_SHINHAN),
+    ('втб', BANK_VTB),
+    ('shinhan', BANK_SHINHAN),
+    ('шинхан', BANK_SHINHAN),
+    ('home credit', BANK_HOME_CREDIT),
+    ('хоум кредит', BANK_HOME_CREDIT),
+    ('фридом финанс', BANK_FREEDOM_FINANCE),
+]
+
+# Single automaton for all bank keywords, plus the 'фридом' + 'банк' combination
+_BANK_MATCHER = KeywordMatcher([kw for kw, _ in BANK_KEYWORDS] + ['фридом', 'банк'])
+
 
-def _is_standard_header(row: list) -> bool:
-    """Check if row looks like the standard 18-col header."""
-    if not row or len([c for c in row if c]) < 10:
+def _is_standard_header(row_text: str, num_cells: int) -> bool:
+    """Check if a lowercased row looks like the standard 18-col header."""
+    if num_cells < 10:
         return False
-    row_text = ' '.join(str(c).lower() for c in row if c)
     matches = sum(1 for m in STANDARD_MARKERS if m in row_text)
     return matches >= 4
 
 
-def _find_header_idx(rows: list) -> Optional[int]:
-    """Find header row in first 10 rows."""
-    for i, row in enumerate(rows[:10]):
-        if _is_standard_header(row):
-            return i
+def _find_header_idx(sheet: SheetData) -> Optional[int]:
+    """Find header row in first 10 rows.
+
+    Cached on the sheet: detection and parsing both ask for it.
+    """
+    cache = sheet._probe_cache
+    if 'standard_18col.header_idx' not in cache:
+        header_idx = None
+        row_texts, row_cells = sheet.top_lower(10)
+        for i, (row_text, cells) in enumerate(zip(row_texts, row_cells)):
+            if _is_standard_header(row_text, len(cells)):
+                header_idx = i
+                break
+        cache['standard_18col.header_idx'] = header_idx
+    return cache['standard_18col.header_idx']
+
+
+@lru_cache(maxsize=64)
+def _map_header(header_lower: tuple) -> dict:
+    """Map field names to column indices for a lowercased header row.
+
+    Cached by header signature: statements from one bank repeat the same
+    header, so the substring rules run once per layout rather than per sheet.
+    Callers get a shared dict and must not modify it.
+    """
+    col_map = {}
+    for i, h in enumerate(header_lower):
+        if 'дата и время' in h or h == 'дата операции':
+            col_map['date'] = i
+        elif 'валюта операции' in h or (h == 'валюта' and 'date' in col_map):
+            col_map['currency'] = i
+        elif 'виды операции' in h or 'вид операции' in h or 'категория' in h:
+            col_map['operation_type'] = i
+        elif 'наименование сдп' in h:
+            col_map['sdp'] = i
+        elif 'сумма в валюте' in h or h == 'сумма (вал.)':
+            col_map['amount'] = i
+        elif 'сумма в тенге' in h or h == 'сумма (тенге)':
+            col_map['amount_tenge'] = i
+        elif ('плательщик' in h and ('наименование' in h or 'фио' in h)) or h == 'наименование/фио плательщика>':
+            col_map['payer'] = i
+        elif 'иин' in h and 'плательщик' in h:
+            col_map['payer_iin'] = i
+        elif 'резиден' in h and 'плательщик' in h:
+            col_map['payer_residency'] = i
+        elif 'банк плательщик' in h:
+            col_map['payer_bank'] = i
+        elif 'счет' in h and 'плательщик' in h:
+            col_map['payer_account'] = i
+        elif ('получател' in h and ('наименование' in h or 'фио' in h)):
+            col_map['recipient'] = i
+        elif 'иин' in h and 'получател' in h:
+            col_map['recipient_iin'] = i
+        elif 'резиден' in h and 'получател' in h:
+            col_map['recipient_residency'] = i
+        elif 'банк получател' in h:
+            col_map['recipient_bank'] = i
+        elif 'счет' in h and 'получател' in h:
+            col_map['recipient_account'] = i
+        elif 'код назначен' in h or 'код назначение' in h or h == 'кнп':
+            col_map['knp'] = i
+        elif 'назначение платежа' in h:
+            col_map['payment_purpose'] = i
+    return col_map
+
+
+@lru_cache(maxsize=512)
+def _determine_direction_from_op(op_type: Optional[str]) -> Optional[str]:
+    """Determine direction from VTB-style operation type codes.
+
+    Cached: a statement only has a handful of distinct operation types.
+    """
+    if not op_type:
+        return None
+    op_lower = op_type.lower()
+    # VTB: "1 - Внешние входящие", "3 - Внутренние входящие"
+    if 'входящ' in op_lower:
+        return 'Приход'
+    if 'исходящ' in op_lower:
+        return 'Расход'
+    # General patterns
+    if 'зачисление' in op_lower or 'пополнение' in op_lower:
+        return 'Приход'
+    if 'списание' in op_lower or 'снятие' in op_lower:
+        return 'Расход'
     return None
 
 
@@ -73,19 +175,18 @@ class Standard18ColParser(BaseParser):
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
         """Detect standard 18-col format."""
-        header_idx = _find_header_idx(sheet.rows)
+        header_idx = _find_header_idx(sheet)
         if header_idx is None:
             return 0.0
 
-        row = sheet.rows[header_idx]
-        non_none_count = len([c for c in row if c])
+        row_texts, row_cells = sheet.top_lower(10)
 
         # Must have 17-18 non-None columns
-        if non_none_count < 15:
+        if len(row_cells[header_idx]) < 15:
             return 0.0
 
         # Check for standard markers
-        row_text = ' '.join(str(c).lower() for c in row if c)
+        row_text = row_texts[header_idx]
 
         # VTB specific
         if any(m in row_text for m in VTB_MARKERS):
@@ -102,59 +203,45 @@ class Standard18ColParser(BaseParser):
 
     def _detect_bank_name(self, sheet: SheetData, file_info: dict) -> str:
         """Detect specific bank from data content, with folder as fallback."""
-        # SWIFT code map for 18-col banks
-        swift_to_bank = {
-            'VTBAKZKA': 'ДО АО Банк ВТБ (Казахстан)',
-            'SHBKKZKA': 'АО Шинхан Банк Казахстан',
-        }
-
         # Step 1: Scan data for SWIFT codes and bank name mentions
-        header_idx = _find_header_idx(sheet.rows)
+        header_idx = _find_header_idx(sheet)
         scan_end = min(len(sheet.rows), (header_idx or 0) + 10)
         for row in sheet.rows[:scan_end]:
             for cell in row:
                 if cell:
-                    cs = str(cell)
-                    cl = cs.lower()
-                    for swift, bank_name in swift_to_bank.items():
-                        if swift in cs:
+                    hits = _BANK_MATCHER.find(str(cell).lower())
+                    if not hits:
+                        continue
+                    for keyword, bank_name in BANK_KEYWORDS:
+                        if keyword in hits:
                             return bank_name
-                    if 'втб' in cl:
-                        return 'ДО АО Банк ВТБ (Казахстан)'
-                    if 'shinhan' in cl or 'шинхан' in cl:
-                        return 'АО Шинхан Банк Казахстан'
-                    if 'home credit' in cl or 'хоум кредит' in cl:
-                        return 'АО Home Credit Bank'
-                    if 'фридом финанс' in cl:
-                        return 'АО Банк Фридом Финанс Казахстан'
-                    if 'фридом' in cl and 'банк' in cl:
-                        return 'АО Фридом Банк Казахстан'
+                    if 'фридом' in hits and 'банк' in hits:
+                        return BANK_FREEDOM
 
         # Step 2: Folder fallback
         folder = file_info.get('folder_name', '').lower()
         if 'втб' in folder or 'vtb' in folder:
-            return 'ДО АО Банк ВТБ (Казахстан)'
+            return BANK_VTB
         if 'шинхан' in folder or 'shinhan' in folder:
-            return 'АО Шинхан Банк Казахстан'
+            return BANK_SHINHAN
         if 'home credit' in folder or 'хоум' in folder:
-            return 'АО Home Credit Bank'
+            return BANK_HOME_CREDIT
         if 'фридом финанс' in folder:
-            return 'АО Банк Фридом Финанс Казахстан'
+            return BANK_FREEDOM_FINANCE
         if 'фридом банк' in folder or 'фридом' in folder:
-            return 'АО Фридом Банк Казахстан'
+            return BANK_FREEDOM
 
         return file_info.get('folder_name', '') or 'Неизвестный банк'
 
     def parse_sheet(self, sheet: SheetData, file_info: dict) -> Tuple[List[Transaction], dict]:
         rows = sheet.rows
         warnings = []
-        transactions = []
+        buf = []  # one field-ordered tuple per row
 
-        header_idx = _find_header_idx(rows)
+        header_idx = _find_header_idx(sheet)
         if header_idx is None:
             return [], {'warnings': [], 'errors': ['Header row not found']}
 
-        header = rows[header_idx]
         data_start = _find_data_start(rows, header_idx)
 
         # Detect bank name
@@ -162,138 +249,97 @@ class Standard18ColParser(BaseParser):
         self.BANK_NAME = bank_name
 
         # Build column index map
-        col_map = {}
-        header_lower = [str(c).lower().strip() if c else '' for c in header]
-
-        for i, h in enumerate(header_lower):
-            if 'дата и время' in h or h == 'дата операции':
-                col_map['date'] = i
-            elif 'валюта операции' in h or (h == 'валюта' and 'date' in col_map):
-                col_map['currency'] = i
-            elif 'виды операции' in h or 'вид операции' in h or 'категория' in h:
-                col_map['operation_type'] = i
-            elif 'наименование сдп' in h:
-                col_map['sdp'] = i
-            elif 'сумма в валюте' in h or h == 'сумма (вал.)':
-                col_map['amount'] = i
-            elif 'сумма в тенге' in h or h == 'сумма (тенге)':
-                col_map['amount_tenge'] = i
-            elif ('плательщик' in h and ('наименование' in h or 'фио' in h)) or h == 'наименование/фио плательщика>':
-                col_map['payer'] = i
-            elif 'иин' in h and 'плательщик' in h:
-                col_map['payer_iin'] = i
-            elif 'резиден' in h and 'плательщик' in h:
-                col_map['payer_residency'] = i
-            elif 'банк плательщик' in h:
-                col_map['payer_bank'] = i
-            elif 'счет' in h and 'плательщик' in h:
-                col_map['payer_account'] = i
-            elif ('получател' in h and ('наименование' in h or 'фио' in h)):
-                col_map['recipient'] = i
-            elif 'иин' in h and 'получател' in h:
-                col_map['recipient_iin'] = i
-            elif 'резиден' in h and 'получател' in h:
-                col_map['recipient_residency'] = i
-            elif 'банк получател' in h:
-                col_map['recipient_bank'] = i
-            elif 'счет' in h and 'получател' in h:
-                col_map['recipient_account'] = i
-            elif 'код назначен' in h or 'код назначение' in h or h == 'кнп':
-                col_map['knp'] = i
-            elif 'назначение платежа' in h:
-                col_map['payment_purpose'] = i
+        col_map = _map_header(tuple(sheet.header_lower(header_idx)))
 
         # Extract account number from sheet name or filename
         account = self._extract_account(sheet.name, file_info['filename'])
 
-        # Parse data rows
+        # Keep data rows, skipping blanks and summary/total rows (no date)
+        c_date = col_map.get('date')
+        data_rows = []
         for row_idx in range(data_start, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
-
-            # Skip summary/total rows
-            date_val = self._get(row, col_map.get('date'))
-            if date_val is None:
+            if c_date is None or c_date >= len(row) or row[c_date] is None:
                 continue
+            data_rows.append(row)
+
+        # Normalize the heavy columns once per distinct value, column by column
+        dates = self._column(data_rows, c_date, normalize_date)
+        amounts = self._column(data_rows, col_map.get('amount'), normalize_amount)
+        amounts_tenge = self._column(data_rows, col_map.get('amount_tenge'), normalize_amount)
+        currencies = self._column(data_rows, col_map.get('currency'), normalize_currency)
+
+        # All text cells of a row come out of one itemgetter call
+        fetch = self.row_getter(col_map, [
+            'operation_type', 'payer', 'payer_iin', 'payer_bank', 'payer_account',
+            'recipient', 'recipient_iin', 'recipient_bank', 'recipient_account',
+            'knp', 'payment_purpose',
+        ])
+
+        source_file = file_info['filename']
+        for row, date_norm, amount_val, amount_tenge_val, currency in zip(
+                data_rows, dates, amounts, amounts_tenge, currencies):
+            (op_cell, payer_cell, payer_iin_cell, payer_bank_cell, payer_account_cell,
+             recipient_cell, recipient_iin_cell, recipient_bank_cell, recipient_account_cell,
+             knp_cell, purpose_cell) = fetch(row)
 
             # Determine direction from operation type for VTB
-            op_type = clean_string(self._get(row, col_map.get('operation_type')))
-            direction = self._determine_direction_from_op(op_type)
-
-            amount_val = normalize_amount(self._get(row, col_map.get('amount')))
-            amount_tenge_val = normalize_amount(self._get(row, col_map.get('amount_tenge')))
+            op_type = clean_string(op_cell)
+            direction = _determine_direction_from_op(op_type)
 
-            # For VTB, negative amounts mean expense
+            # For VTB, negative amounts mean expense (sign already known, so just negate)
             if amount_val is not None and amount_val < 0:
                 direction = direction or 'Расход'
-                amount_val = abs(amount_val)
+                amount_val = -amount_val
             if amount_tenge_val is not None and amount_tenge_val < 0:
                 direction = direction or 'Расход'
-                amount_tenge_val = abs(amount_tenge_val)
-
-            t = Transaction(
-                transaction_date=normalize_date(date_val),
-                amount=amount_val,
-                currency=normalize_currency(self._get(row, col_map.get('currency'))),
-                amount_tenge=amount_tenge_val,
-                direction=direction,
-                payer=clean_string(self._get(row, col_map.get('payer'))),
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('payer_iin'))),
-                payer_bank=clean_string(self._get(row, col_map.get('payer_bank'))),
-                payer_account=clean_string(self._get(row, col_map.get('payer_account'))),
-                recipient=clean_string(self._get(row, col_map.get('recipient'))),
-                recipient_iin_bin=normalize_iin_bin(self._get(row, col_map.get('recipient_iin'))),
-                recipient_bank=clean_string(self._get(row, col_map.get('recipient_bank'))),
-                recipient_account=clean_string(self._get(row, col_map.get('recipient_account'))),
-                operation_type=op_type,
-                knp=clean_string(self._get(row, col_map.get('knp'))),
-                payment_purpose=clean_string(self._get(row, col_map.get('payment_purpose'))),
-                document_number=None,
-                statement_bank=bank_name,
-                account_number=account,
-                source_file=file_info['filename'],
-            )
-            transactions.append(t)
-
+                amount_tenge_val = -amount_tenge_val
+
+            buf.append((
+                date_norm,  # transaction_date
+                amount_val,  # amount
+                currency,  # currency
+                amount_tenge_val,  # amount_tenge
+                direction,  # direction
+                clean_string(payer_cell),  # payer
+                normalize_iin_bin(payer_iin_cell),  # payer_iin_bin
+                clean_string(payer_bank_cell),  # payer_bank
+                clean_string(payer_account_cell),  # payer_account
+                clean_string(recipient_cell),  # recipient
+                normalize_iin_bin(recipient_iin_cell),  # recipient_iin_bin
+                clean_string(recipient_bank_cell),  # recipient_bank
+                clean_string(recipient_account_cell),  # recipient_account
+                op_type,  # operation_type
+                clean_string(knp_cell),  # knp
+                clean_string(purpose_cell),  # payment_purpose
+                None,  # document_number
+                bank_name,  # statement_bank
+                account,  # account_number
+                source_file,  # source_file
+            ))
+
+        transactions = [Transaction.from_positional(*t) for t in buf]
         return transactions, {
             'account_number': account,
             'warnings': warnings,
             'errors': [],
         }
 
-    def _determine_direction_from_op(self, op_type: str) -> Optional[str]:
-        """Determine direction from VTB-style operation type codes."""
-        if not op_type:
-            return None
-        op_lower = op_type.lower()
-        # VTB: "1 - Внешние входящие", "3 - Внутренние входящие"
-        if 'входящ' in op_lower:
-            return 'Приход'
-        if 'исходящ' in op_lower:
-            return 'Расход'
-        # General patterns
-        if 'зачисление' in op_lower or 'пополнение' in op_lower:
-            return 'Приход'
-        if 'списание' in op_lower or 'снятие' in op_lower:
-            return 'Расход'
-        return None
-
     def _extract_account(self, sheet_name: str, filename: str) -> Optional[str]:
         """Extract IBAN from sheet name or filename."""
         # Try sheet name first (e.g., "KZ72551N129228750KZT")
-        match = re.search(r'(KZ\w{16,20})', sheet_name)
+        match = SHORT_IBAN_RE.search(sheet_name)
         if match:
             return match.group(1)
         # Try filename
-        match = re.search(r'(KZ\w{16,20})', filename)
+        match = SHORT_IBAN_RE.search(filename)
         if match:
             return match.group(1)
         return None
 
-    @staticmethod
-    def _get(row: list, idx: Optional[int]):
-        """Safely get value from row by index."""
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
+    @classmethod
+    def _column(cls, rows: list, idx: Optional[int], normalizer) -> list:
+        """Normalize one column across all rows."""
+        return normalize_column(normalizer, cls.column_values(rows, idx))
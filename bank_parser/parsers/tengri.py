@@ -8,15 +8,14 @@ Header row has: Дата | ИИН/БИН | Счет-корреспондент |
 Separate Дебет/Кредит (валюта) and (нац.покрытие) columns.
 """
 
-import re
 from typing import List, Tuple, Optional
 
 from ..base_parser import BaseParser
 from ..models import Transaction
 from ..file_reader import SheetData
 from ..normalizer import (
-    normalize_date, normalize_iin_bin, normalize_amount,
-    normalize_currency, determine_direction, clean_string
+    IBAN_RE, normalize_date, normalize_iin_bin, normalize_amount_column,
+    normalize_currency, direction_from_amounts, first_amount, clean_string
 )
 from . import register_parser
 
@@ -24,13 +23,14 @@ from . import register_parser
 @register_parser
 class TengriBankParser(BaseParser):
     BANK_NAME = 'АО Tengri Bank'
+    MARKERS = {'tengri bank': 0.95}
+    MARKER_ROWS = 5
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
-        for row in sheet.rows[:5]:
-            for cell in row:
-                if cell and 'Tengri Bank' in str(cell):
-                    return 0.95
+        score = cls.marker_score(sheet)
+        if score:
+            return score
         folder = file_info.get('folder_name', '').lower()
         if 'tengri' in folder:
             return 0.8
@@ -39,26 +39,29 @@ class TengriBankParser(BaseParser):
     def parse_sheet(self, sheet: SheetData, file_info: dict) -> Tuple[List[Transaction], dict]:
         rows = sheet.rows
         warnings = []
-        transactions = []
+        buf = []  # one field-ordered tuple per row
         account_number = None
         currency = None
 
-        # Extract metadata
-        for row in rows[:15]:
-            for cell in row:
-                if cell is None:
-                    continue
-                s = str(cell)
-                match = re.search(r'(KZ\w{16,22})', s)
-                if match:
-                    account_number = match.group(1)
-                if 'валюта:' in s.lower():
+        # Extract metadata, stopping once both account and currency are known
+        for cells in sheet.top_cells(15):
+            for s in cells:
+                if account_number is None:
+                    match = IBAN_RE.search(s)
+                    if match:
+                        account_number = match.group(1)
+                if currency is None and 'валюта:' in s.lower():
                     currency = s.split(':')[-1].strip()
+                if account_number and currency:
+                    break
+            else:
+                continue
+            break
 
         # Find header row
         header_idx = None
-        for i, row in enumerate(rows[:20]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(20)
+        for i, row_text in enumerate(row_texts):
             if 'дата' in row_text and ('дебет' in row_text or 'кредит' in row_text):
                 header_idx = i
                 break
@@ -92,55 +95,61 @@ class TengriBankParser(BaseParser):
             elif h == 'кредит':
                 col_map['credit_amount'] = i
 
+        fetch = self.row_getter(col_map, [
+            'date', 'debit_amount', 'credit_amount', 'debit_tenge', 'credit_tenge',
+            'iin', 'corr_account', 'description',
+        ])
+
+        data = []
         for row_idx in range(header_idx + 1, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
 
-            date_val = self._get(row, col_map.get('date'))
+            cells = fetch(row)
+            date_val = cells[0]
             if date_val is None:
                 continue
 
             if isinstance(date_val, str) and any(w in date_val.lower() for w in ['итого', 'остаток', 'входящий']):
                 continue
 
-            debit = normalize_amount(self._get(row, col_map.get('debit_amount')))
-            credit = normalize_amount(self._get(row, col_map.get('credit_amount')))
-            debit_t = normalize_amount(self._get(row, col_map.get('debit_tenge')))
-            credit_t = normalize_amount(self._get(row, col_map.get('credit_tenge')))
-
-            direction = determine_direction(debit_amount=debit, credit_amount=credit)
-            amount = credit or debit
-            amount_tenge = credit_t or debit_t
-
-            t = Transaction(
-                transaction_date=normalize_date(date_val),
-                amount=amount,
-                currency=normalize_currency(currency),
-                amount_tenge=amount_tenge,
-                direction=direction,
-                payer=None,
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('iin'))),
-                payer_bank=None,
-                payer_account=clean_string(self._get(row, col_map.get('corr_account'))),
-                recipient=None,
-                recipient_iin_bin=None,
-                recipient_bank=None,
-                recipient_account=None,
-                operation_type=None,
-                knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('description'))),
-                document_number=None,
-                statement_bank=self.BANK_NAME,
-                account_number=account_number,
-                source_file=file_info['filename'],
-            )
-            transactions.append(t)
-
+            data.append(cells)
+
+        # The four amount columns are normalized in bulk, column by column
+        debits, credits, debits_t, credits_t = (
+            normalize_amount_column([cells[i] for cells in data]) for i in range(1, 5)
+        )
+
+        for cells, debit, credit, debit_t, credit_t in zip(data, debits, credits, debits_t, credits_t):
+            date_val, *_, iin_cell, corr_account_cell, description_cell = cells
+
+            direction = direction_from_amounts(debit, credit)
+            amount = first_amount(credit, debit)
+            amount_tenge = first_amount(credit_t, debit_t)
+
+            buf.append((
+                normalize_date(date_val),  # transaction_date
+                amount,  # amount
+                normalize_currency(currency),  # currency
+                amount_tenge,  # amount_tenge
+                direction,  # direction
+                None,  # payer
+                normalize_iin_bin(iin_cell),  # payer_iin_bin
+                None,  # payer_bank
+                clean_string(corr_account_cell),  # payer_account
+                None,  # recipient
+                None,  # recipient_iin_bin
+                None,  # recipient_bank
+                None,  # recipient_account
+                None,  # operation_type
+                None,  # knp
+                clean_string(description_cell),  # payment_purpose
+                None,  # document_number
+                self.BANK_NAME,  # statement_bank
+                account_number,  # account_number
+                file_info['filename'],  # source_file
+            ))
+
+        transactions = [Transaction.from_positional(*t) for t in buf]
         return transactions, {'account_number': account_number, 'warnings': warnings, 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
@@ -12,24 +12,47 @@ from ..base_parser import BaseParser
 from ..models import Transaction
 from ..file_reader import SheetData
 from ..normalizer import (
-    normalize_date, normalize_iin_bin, normalize_amount,
-    normalize_currency, clean_string
+    normalize_date, normalize_iin_bin, normalize_amount_column,
+    normalize_column, normalize_currency, clean_string
 )
 from . import register_parser
 
+# Header row: a counterparty column, or 'дата' with 'сумма'/'назначение' (cells may hold newlines)
+_HEADER_ROW_RE = re.compile(
+    r'контрагент|корреспондент|дата.*(?:сумма|назначение)|(?:сумма|назначение).*дата', re.S
+)
+
+# Header cells matched exactly
+_EXACT_HEADERS = {'дата': 'date'}
+# (substrings that must all occur, field) — first matching rule wins
+_HEADER_RULES = (
+    (('дата', 'операц'), 'date'),
+    (('сумма',), 'amount'),
+    (('валюта',), 'currency'),
+    (('контрагент',), 'counterparty'),
+    (('корреспондент',), 'counterparty'),
+    (('наименование',), 'counterparty'),
+    (('иин',), 'iin'),
+    (('бин',), 'iin'),
+    (('назначение',), 'purpose'),
+    (('счет', 'корресп'), 'corr_account'),
+)
+
+# Lowercase words marking a text date cell as a summary row
+_SUMMARY_WORDS = ('итого', 'остаток')
+
 
 @register_parser
 class TsesnabankParser(BaseParser):
     BANK_NAME = 'АО Цеснабанк'
+    MARKERS = {'цеснабанк': 0.95, 'tseskzka': 0.95}
+    MARKER_ROWS = 10
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
-        for row in sheet.rows[:10]:
-            for cell in row:
-                if cell and 'ЦЕСНАБАНК' in str(cell).upper():
-                    return 0.95
-                if cell and 'TSESKZKA' in str(cell).upper():
-                    return 0.95
+        score = cls.marker_score(sheet)
+        if score:
+            return score
         folder = file_info.get('folder_name', '').lower()
         if 'цеснабанк' in folder:
             return 0.8
@@ -59,8 +82,7 @@ class TsesnabankParser(BaseParser):
 
     def parse_sheet(self, sheet: SheetData, file_info: dict) -> Tuple[List[Transaction], dict]:
         rows = sheet.rows
-        transactions = []
-        account_number = None
+        buf = []  # one field-ordered tuple per row
 
         # Determine direction from sheet name
         direction = None
@@ -71,24 +93,11 @@ class TsesnabankParser(BaseParser):
             direction = 'Расход'
 
         # Extract metadata
-        for row in rows[:15]:
-            for cell in row:
-                if cell:
-                    s = str(cell)
-                    match = re.search(r'(KZ\w{16,22})', s)
-                    if match:
-                        account_number = match.group(1)
+        account_number = self.find_first_iban(sheet, max_rows=15)
 
         # Find header
-        header_idx = None
-        for i, row in enumerate(rows[:20]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
-            if ('дата' in row_text and ('сумма' in row_text or 'назначение' in row_text)):
-                header_idx = i
-                break
-            if 'контрагент' in row_text or 'корреспондент' in row_text:
-                header_idx = i
-                break
+        row_texts, _ = sheet.top_lower(20)
+        header_idx = next((i for i, t in enumerate(row_texts) if _HEADER_ROW_RE.search(t)), None)
 
         if header_idx is None:
             return [], {'warnings': [], 'errors': ['Header not found'], 'account_number': account_number}
@@ -98,62 +107,42 @@ class TsesnabankParser(BaseParser):
 
         col_map = {}
         for i, h in enumerate(header_lower):
-            if 'дата' in h and 'операц' in h:
-                col_map['date'] = i
-            elif h == 'дата':
-                col_map['date'] = i
-            elif 'сумма' in h:
-                col_map['amount'] = i
-            elif 'валюта' in h:
-                col_map['currency'] = i
-            elif 'контрагент' in h or 'корреспондент' in h or 'наименование' in h:
-                col_map['counterparty'] = i
-            elif 'иин' in h or 'бин' in h:
-                col_map['iin'] = i
-            elif 'назначение' in h:
-                col_map['purpose'] = i
-            elif 'счет' in h and 'корресп' in h:
-                col_map['corr_account'] = i
-
-        for row_idx in range(header_idx + 1, len(rows)):
-            row = rows[row_idx]
-            if not row or all(c is None for c in row):
-                continue
-
-            date_val = self._get(row, col_map.get('date'))
-            if date_val is None:
-                continue
-
-            if isinstance(date_val, str) and any(w in date_val.lower() for w in ['итого', 'остаток']):
-                continue
-
-            counterparty = clean_string(self._get(row, col_map.get('counterparty')))
-
-            t = Transaction(
-                transaction_date=normalize_date(date_val),
-                amount=normalize_amount(self._get(row, col_map.get('amount'))),
-                currency=normalize_currency(self._get(row, col_map.get('currency'))) or 'KZT',
-                amount_tenge=normalize_amount(self._get(row, col_map.get('amount'))),
-                direction=direction,
-                payer=counterparty if direction == 'Приход' else None,
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('iin'))) if direction == 'Приход' else None,
-                payer_bank=None, payer_account=None,
-                recipient=counterparty if direction == 'Расход' else None,
-                recipient_iin_bin=normalize_iin_bin(self._get(row, col_map.get('iin'))) if direction == 'Расход' else None,
-                recipient_bank=None, recipient_account=None,
-                operation_type=None, knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('purpose'))),
-                document_number=None,
-                statement_bank=self.BANK_NAME,
-                account_number=account_number,
-                source_file=file_info['filename'],
-            )
-            transactions.append(t)
-
+            key = self.header_field(h, _EXACT_HEADERS, _HEADER_RULES)
+            if key is not None:
+                col_map[key] = i
+
+        data_rows = self.dated_rows(rows, header_idx + 1, col_map.get('date'), _SUMMARY_WORDS)
+        dates = normalize_column(normalize_date, self.column_values(data_rows, col_map.get('date')))
+        amounts = normalize_amount_column(self.column_values(data_rows, col_map.get('amount')))
+
+        for date_norm, amount, counterparty_cell, currency_cell, iin_cell, purpose_cell in zip(
+            dates, amounts,
+            *self.columns(data_rows, col_map, ('counterparty', 'currency', 'iin', 'purpose'))
+        ):
+            counterparty = clean_string(counterparty_cell)
+
+            buf.append((
+                date_norm,  # transaction_date
+                amount,  # amount
+                normalize_currency(currency_cell) or 'KZT',  # currency
+                amount,  # amount_tenge
+                direction,  # direction
+                counterparty if direction == 'Приход' else None,  # payer
+                normalize_iin_bin(iin_cell) if direction == 'Приход' else None,  # payer_iin_bin
+                None,  # payer_bank
+                None,  # payer_account
+                counterparty if direction == 'Расход' else None,  # recipient
+                normalize_iin_bin(iin_cell) if direction == 'Расход' else None,  # recipient_iin_bin
+                None,  # recipient_bank
+                None,  # recipient_account
+                None,  # operation_type
+                None,  # knp
+                clean_string(purpose_cell),  # payment_purpose
+                None,  # document_number
+                self.BANK_NAME,  # statement_bank
+                account_number,  # account_number
+                file_info['filename'],  # source_file
+            ))
+
+        transactions = [Transaction.from_positional(*t) for t in buf]
         return transactions, {'account_number': account_number, 'warnings': [], 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
@@ -4,15 +4,14 @@ Format: .xls files with metadata header + 12 columns.
 Row 0: "Акционерное общество \"Исламский банк \"Заман-Банк\" БИК ZAJSKZ22"
 """
 
-import re
 from typing import List, Tuple, Optional
 
 from ..base_parser import BaseParser
 from ..models import Transaction
 from ..file_reader import SheetData
 from ..normalizer import (
-    normalize_date, normalize_iin_bin, normalize_amount,
-    normalize_currency, determine_direction, clean_string
+    normalize_date, normalize_iin_bin, normalize_amount_column,
+    normalize_currency, direction_from_amounts, first_amount, clean_string
 )
 from . import register_parser
 
@@ -20,15 +19,14 @@ from . import register_parser
 @register_parser
 class ZamanBankParser(BaseParser):
     BANK_NAME = 'АО Исламский банк Заман-Банк'
+    MARKERS = {'заман-банк': 0.95, 'zajskz22': 0.95}
+    MARKER_ROWS = 5
 
     @classmethod
     def can_parse(cls, sheet: SheetData, file_info: dict) -> float:
-        for row in sheet.rows[:5]:
-            for cell in row:
-                if cell:
-                    s = str(cell)
-                    if 'Заман-Банк' in s or 'ZAJSKZ22' in s:
-                        return 0.95
+        score = cls.marker_score(sheet)
+        if score:
+            return score
         folder = file_info.get('folder_name', '').lower()
         if 'заман' in folder:
             return 0.8
@@ -36,20 +34,13 @@ class ZamanBankParser(BaseParser):
 
     def parse_sheet(self, sheet: SheetData, file_info: dict) -> Tuple[List[Transaction], dict]:
         rows = sheet.rows
-        transactions = []
-        account_number = None
-
-        for row in rows[:10]:
-            for cell in row:
-                if cell:
-                    match = re.search(r'(KZ\w{16,22})', str(cell))
-                    if match:
-                        account_number = match.group(1)
+        buf = []  # one field-ordered tuple per row
+        account_number = self.find_first_iban(sheet, max_rows=10)
 
         # Find header
         header_idx = None
-        for i, row in enumerate(rows[:15]):
-            row_text = ' '.join(str(c).lower() for c in row if c)
+        row_texts, _ = sheet.top_lower(15)
+        for i, row_text in enumerate(row_texts):
             if 'дата' in row_text and ('сумма' in row_text or 'дебет' in row_text or 'кредит' in row_text):
                 header_idx = i
                 break
@@ -81,46 +72,56 @@ class ZamanBankParser(BaseParser):
             elif 'иин' in h or 'бин' in h:
                 col_map.setdefault('iin', i)
 
+        fetch = self.row_getter(col_map, [
+            'date', 'debit', 'credit', 'amount', 'currency', 'payer', 'iin', 'recipient', 'purpose',
+        ])
+
+        data = []
         for row_idx in range(header_idx + 1, len(rows)):
             row = rows[row_idx]
-            if not row or all(c is None for c in row):
+            if not row or row.count(None) == len(row):
                 continue
 
-            date_val = self._get(row, col_map.get('date'))
+            cells = fetch(row)
+            date_val = cells[0]
             if date_val is None:
                 continue
             if isinstance(date_val, str) and any(w in date_val.lower() for w in ['итого', 'остаток']):
                 continue
-
-            debit = normalize_amount(self._get(row, col_map.get('debit')))
-            credit = normalize_amount(self._get(row, col_map.get('credit')))
-            amount = normalize_amount(self._get(row, col_map.get('amount'))) or credit or debit
-            direction = determine_direction(debit_amount=debit, credit_amount=credit)
-
-            t = Transaction(
-                transaction_date=normalize_date(date_val),
-                amount=amount,
-                currency=normalize_currency(self._get(row, col_map.get('currency'))) or 'KZT',
-                amount_tenge=amount,
-                direction=direction,
-                payer=clean_string(self._get(row, col_map.get('payer'))),
-                payer_iin_bin=normalize_iin_bin(self._get(row, col_map.get('iin'))),
-                payer_bank=None, payer_account=None,
-                recipient=clean_string(self._get(row, col_map.get('recipient'))),
-                recipient_iin_bin=None, recipient_bank=None, recipient_account=None,
-                operation_type=None, knp=None,
-                payment_purpose=clean_string(self._get(row, col_map.get('purpose'))),
-                document_number=None,
-                statement_bank=self.BANK_NAME,
-                account_number=account_number,
-                source_file=file_info['filename'],
-            )
-            transactions.append(t)
-
+            data.append(cells)
+
+        # The three amount columns are normalized in bulk, column by column
+        debits, credits, amounts = (
+            normalize_amount_column([cells[i] for cells in data]) for i in range(1, 4)
+        )
+
+        for cells, debit, credit, amount_val in zip(data, debits, credits, amounts):
+            date_val, _, _, _, currency_cell, payer_cell, iin_cell, recipient_cell, purpose_cell = cells
+            amount = first_amount(amount_val, credit, debit)
+            direction = direction_from_amounts(debit, credit)
+
+            buf.append((
+                normalize_date(date_val),  # transaction_date
+                amount,  # amount
+                normalize_currency(currency_cell) or 'KZT',  # currency
+                amount,  # amount_tenge
+                direction,  # direction
+                clean_string(payer_cell),  # payer
+                normalize_iin_bin(iin_cell),  # payer_iin_bin
+                None,  # payer_bank
+                None,  # payer_account
+                clean_string(recipient_cell),  # recipient
+                None,  # recipient_iin_bin
+                None,  # recipient_bank
+                None,  # recipient_account
+                None,  # operation_type
+                None,  # knp
+                clean_string(purpose_cell),  # payment_purpose
+                None,  # document_number
+                self.BANK_NAME,  # statement_bank
+                account_number,  # account_number
+                file_info['filename'],  # source_file
+            ))
+
+        transactions = [Transaction.from_positional(*t) for t in buf]
         return transactions, {'account_number': account_number, 'warnings': [], 'errors': []}
-
-    @staticmethod
-    def _get(row, idx):
-        if idx is None or idx >= len(row):
-            return None
-        return row[idx]
@@ -0,0 +1,88 @@
+"""Single-file pipeline — read, detect bank, parse.
+
+Kept free of logging setup and other side effects so it can be imported
+by worker processes (CLI batch runs and the Streamlit app alike).
+"""
+
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List
+
+from .models import ParseResult
+from .file_reader import read_excel_file
+from .detector import detect_parser
+
+logger = logging.getLogger('bank_parser')
+
+
+def process_file(filepath: str, folder_name: str) -> ParseResult:
+    """Process a single bank statement file."""
+    filename = os.path.basename(filepath)
+    ext = os.path.splitext(filename)[1].lower()
+
+    file_info = {
+        'filepath': filepath,
+        'filename': filename,
+        'extension': ext,
+        'folder_name': folder_name,
+    }
+
+    result = ParseResult(filepath=filepath, source_file=filename)
+
+    # Skip non-Excel files
+    if ext not in ('.xlsx', '.xls'):
+        result.parse_status = 'skipped'
+        result.errors.append(f'Unsupported extension: {ext}')
+        return result
+
+    # Read file
+    try:
+        sheets = read_excel_file(filepath)
+    except Exception as e:
+        result.parse_status = 'failed'
+        result.errors.append(f'File read error: {e}')
+        logger.error(f'Failed to read {filename}: {e}')
+        return result
+
+    if not sheets or all(s.num_rows == 0 for s in sheets):
+        result.parse_status = 'skipped'
+        result.warnings.append('Empty file')
+        return result
+
+    # Detect parser
+    parser_cls = detect_parser(sheets, file_info)
+    if parser_cls is None:
+        result.parse_status = 'failed'
+        result.errors.append('No parser detected')
+        logger.warning(f'No parser for {filename} in {folder_name}')
+        return result
+
+    # Parse
+    try:
+        parser = parser_cls()
+        result = parser.parse(sheets, file_info)
+    except Exception as e:
+        result.parse_status = 'failed'
+        result.errors.append(f'Parse error: {e}')
+        logger.error(f'Parse error for {filename}: {e}', exc_info=True)
+
+    return result
+
+
+def process_files(filepaths: List[str], folder_names: List[str], workers: int = 1) -> Iterator[ParseResult]:
+    """Process many files, yielding results in input order.
+
+    Files are independent, so with workers > 1 they are read and parsed in
+    a process pool (workers=0 uses every CPU core). Parallelism stops at the
+    file: sheet parsing is pure Python, so threads would only contend for
+    the GIL, and a calamine workbook cannot be shared between threads.
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(filepaths) <= 1:
+        yield from map(process_file, filepaths, folder_names)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(filepaths))) as pool:
+        yield from pool.map(process_file, filepaths, folder_names)